@@ -0,0 +1,69 @@
+"""
+히스토리 복사 비용 벤치마크: copy.deepcopy vs History/context_overlay.
+
+    python -m benchmarks.bench_history
+"""
+import copy
+import time
+import tracemalloc
+
+from custom_swarm.history import History, context_overlay
+
+HISTORY_LENGTHS = [10, 100, 1000, 10000]
+FAN_OUT = 4
+REPEAT = 20
+
+
+def make_history(length: int) -> list:
+    return [
+        {
+            "role": "assistant" if i % 2 else "user",
+            "content": f"message {i} " + "x" * 200,
+            "sender": "bench_agent",
+            "tool_calls": None,
+        }
+        for i in range(length)
+    ]
+
+
+def deepcopy_entry(messages, context_variables):
+    for _ in range(FAN_OUT):
+        copy.deepcopy(context_variables)
+        copy.deepcopy(messages)
+
+
+def overlay_entry(messages, context_variables):
+    for _ in range(FAN_OUT):
+        context_overlay(context_variables)
+        History(messages)
+
+
+def measure(entry, messages, context_variables):
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        entry(messages, context_variables)
+    elapsed = (time.perf_counter() - start) / REPEAT
+
+    tracemalloc.start()
+    entry(messages, context_variables)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    context_variables = {"user": "bench", "dependent_results": {"a": "x" * 1000}}
+    print(f"fan-out={FAN_OUT}")
+    print(f"{'length':>8} {'deepcopy ms':>12} {'deepcopy KiB':>13} {'overlay ms':>11} {'overlay KiB':>12}")
+    for length in HISTORY_LENGTHS:
+        messages = make_history(length)
+        dc_time, dc_mem = measure(deepcopy_entry, messages, context_variables)
+        ov_time, ov_mem = measure(overlay_entry, messages, context_variables)
+        print(
+            f"{length:>8} {dc_time * 1e3:>12.3f} {dc_mem / 1024:>13.1f} "
+            f"{ov_time * 1e3:>11.4f} {ov_mem / 1024:>12.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
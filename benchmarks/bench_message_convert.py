@@ -0,0 +1,65 @@
+"""
+assistant 메시지 변환 벤치마크: json.loads(model_dump_json()) vs message_to_dict.
+
+    python -m benchmarks.bench_message_convert
+"""
+import json
+import time
+
+from custom_swarm.types import ChatCompletionMessage, ChatCompletionMessageToolCall, Function
+from custom_swarm.util import message_to_dict
+
+TOOL_CALL_COUNTS = [1, 8, 32]
+ARGUMENT_SIZES = [100, 10_000]
+REPEAT = 2000
+
+
+def make_message(tool_calls: int, argument_size: int) -> ChatCompletionMessage:
+    arguments = json.dumps({"query": "x" * argument_size})
+    return ChatCompletionMessage(
+        role="assistant",
+        content=None,
+        tool_calls=[
+            ChatCompletionMessageToolCall(
+                id=f"call_{i}",
+                type="function",
+                function=Function(name="web_search", arguments=arguments),
+            )
+            for i in range(tool_calls)
+        ],
+    )
+
+
+def roundtrip(message):
+    data = json.loads(message.model_dump_json())
+    data["sender"] = "bench_agent"
+    return data
+
+
+def direct(message):
+    return message_to_dict(message, "bench_agent")
+
+
+def measure(convert, message) -> float:
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        convert(message)
+    return (time.perf_counter() - start) / REPEAT
+
+
+def main():
+    print(f"{'tool_calls':>10} {'arg bytes':>10} {'roundtrip us':>13} {'direct us':>10} {'speedup':>8}")
+    for tool_calls in TOOL_CALL_COUNTS:
+        for argument_size in ARGUMENT_SIZES:
+            message = make_message(tool_calls, argument_size)
+            assert roundtrip(message) == direct(message)
+            slow = measure(roundtrip, message)
+            fast = measure(direct, message)
+            print(
+                f"{tool_calls:>10} {argument_size:>10} {slow * 1e6:>13.1f} "
+                f"{fast * 1e6:>10.1f} {slow / fast:>7.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
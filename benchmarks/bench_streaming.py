@@ -0,0 +1,68 @@
+"""
+스트리밍 delta 조립 벤치마크: json.loads(delta.json()) + merge_chunk vs StreamAssembler.
+
+    python -m benchmarks.bench_streaming
+"""
+import json
+import time
+from collections import defaultdict
+
+from benchmarks.synthetic import synthetic_chunks
+from custom_swarm.streaming import StreamAssembler
+from custom_swarm.util import merge_chunk
+
+TOKEN_COUNTS = [100, 1000, 10000]
+
+
+def legacy_assemble(chunks) -> dict:
+    message = {
+        "content": "",
+        "sender": "bench_agent",
+        "role": "assistant",
+        "function_call": None,
+        "tool_calls": defaultdict(
+            lambda: {
+                "function": {"arguments": "", "name": ""},
+                "id": "",
+                "type": "",
+            }
+        ),
+    }
+    for chunk in chunks:
+        delta = json.loads(chunk.choices[0].delta.model_dump_json())
+        delta.pop("role", None)
+        merge_chunk(message, delta)
+    message["tool_calls"] = list(message["tool_calls"].values()) or None
+    return message
+
+
+def assembler_assemble(chunks) -> dict:
+    assembler = StreamAssembler(sender="bench_agent")
+    for chunk in chunks:
+        assembler.add(chunk.choices[0].delta)
+    return assembler.message()
+
+
+def measure(assemble, chunks) -> float:
+    start = time.perf_counter()
+    assemble(chunks)
+    return time.perf_counter() - start
+
+
+def main():
+    print(f"{'tokens':>7} {'tool_calls':>10} {'chunks':>7} {'legacy us/chunk':>16} {'assembler us/chunk':>19}")
+    for tokens in TOKEN_COUNTS:
+        # legacy merge_chunk only merges tool_calls[0] per chunk, so the
+        # interleaved case is one tool call per chunk for both paths
+        for tool_calls in (0, 2):
+            chunks = synthetic_chunks(tokens, tool_calls)
+            legacy = measure(legacy_assemble, chunks)
+            fast = measure(assembler_assemble, chunks)
+            print(
+                f"{tokens:>7} {tool_calls:>10} {len(chunks):>7} "
+                f"{legacy / len(chunks) * 1e6:>16.2f} {fast / len(chunks) * 1e6:>19.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+"""
+Swarm 실행 루프 벤치마크: 지연을 주입한 mock 클라이언트로 run, run_and_stream, handle_tool_calls,
+run_parallel_agents, CentralOrchestrator.execute_workflow를 측정한다.
+
+    python -m benchmarks.bench_swarm --latency 0.01 --output bench.json
+    python -m benchmarks.bench_swarm --quick --compare bench.json   # 기준 결과 대비 회귀 확인
+
+결과는 JSON (meta + results)으로 저장되며, --compare로 이전 결과와 중앙값을 비교해
+threshold배 이상 느려진 항목이 있으면 종료 코드 1을 반환한다.
+"""
+import argparse
+import contextlib
+import io
+import json
+import platform
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List
+
+from benchmarks.latency_client import LatencyMockClient, completion, text_chunks, tool_then_answer
+from custom_swarm import Agent, AutoApprove, CentralOrchestrator, Swarm
+
+HISTORY_LENGTHS = [10, 100, 1000]
+CHUNK_COUNTS = [10, 100, 1000]
+TOOL_COUNTS = [1, 4, 16]
+FAN_OUT_WIDTHS = [1, 4, 16]
+QUICK = {"history": [10, 100], "chunks": [10, 100], "tools": [1, 4], "fan_out": [1, 4]}
+
+
+def make_history(length: int) -> List[dict]:
+    return [
+        {"role": "assistant" if i % 2 else "user", "content": f"message {i} " + "x" * 200}
+        for i in range(length)
+    ]
+
+
+def sleeping_tool(name: str, seconds: float) -> Callable:
+    def tool(query: str = ""):
+        time.sleep(seconds)
+        return f"{name}: {query}"
+
+    tool.__name__ = name
+    return tool
+
+
+def measure(fn: Callable[[], object], repeat: int) -> Dict[str, float]:
+    fn()  # warm-up (tool 스키마 컴파일, 스레드 풀 생성)
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return {
+        "median_s": statistics.median(samples),
+        "min_s": min(samples),
+        "mean_s": statistics.fmean(samples),
+        "stdev_s": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+    }
+
+
+def bench_run(sizes, latency, repeat):
+    client = LatencyMockClient(latency=latency)
+    swarm = Swarm(client=client)
+    agent = Agent(name="bench")
+    for length in sizes:
+        history = make_history(length)
+        yield {"history": length}, measure(lambda: swarm.run(agent, history), repeat)
+
+
+def bench_run_and_stream(sizes, latency, repeat):
+    for chunks in sizes:
+        stream = text_chunks(chunks)
+        client = LatencyMockClient(latency=latency, chunks_factory=lambda params: stream)
+        swarm = Swarm(client=client)
+        agent = Agent(name="bench")
+        messages = make_history(10)
+        yield {"chunks": chunks}, measure(
+            lambda: list(swarm.run_and_stream(agent, messages)), repeat)
+
+
+def bench_handle_tool_calls(sizes, latency, repeat):
+    swarm = Swarm(client=LatencyMockClient())
+    for tools in sizes:
+        functions = [sleeping_tool(f"tool_{i}", latency) for i in range(tools)]
+        tool_calls = completion(
+            content="",
+            tool_calls=[{"name": f.__name__, "arguments": '{"query": "q"}'} for f in functions],
+        ).choices[0].message.tool_calls
+        for concurrent in (False, True):
+            yield {"tools": tools, "concurrent": concurrent}, measure(
+                lambda: swarm.handle_tool_calls(tool_calls, functions, {}, False, concurrent=concurrent),
+                repeat,
+            )
+
+
+def bench_run_parallel_agents(sizes, latency, repeat):
+    lookup = sleeping_tool("lookup", latency)
+    client = LatencyMockClient(
+        latency=latency,
+        responder=tool_then_answer([{"name": "lookup", "arguments": '{"query": "q"}'}]),
+    )
+    swarm = Swarm(client=client)
+    messages = make_history(10)
+    for width in sizes:
+        agents = [Agent(name=f"agent_{i}", functions=[lookup]) for i in range(width)]
+        yield {"fan_out": width}, measure(
+            lambda: swarm.run_parallel_agents(agents, messages), repeat)
+
+
+def bench_execute_workflow(sizes, latency, repeat):
+    client = LatencyMockClient(latency=latency)
+    swarm = Swarm(client=client)
+    for width in sizes:
+        first = [Agent(name=f"search_{i}") for i in range(width)]
+        writer = Agent(name="writer")
+        workflow = [
+            {"name": "Layer_1", "agents": [a.name for a in first], "description": "collect"},
+            {"name": "Layer_2", "agents": ["writer"], "dependent_on": [a.name for a in first],
+             "description": "write"},
+        ]
+        messages = [{"role": "user", "content": "topic"}]
+
+        def execute():
+            orchestrator = CentralOrchestrator(swarm, {}, approval=AutoApprove())
+            orchestrator.execute_workflow(workflow, first + [writer], messages)
+
+        yield {"fan_out": width}, measure(execute, repeat)
+
+
+BENCHMARKS = {
+    "run": (bench_run, "history"),
+    "run_and_stream": (bench_run_and_stream, "chunks"),
+    "handle_tool_calls": (bench_handle_tool_calls, "tools"),
+    "run_parallel_agents": (bench_run_parallel_agents, "fan_out"),
+    "execute_workflow": (bench_execute_workflow, "fan_out"),
+}
+
+
+def run_benchmarks(names, latency, repeat, quick=False) -> List[dict]:
+    sizes = {
+        "history": HISTORY_LENGTHS,
+        "chunks": CHUNK_COUNTS,
+        "tools": TOOL_COUNTS,
+        "fan_out": FAN_OUT_WIDTHS,
+    }
+    if quick:
+        sizes.update(QUICK)
+    results = []
+    for name in names:
+        bench, axis = BENCHMARKS[name]
+        # Swarm/Orchestrator의 상태 출력은 측정 결과에서 제외
+        with contextlib.redirect_stdout(io.StringIO()):
+            rows = list(bench(sizes[axis], latency, repeat))
+        for params, stats in rows:
+            results.append({"benchmark": name, "params": params, "repeat": repeat, **stats})
+            print(f"{name:<20} {json.dumps(params):<36} median {stats['median_s'] * 1e3:9.3f} ms")
+    return results
+
+
+def result_key(result: dict) -> str:
+    return result["benchmark"] + json.dumps(result["params"], sort_keys=True)
+
+
+def compare(results: List[dict], baseline_path: str, threshold: float) -> List[str]:
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {result_key(r): r for r in json.load(f)["results"]}
+    regressions = []
+    for result in results:
+        before = baseline.get(result_key(result))
+        if before is None or not before["median_s"]:
+            continue
+        ratio = result["median_s"] / before["median_s"]
+        if ratio > threshold:
+            regressions.append(
+                f"{result['benchmark']} {json.dumps(result['params'])}: "
+                f"{before['median_s'] * 1e3:.3f} ms -> {result['median_s'] * 1e3:.3f} ms ({ratio:.2f}x)"
+            )
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("benchmarks", nargs="*",
+                        help=f"실행할 벤치마크 {list(BENCHMARKS)} (기본값: 전부)")
+    parser.add_argument("--latency", type=float, default=0.005, help="요청/도구당 주입할 지연(초)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--quick", action="store_true", help="작은 크기만 실행")
+    parser.add_argument("--output", help="결과 JSON 경로")
+    parser.add_argument("--compare", help="비교할 기준 결과 JSON 경로")
+    parser.add_argument("--threshold", type=float, default=1.2, help="회귀로 판단할 중앙값 비율")
+    args = parser.parse_args(argv)
+
+    names = args.benchmarks or list(BENCHMARKS)
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmark(s): {', '.join(unknown)}")
+    results = run_benchmarks(names, args.latency, args.repeat, args.quick)
+    report = {
+        "meta": {
+            "timestamp": time.time(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "latency_s": args.latency,
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        regressions = compare(results, args.compare, args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
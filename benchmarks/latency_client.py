@@ -0,0 +1,130 @@
+"""
+벤치마크용 mock OpenAI 클라이언트. 요청마다 지연(latency)을 주입하고, 스트리밍이면 청크마다 지연을 준다.
+"""
+import threading
+import time
+from typing import Callable, List, Optional
+
+from openai.types.chat.chat_completion import ChatCompletion, Choice
+from openai.types.chat.chat_completion_chunk import (
+    ChatCompletionChunk,
+    Choice as ChunkChoice,
+    ChoiceDelta,
+)
+from openai.types.completion_usage import CompletionUsage
+
+from custom_swarm.types import ChatCompletionMessage, ChatCompletionMessageToolCall, Function
+
+
+def completion(content: str = "ok", tool_calls: List[dict] = None, model: str = "bench-model"):
+    """
+    tool_calls: {"name": ..., "arguments": json 문자열} 리스트.
+    """
+    return ChatCompletion(
+        id="bench_cc",
+        created=0,
+        model=model,
+        object="chat.completion",
+        choices=[
+            Choice(
+                index=0,
+                finish_reason="tool_calls" if tool_calls else "stop",
+                message=ChatCompletionMessage(
+                    role="assistant",
+                    content=content,
+                    tool_calls=[
+                        ChatCompletionMessageToolCall(
+                            id=f"call_{i}",
+                            type="function",
+                            function=Function(name=call["name"], arguments=call.get("arguments", "{}")),
+                        )
+                        for i, call in enumerate(tool_calls)
+                    ]
+                    if tool_calls
+                    else None,
+                ),
+            )
+        ],
+        usage=CompletionUsage(prompt_tokens=10, completion_tokens=10, total_tokens=20),
+    )
+
+
+def text_chunks(chunks: int, token: str = "tok ", model: str = "bench-model") -> List[ChatCompletionChunk]:
+    def chunk(delta):
+        return ChatCompletionChunk(
+            id="bench_chunk",
+            created=0,
+            model=model,
+            object="chat.completion.chunk",
+            choices=[ChunkChoice(index=0, delta=delta)],
+        )
+
+    first = chunk(ChoiceDelta(role="assistant", content=""))
+    body = chunk(ChoiceDelta(content=token))
+    return [first] + [body] * chunks
+
+
+class _Completions:
+    def __init__(self, client: "LatencyMockClient"):
+        self._client = client
+
+    def create(self, **params):
+        client = self._client
+        with client._lock:
+            client.calls += 1
+        time.sleep(client.latency)
+        if params.get("stream"):
+            return client._stream(client.chunks_factory(params))
+        return client.responder(params)
+
+
+class _Chat:
+    def __init__(self, client: "LatencyMockClient"):
+        self.completions = _Completions(client)
+
+
+class LatencyMockClient:
+    """
+    chat.completions.create만 흉내 내는 스레드 안전한 클라이언트.
+
+    Args:
+        latency (float): 요청당 지연(초). 스트리밍이면 첫 청크까지의 지연.
+        chunk_latency (float): 스트리밍 청크 사이의 지연(초).
+        responder (Callable): create 파라미터 -> ChatCompletion. 기본값은 "ok" 응답.
+        chunks_factory (Callable): create 파라미터 -> 청크 리스트. 기본값은 텍스트 청크 10개.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        chunk_latency: float = 0.0,
+        responder: Optional[Callable[[dict], ChatCompletion]] = None,
+        chunks_factory: Optional[Callable[[dict], List[ChatCompletionChunk]]] = None,
+    ):
+        self.latency = latency
+        self.chunk_latency = chunk_latency
+        default = completion()
+        self.responder = responder or (lambda params: default)
+        default_chunks = text_chunks(10)
+        self.chunks_factory = chunks_factory or (lambda params: default_chunks)
+        self.calls = 0
+        self._lock = threading.Lock()
+        self.chat = _Chat(self)
+
+    def _stream(self, chunks):
+        for chunk in chunks:
+            if self.chunk_latency:
+                time.sleep(self.chunk_latency)
+            yield chunk
+
+
+def tool_then_answer(tool_calls: List[dict]) -> Callable[[dict], ChatCompletion]:
+    """마지막 메시지가 tool 결과가 아니면 tool_calls를 요청하고, 그 다음에는 답을 돌려주는 responder."""
+    calling = completion(content="", tool_calls=tool_calls)
+    answer = completion(content="done")
+
+    def responder(params):
+        return answer if params["messages"][-1].get("role") == "tool" else calling
+
+    return responder
+
@@ -0,0 +1,56 @@
+"""
+벤치마크용 합성 스트리밍 청크 생성기.
+"""
+from openai.types.chat.chat_completion_chunk import (
+    ChatCompletionChunk,
+    Choice,
+    ChoiceDelta,
+    ChoiceDeltaToolCall,
+    ChoiceDeltaToolCallFunction,
+)
+
+
+def _chunk(delta: ChoiceDelta) -> ChatCompletionChunk:
+    return ChatCompletionChunk(
+        id="bench_chunk",
+        created=0,
+        model="bench-model",
+        object="chat.completion.chunk",
+        choices=[Choice(index=0, delta=delta)],
+    )
+
+
+def synthetic_chunks(tokens: int, tool_calls: int = 0, token: str = "tok "):
+    """
+    content 토큰 `tokens`개를 스트리밍한 뒤, tool call `tool_calls`개의 인자를
+    토큰 단위로 번갈아가며(interleaved) 스트리밍하는 청크 리스트를 만든다.
+    """
+    chunks = [_chunk(ChoiceDelta(role="assistant", content=""))]
+    chunks.extend(_chunk(ChoiceDelta(content=token)) for _ in range(tokens))
+
+    if tool_calls:
+        chunks.extend(
+            _chunk(ChoiceDelta(tool_calls=[ChoiceDeltaToolCall(
+                index=i,
+                id=f"call_{i}",
+                type="function",
+                function=ChoiceDeltaToolCallFunction(name="web_search", arguments='{"query": "'),
+            )]))
+            for i in range(tool_calls)
+        )
+        for _ in range(tokens):
+            chunks.extend(
+                _chunk(ChoiceDelta(tool_calls=[ChoiceDeltaToolCall(
+                    index=i,
+                    function=ChoiceDeltaToolCallFunction(arguments=token),
+                )]))
+                for i in range(tool_calls)
+            )
+        chunks.extend(
+            _chunk(ChoiceDelta(tool_calls=[ChoiceDeltaToolCall(
+                index=i,
+                function=ChoiceDeltaToolCallFunction(arguments='"}'),
+            )]))
+            for i in range(tool_calls)
+        )
+    return chunks
@@ -1,4 +1,62 @@
-from .core import Swarm, CentralOrchestrator
+from .approval import (
+    ApprovalDecision,
+    ApprovalGate,
+    AutoApprove,
+    CallbackApproval,
+    FileApproval,
+    QueueApproval,
+)
+from .batching import (
+    AsyncBatchingClient,
+    BatchBackend,
+    BatchError,
+    BatchFileBackend,
+    BatchingClient,
+    BatchPending,
+    HTTPBatchBackend,
+    LocalBatchServer,
+    load_batch_results,
+)
+from .cache import CacheStats, CompletionCache, LRUCache, SQLiteCache
+from .checkpoint import CheckpointError, CheckpointStore, FileCheckpointStore, WorkflowCheckpoint
+from .context_window import (
+    ContextWindowManager,
+    DropOldest,
+    Summarize,
+    TokenCounter,
+    TruncateToolOutputs,
+)
+from .core import Swarm, AsyncSwarm, CentralOrchestrator, RunCancelled
+from .dispatch import Dispatcher, RetryPolicy, TokenBucket
+from .guard import RunGuard, RunLimits
+from .process_pool import ProcessToolBackend, process_tool
+from .recorder import SessionRecorder
+from .results import ResultStore, SpilledMessages
+from .session_log import LogEntry, SessionLogIndex
+from .state import InvalidStateTransition, RunRecord, RunState, RunStateRegistry
+from .tracing import (
+    InMemoryExporter,
+    JSONLExporter,
+    OpenTelemetryExporter,
+    Span,
+    SpanExporter,
+    Tracer,
+)
 from .types import Agent, Response
+from .workflow import WorkflowGraph, WorkflowValidationError
 
-__all__ = ["Swarm", "Agent", "Response", "CentralOrchestrator"]
\ No newline at end of file
+__all__ = ["Swarm", "AsyncSwarm", "Agent", "Response", "CentralOrchestrator", "RunCancelled",
+           "WorkflowGraph", "WorkflowValidationError", "ApprovalDecision", "ApprovalGate",
+           "AutoApprove", "CallbackApproval", "FileApproval", "QueueApproval",
+           "CacheStats", "CompletionCache", "LRUCache", "SQLiteCache",
+           "ContextWindowManager", "DropOldest", "Summarize", "TokenCounter", "TruncateToolOutputs",
+           "RunGuard", "RunLimits",
+           "InMemoryExporter", "JSONLExporter", "OpenTelemetryExporter", "Span", "SpanExporter",
+           "Tracer", "InvalidStateTransition", "RunRecord", "RunState", "RunStateRegistry",
+           "Dispatcher", "RetryPolicy", "TokenBucket",
+           "AsyncBatchingClient", "BatchBackend", "BatchError", "BatchFileBackend", "BatchingClient",
+           "BatchPending", "HTTPBatchBackend", "LocalBatchServer", "load_batch_results",
+           "SessionRecorder", "LogEntry", "SessionLogIndex",
+           "ResultStore", "SpilledMessages",
+           "CheckpointError", "CheckpointStore", "FileCheckpointStore", "WorkflowCheckpoint",
+           "ProcessToolBackend", "process_tool"]
\ No newline at end of file
@@ -0,0 +1,222 @@
+import json
+import os
+import queue
+import threading
+import time
+import uuid
+from concurrent.futures import Future, InvalidStateError, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Union
+
+from pydantic import BaseModel
+
+from .types import Response
+
+
+class ApprovalDecision(BaseModel):
+    """
+    스텝 결과에 대한 사람(또는 정책)의 결정.
+
+    Attributes:
+        action (str): "next" (승인) 또는 "retry" (피드백과 함께 재실행).
+        feedback (str): retry일 때 전달할 피드백.
+    """
+
+    action: str = "next"
+    feedback: Optional[str] = None
+
+
+def _to_decision(value: Union[str, ApprovalDecision]) -> ApprovalDecision:
+    if isinstance(value, ApprovalDecision):
+        return value
+    return ApprovalDecision(action=value)
+
+
+class ApprovalGate:
+    """
+    스텝 승인 인터페이스. request()는 블로킹하지 않고 Future를 반환하므로
+    오케스트레이터는 승인을 기다리는 동안 의존 스텝을 미리(speculatively) 실행할 수 있다.
+    """
+
+    def request(self, step_name: str, results: List[Response]) -> "Future[ApprovalDecision]":
+        raise NotImplementedError
+
+    def withdraw(self, future: "Future[ApprovalDecision]") -> None:
+        """
+        더 이상 필요 없는 승인 요청을 철회 (retry로 롤백된 스텝).
+        철회된 Future는 취소되며, 이미 진행 중인 응답은 무시된다.
+        """
+        future.cancel()
+
+    def close(self) -> None:
+        pass
+
+
+class AutoApprove(ApprovalGate):
+    """모든 스텝을 즉시 승인."""
+
+    def request(self, step_name: str, results: List[Response]) -> "Future[ApprovalDecision]":
+        future = Future()
+        future.set_result(ApprovalDecision(action="next"))
+        return future
+
+
+class CallbackApproval(ApprovalGate):
+    """
+    callback(step_name, results)을 백그라운드 스레드에서 호출해 결정을 받는다.
+
+    Args:
+        callback: "next"/"retry" 문자열 또는 ApprovalDecision을 반환하는 함수.
+        max_workers (int): 동시에 실행할 callback 수. 콘솔 입력처럼 직렬화가 필요하면 1.
+
+    close() 후에 다시 request()하면 스레드 풀을 새로 만든다.
+    """
+
+    def __init__(
+        self,
+        callback: Callable[[str, List[Response]], Union[str, ApprovalDecision]],
+        max_workers: int = 1,
+    ):
+        self.callback = callback
+        self.max_workers = max_workers
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def request(self, step_name: str, results: List[Response]) -> "Future[ApprovalDecision]":
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="swarm-approval")
+            return self._executor.submit(
+                lambda: _to_decision(self.callback(step_name, results)))
+
+    def close(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+class QueueApproval(ApprovalGate):
+    """
+    승인 요청을 큐에 넣고, 다른 스레드(대시보드, 봇 등)가 respond()로 응답.
+
+    `requests` 큐에는 (request_id, step_name, results) 튜플이 들어간다.
+    같은 스텝이 여러 번 요청될 수 있으므로 응답은 request_id로 구분한다.
+    철회된 요청은 get()에서 건너뛰고, 그 요청에 대한 respond()는 무시된다.
+    """
+
+    def __init__(self):
+        self.requests: "queue.Queue[tuple]" = queue.Queue()
+        self._pending: Dict[str, Future] = {}
+        self._ids: Dict[Future, str] = {}
+        self._lock = threading.Lock()
+
+    def request(self, step_name: str, results: List[Response]) -> "Future[ApprovalDecision]":
+        future = Future()
+        request_id = uuid.uuid4().hex
+        with self._lock:
+            self._pending[request_id] = future
+            self._ids[future] = request_id
+        self.requests.put((request_id, step_name, results))
+        return future
+
+    def get(self, timeout: float = None) -> tuple:
+        """철회되지 않은 다음 요청 (request_id, step_name, results). 시간 초과 시 queue.Empty."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            item = self.requests.get(timeout=remaining)
+            with self._lock:
+                if item[0] in self._pending:
+                    return item
+
+    def respond(self, request_id: str, action: str = "next", feedback: str = None) -> bool:
+        """요청에 응답. 철회되었거나 이미 응답한 요청이면 False."""
+        with self._lock:
+            future = self._pending.pop(request_id, None)
+            if future is None:
+                return False
+            del self._ids[future]
+        try:
+            future.set_result(ApprovalDecision(action=action, feedback=feedback))
+        except InvalidStateError:  # 응답하는 사이에 철회됨
+            return False
+        return True
+
+    def withdraw(self, future: "Future[ApprovalDecision]") -> None:
+        with self._lock:
+            request_id = self._ids.pop(future, None)
+            self._pending.pop(request_id, None)
+        future.cancel()
+
+
+class FileApproval(ApprovalGate):
+    """
+    파일 기반 승인. `<directory>/<step>.request.json`에 결과 요약을 쓰고,
+    `<directory>/<step>.decision.json` ({"action": ..., "feedback": ...})이 생길 때까지 폴링한다.
+
+    Args:
+        directory (str): 요청/결정 파일을 둘 디렉터리.
+        poll_interval (float): 결정 파일 확인 주기(초).
+    """
+
+    def __init__(self, directory: str, poll_interval: float = 0.5):
+        self.directory = directory
+        self.poll_interval = poll_interval
+        self._closed = threading.Event()
+        self._steps: Dict[Future, str] = {}
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, step_name: str, kind: str) -> str:
+        return os.path.join(self.directory, f"{step_name}.{kind}.json")
+
+    def request(self, step_name: str, results: List[Response]) -> "Future[ApprovalDecision]":
+        decision_path = self._path(step_name, "decision")
+        if os.path.exists(decision_path):
+            os.remove(decision_path)
+        summary = {
+            "step": step_name,
+            "results": {
+                r.agent.name if r.agent else "": r.error or (r.messages[-1]["content"] if r.messages else None)
+                for r in results
+            },
+        }
+        with open(self._path(step_name, "request"), "w", encoding="utf-8") as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+
+        future = Future()
+        with self._lock:
+            self._steps[future] = step_name
+
+        def poll():
+            while not self._closed.is_set() and not future.done():  # 철회되면 폴링 중단
+                if os.path.exists(decision_path):
+                    with open(decision_path, encoding="utf-8") as f:
+                        decision = ApprovalDecision(**json.load(f))
+                    os.remove(decision_path)
+                    try:
+                        future.set_result(decision)
+                    except InvalidStateError:
+                        pass
+                    break
+                time.sleep(self.poll_interval)
+            future.cancel()
+            with self._lock:
+                self._steps.pop(future, None)
+
+        threading.Thread(target=poll, name=f"swarm-approval-{step_name}", daemon=True).start()
+        return future
+
+    def withdraw(self, future: "Future[ApprovalDecision]") -> None:
+        """Future를 취소하고 아직 응답하지 않은 요청 파일을 지운다."""
+        with self._lock:
+            step_name = self._steps.pop(future, None)
+        if future.cancel() and step_name is not None:
+            try:
+                os.remove(self._path(step_name, "request"))
+            except FileNotFoundError:
+                pass
+
+    def close(self) -> None:
+        self._closed.set()
@@ -0,0 +1,343 @@
+import asyncio
+import json
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Union
+
+from openai.types.chat import ChatCompletion
+
+from .cache import CompletionCache, completion_cache_key
+
+BATCH_ENDPOINT = "/v1/chat/completions"
+
+BatchResult = Union[ChatCompletion, BaseException]
+
+
+class BatchError(Exception):
+    """배치 안의 개별 요청이 실패한 경우."""
+
+    def __init__(self, custom_id: str, message: str, status_code: int = None):
+        super().__init__(f"{custom_id}: {message}")
+        self.custom_id = custom_id
+        self.status_code = status_code
+
+
+class BatchPending(Exception):
+    """요청이 배치 파일에 기록되었고 아직 결과가 없는 경우 (오프라인 모드)."""
+
+
+def batch_request(create_params: dict) -> dict:
+    """
+    chat.completions.create 파라미터 -> OpenAI Batch API 입력 한 줄.
+
+    custom_id는 completion_cache_key이므로 결과를 CompletionCache에 그대로 넣을 수 있다.
+    """
+    body = {key: value for key, value in create_params.items() if value is not None}
+    body.pop("stream", None)
+    return {
+        "custom_id": completion_cache_key(create_params),
+        "method": "POST",
+        "url": BATCH_ENDPOINT,
+        "body": body,
+    }
+
+
+def parse_batch_result(line: dict) -> BatchResult:
+    """OpenAI Batch API 출력 한 줄 ({custom_id, response: {status_code, body}, error}) -> 결과."""
+    custom_id = line.get("custom_id")
+    error = line.get("error")
+    response = line.get("response") or {}
+    status_code = response.get("status_code")
+    if error or (status_code is not None and status_code >= 400):
+        message = (error or {}).get("message") or json.dumps(response.get("body"), ensure_ascii=False)
+        return BatchError(custom_id, message, status_code)
+    return ChatCompletion.model_validate(response["body"])
+
+
+class BatchBackend:
+    """모인 요청 묶음을 한 번에 처리하는 백엔드. 결과는 요청과 같은 순서."""
+
+    def submit(self, requests: List[dict]) -> List[BatchResult]:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+class HTTPBatchBackend(BatchBackend):
+    """
+    배치 엔드포인트에 {"requests": [...]}를 POST하고 {"responses": [...]}를 받는 백엔드.
+    요청/응답 한 줄의 형식은 OpenAI Batch API의 입력/출력 JSONL과 같다.
+
+    Args:
+        url (str): 배치 엔드포인트 URL.
+        headers (dict): 추가 HTTP 헤더 (인증 등).
+        timeout (float): 요청 제한 시간(초).
+    """
+
+    def __init__(self, url: str, headers: Dict[str, str] = None, timeout: float = 600.0):
+        import httpx
+
+        self.url = url
+        self._client = httpx.Client(headers=headers, timeout=timeout)
+
+    def submit(self, requests: List[dict]) -> List[BatchResult]:
+        response = self._client.post(self.url, json={"requests": requests})
+        response.raise_for_status()
+        by_id = {line["custom_id"]: line for line in response.json()["responses"]}
+        return [
+            parse_batch_result(by_id[request["custom_id"]])
+            if request["custom_id"] in by_id
+            else BatchError(request["custom_id"], "missing from batch response")
+            for request in requests
+        ]
+
+    def close(self) -> None:
+        self._client.close()
+
+
+class BatchFileBackend(BatchBackend):
+    """
+    오프라인 배치 파일 모드. 요청을 OpenAI Batch API 입력 JSONL로 추가하고 BatchPending을 돌려준다.
+
+    비대화형 워크플로우는 (1) 실행해서 파일을 만들고 (2) Batch API로 처리한 뒤
+    (3) load_batch_results()로 결과를 캐시에 넣고 같은 캐시로 다시 실행한다.
+    각 라운드마다 에이전트들이 한 턴씩 진행한다.
+
+    Args:
+        path (str): 요청을 기록할 JSONL 파일 경로.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._written = set()
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self._written = {json.loads(line)["custom_id"] for line in f if line.strip()}
+
+    def submit(self, requests: List[dict]) -> List[BatchResult]:
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            for request in requests:
+                if request["custom_id"] not in self._written:
+                    self._written.add(request["custom_id"])
+                    f.write(json.dumps(request, ensure_ascii=False) + "\n")
+        return [
+            BatchPending(f"{request['custom_id']} written to {self.path}") for request in requests
+        ]
+
+
+def load_batch_results(path: str, cache: CompletionCache) -> int:
+    """
+    Batch API 출력 JSONL의 성공한 결과를 cache에 넣는다 (custom_id = 캐시 키).
+
+    Returns:
+        int: 캐시에 넣은 결과 수.
+    """
+    loaded = 0
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            data = json.loads(line)
+            result = parse_batch_result(data)
+            if isinstance(result, ChatCompletion):
+                cache.set(data["custom_id"], result)
+                loaded += 1
+    return loaded
+
+
+class _Completions:
+    def __init__(self, client: "BatchingClient"):
+        self._client = client
+
+    def create(self, **params):
+        return self._client._create(params)
+
+
+class _AsyncCompletions(_Completions):
+    async def create(self, **params):
+        return await self._client._create_async(params)
+
+
+class _Chat:
+    def __init__(self, completions: _Completions):
+        self.completions = completions
+
+
+class BatchingClient:
+    """
+    동시에 들어온 chat.completions.create 요청을 window(초) 동안 모아서 backend에 한 번에 보내는 클라이언트.
+    Swarm(client=BatchingClient(...))로 사용하며, run_parallel_agents의 팬아웃 요청이 하나의 배치가 된다.
+
+    스트리밍 요청은 배치할 수 없으므로 stream_client로 보낸다.
+
+    Args:
+        backend (BatchBackend): 배치를 처리할 백엔드.
+        window (float): 첫 요청 이후 다른 요청을 기다리는 시간(초).
+        max_batch_size (int): 이만큼 모이면 window를 기다리지 않고 바로 보낸다.
+        stream_client: 스트리밍 요청용 OpenAI 클라이언트.
+        max_workers (int): 동시에 처리할 수 있는 배치 수.
+    """
+
+    def __init__(
+        self,
+        backend: BatchBackend,
+        window: float = 0.02,
+        max_batch_size: int = 64,
+        stream_client=None,
+        max_workers: int = 4,
+    ):
+        self.backend = backend
+        self.window = window
+        self.max_batch_size = max_batch_size
+        self.stream_client = stream_client
+        self.batches = 0
+        self.requests = 0
+        self.chat = _Chat(self._completions_class()(self))
+        self._pending: List[tuple] = []
+        self._timer: threading.Timer = None
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="swarm-batch")
+
+    def _completions_class(self):
+        return _Completions
+
+    def _submit(self, params: dict) -> Future:
+        future = Future()
+        request = batch_request(params)
+        with self._lock:
+            self._pending.append((request, future))
+            if len(self._pending) >= self.max_batch_size:
+                self._flush_locked()
+            elif self._timer is None:
+                self._timer = threading.Timer(self.window, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+        return future
+
+    def _create(self, params: dict):
+        if params.get("stream"):
+            if self.stream_client is None:
+                raise ValueError("BatchingClient cannot stream without a stream_client.")
+            return self.stream_client.chat.completions.create(**params)
+        return self._submit(params).result()
+
+    async def _create_async(self, params: dict):
+        if params.get("stream"):
+            if self.stream_client is None:
+                raise ValueError("BatchingClient cannot stream without a stream_client.")
+            return await self.stream_client.chat.completions.create(**params)
+        return await asyncio.wrap_future(self._submit(params))
+
+    def flush(self) -> None:
+        """모인 요청을 지금 보낸다."""
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            self.batches += 1
+            self.requests += len(batch)
+            self._executor.submit(self._run_batch, batch)
+
+    def _run_batch(self, batch: List[tuple]) -> None:
+        try:
+            results = self.backend.submit([request for request, _ in batch])
+        except BaseException as e:
+            results = [e] * len(batch)
+        results = list(results)
+        if len(results) != len(batch):
+            # 결과 수가 다르면 어느 결과가 어느 요청의 것인지 알 수 없으므로 모두 실패 처리
+            message = f"backend returned {len(results)} results for {len(batch)} requests"
+            results = [BatchError(request["custom_id"], message) for request, _ in batch]
+        for (_, future), result in zip(batch, results):
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    def close(self) -> None:
+        self.flush()
+        self._executor.shutdown(wait=True)
+        self.backend.close()
+
+
+class AsyncBatchingClient(BatchingClient):
+    """AsyncSwarm용 BatchingClient (create가 코루틴). stream_client는 AsyncOpenAI."""
+
+    def _completions_class(self):
+        return _AsyncCompletions
+
+
+class LocalBatchServer:
+    """
+    테스트용 로컬 배치 서버. HTTPBatchBackend와 같은 형식으로 POST를 받아 responder로 응답한다.
+
+        with LocalBatchServer(lambda body: completion_dict) as server:
+            backend = HTTPBatchBackend(server.url)
+
+    Args:
+        responder (Callable): 요청 body(dict) -> ChatCompletion 또는 그 dict.
+    """
+
+    def __init__(self, responder: Callable[[dict], Union[ChatCompletion, dict]]):
+        self.responder = responder
+        self.batch_sizes: List[int] = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                requests = json.loads(self.rfile.read(length))["requests"]
+                server.batch_sizes.append(len(requests))
+                payload = json.dumps({"responses": [server._answer(r) for r in requests]}).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1/batch"
+
+    def _answer(self, request: dict) -> dict:
+        try:
+            result = self.responder(request["body"])
+            if isinstance(result, ChatCompletion):
+                result = result.model_dump(mode="json")
+            return {"custom_id": request["custom_id"], "response": {"status_code": 200, "body": result}}
+        except Exception as e:
+            return {"custom_id": request["custom_id"], "response": None,
+                    "error": {"message": f"{type(e).__name__}: {e}"}}
+
+    def start(self) -> "LocalBatchServer":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "LocalBatchServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
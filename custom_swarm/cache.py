@@ -0,0 +1,220 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+
+from openai.types.chat import ChatCompletion
+
+_MISSING = object()
+
+# 응답에 영향을 주는 요청 파라미터만 키에 포함
+CACHE_KEY_PARAMS = ("model", "messages", "tools", "tool_choice", "parallel_tool_calls")
+
+
+def completion_cache_key(create_params: dict) -> str:
+    """
+    chat.completions.create 파라미터의 안정적인 해시 키.
+
+    model, messages, tools, tool_choice, parallel_tool_calls만 사용하며 dict 키 순서와 무관하다.
+    """
+    payload = {name: create_params.get(name) for name in CACHE_KEY_PARAMS}
+    encoded = json.dumps(
+        payload, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str
+    )
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class CacheStats:
+    """캐시 hit/miss/eviction 카운터."""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hit_rate,
+        }
+
+    def __repr__(self) -> str:
+        return f"CacheStats({self.as_dict()})"
+
+
+class CompletionCache:
+    """캐시 백엔드 인터페이스. get()은 없으면 None을 반환."""
+
+    stats: CacheStats
+
+    def get(self, key: str) -> Optional[Any]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: Any) -> None:
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+
+class LRUCache(CompletionCache):
+    """
+    스레드 안전한 인메모리 LRU 캐시.
+
+    Args:
+        max_entries (int): 최대 항목 수. 넘으면 가장 오래 사용하지 않은 항목부터 제거.
+        ttl (float): 항목 유효 시간(초). None이면 만료 없음.
+        max_bytes (int): sizeof로 계산한 값들의 최대 총 크기. None이면 제한 없음.
+        sizeof (Callable): 값의 크기를 계산하는 함수 (max_bytes 사용 시).
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl: float = None,
+        max_bytes: int = None,
+        sizeof: Callable[[Any], int] = None,
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof or (lambda value: len(str(value)))
+        self.stats = CacheStats()
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is not _MISSING:
+                expires_at, size, value = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.stats.hits += 1
+                    return value
+                self._remove(key)
+                self.stats.evictions += 1
+            self.stats.misses += 1
+            return None
+
+    def set(self, key: str, value: Any) -> None:
+        size = self.sizeof(value) if self.max_bytes is not None else 0
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (expires_at, size, value)
+            self._bytes += size
+            while self._entries and (
+                len(self._entries) > self.max_entries
+                or (self.max_bytes is not None and self._bytes > self.max_bytes)
+            ):
+                self._remove(next(iter(self._entries)))
+                self.stats.evictions += 1
+
+    def _remove(self, key: str) -> None:
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+
+class SQLiteCache(CompletionCache):
+    """
+    SQLite 파일 기반 캐시. 프로세스 재시작 후에도 재사용할 수 있다.
+
+    Args:
+        path (str): SQLite 파일 경로.
+        ttl (float): 항목 유효 시간(초). None이면 만료 없음.
+        max_entries (int): 최대 항목 수. 넘으면 가장 오래 사용하지 않은 항목부터 제거.
+        serialize (Callable): 값 -> str. 기본값은 ChatCompletion.model_dump_json.
+        deserialize (Callable): str -> 값. 기본값은 ChatCompletion.model_validate_json.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttl: float = None,
+        max_entries: int = None,
+        serialize: Callable[[Any], str] = None,
+        deserialize: Callable[[str], Any] = None,
+    ):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.serialize = serialize or (lambda value: value.model_dump_json())
+        self.deserialize = deserialize or ChatCompletion.model_validate_json
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL, accessed REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[Any]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and self.ttl is not None and row[1] + self.ttl <= now:
+                self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                self._conn.commit()
+                self.stats.evictions += 1
+                row = None
+            if row is None:
+                self.stats.misses += 1
+                return None
+            self._conn.execute("UPDATE cache SET accessed = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.stats.hits += 1
+        return self.deserialize(row[0])
+
+    def set(self, key: str, value: Any) -> None:
+        data = self.serialize(value)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, created, accessed) VALUES (?, ?, ?, ?)",
+                (key, data, now, now),
+            )
+            if self.max_entries is not None:
+                cursor = self._conn.execute(
+                    "DELETE FROM cache WHERE key IN ("
+                    "SELECT key FROM cache ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                )
+                self.stats.evictions += max(cursor.rowcount, 0)
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM cache")
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
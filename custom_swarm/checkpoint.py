@@ -0,0 +1,252 @@
+import hashlib
+import json
+import os
+import threading
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import quote, unquote
+
+from .types import Agent, Response
+
+
+class CheckpointError(ValueError):
+    """체크포인트를 복원할 수 없는 경우 (워크플로우 정의 변경, 알 수 없는 에이전트 등)."""
+
+
+def workflow_fingerprint(workflow: List[Dict]) -> str:
+    """워크플로우 정의의 해시. 다른 정의로 resume하는 것을 막는 데 사용."""
+    encoded = json.dumps(workflow, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def dump_response(response: Response, exclude_context: Iterable[str] = ()) -> dict:
+    """
+    Response -> JSON으로 저장할 수 있는 dict. 에이전트는 이름으로만 저장한다.
+
+    Args:
+        response (Response): 저장할 결과 (부분 결과 포함).
+        exclude_context (Iterable[str]): 저장하지 않을 context_variables 키 (복원 시 다시 만들어지는 값).
+    """
+    exclude = set(exclude_context)
+    return {
+        "messages": list(response.messages),
+        "agent": response.agent.name if response.agent else None,
+        "context_variables": {
+            key: value for key, value in response.context_variables.items() if key not in exclude
+        },
+        "error": response.error,
+        "stop_reason": response.stop_reason,
+    }
+
+
+def load_response(data: dict, agents: Dict[str, Agent]) -> Response:
+    """
+    dump_response()의 결과 -> Response. 에이전트는 agents (이름 -> Agent)에서 찾는다.
+
+    Raises:
+        CheckpointError: 저장된 에이전트 이름이 agents에 없는 경우.
+    """
+    agent = None
+    if data.get("agent") is not None:
+        if data["agent"] not in agents:
+            raise CheckpointError(f"Checkpoint refers to unknown agent '{data['agent']}'")
+        agent = agents[data["agent"]]
+    return Response(
+        messages=data.get("messages", []),
+        agent=agent,
+        context_variables=data.get("context_variables", {}),
+        error=data.get("error"),
+        stop_reason=data.get("stop_reason"),
+    )
+
+
+class CheckpointStore:
+    """체크포인트 저장소 인터페이스. 값은 JSON으로 직렬화할 수 있는 dict."""
+
+    def save(self, key: str, data: dict) -> None:
+        raise NotImplementedError
+
+    def load(self, key: str) -> Optional[dict]:
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    def keys(self, prefix: str = "") -> List[str]:
+        raise NotImplementedError
+
+
+class FileCheckpointStore(CheckpointStore):
+    """
+    키마다 JSON 파일 하나를 쓰는 로컬 체크포인트 저장소.
+
+    임시 파일에 쓰고 fsync한 뒤 os.replace로 바꾸므로, 쓰는 도중 프로세스가 죽어도
+    이전 체크포인트나 새 체크포인트 중 하나가 온전히 남는다.
+
+    Args:
+        directory (str): 체크포인트 디렉토리.
+        fsync (bool): 쓸 때마다 fsync 할지 여부.
+    """
+
+    def __init__(self, directory: str = "checkpoints", fsync: bool = True):
+        self.directory = directory
+        self.fsync = fsync
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, quote(key, safe="") + ".json")
+
+    def save(self, key: str, data: dict) -> None:
+        path = self._path(key)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, default=str)
+            if self.fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp, path)
+
+    def load(self, key: str) -> Optional[dict]:
+        try:
+            with open(self._path(key), encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def delete(self, key: str) -> None:
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def keys(self, prefix: str = "") -> List[str]:
+        keys = [
+            unquote(name[:-len(".json")])
+            for name in os.listdir(self.directory)
+            if name.endswith(".json")
+        ]
+        return sorted(key for key in keys if key.startswith(prefix))
+
+
+class WorkflowCheckpoint:
+    """
+    CentralOrchestrator 워크플로우 하나의 체크포인트.
+
+    store의 `{workflow_id}` 키에 워크플로우 정의 해시, 초기 메시지, 스텝별 상태
+    ("running" / "completed" / "approved"), 입력 메시지, 결과를 저장하고,
+    `{workflow_id}/{step}/{agent}` 키에 실행 중인 에이전트의 턴별 부분 결과를 저장한다.
+    부분 결과에는 스텝 실행 세대(generation)가 붙어 있어서, retry로 취소된 실행이 늦게 쓴 값은 복원하지 않는다.
+
+    Args:
+        store (CheckpointStore): 체크포인트 저장소.
+        workflow_id (str): 워크플로우 실행 id.
+        workflow (List[Dict]): 워크플로우 정의.
+        messages (List): 초기 메시지.
+    """
+
+    # 다시 만들어지는 값이므로 저장하지 않는 context_variables 키
+    EXCLUDE_CONTEXT = ("dependent_results",)
+
+    def __init__(self, store: CheckpointStore, workflow_id: str, workflow: List[Dict], messages: List):
+        self.store = store
+        self.workflow_id = workflow_id
+        self._lock = threading.Lock()
+        self.manifest = {
+            "workflow_id": workflow_id,
+            "fingerprint": workflow_fingerprint(workflow),
+            "messages": list(messages),
+            "feedback": None,
+            "done": False,
+            "generations": {},
+            "steps": {},
+        }
+
+    @classmethod
+    def load(cls, store: CheckpointStore, workflow_id: str, workflow: List[Dict]) -> "WorkflowCheckpoint":
+        """
+        저장된 체크포인트를 읽는다.
+
+        Raises:
+            CheckpointError: 체크포인트가 없거나 워크플로우 정의가 바뀐 경우.
+        """
+        manifest = store.load(workflow_id)
+        if manifest is None:
+            raise CheckpointError(f"No checkpoint for workflow '{workflow_id}'")
+        if manifest["fingerprint"] != workflow_fingerprint(workflow):
+            raise CheckpointError(f"Workflow definition changed since checkpoint '{workflow_id}'")
+        checkpoint = cls(store, workflow_id, workflow, manifest["messages"])
+        checkpoint.manifest = manifest
+        return checkpoint
+
+    def _partial_key(self, step_name: str, agent_name: str) -> str:
+        return f"{self.workflow_id}/{step_name}/{agent_name}"
+
+    def _save(self) -> None:
+        self.store.save(self.workflow_id, self.manifest)
+
+    def _drop_partials(self, step_name: str) -> None:
+        for key in self.store.keys(f"{self.workflow_id}/{step_name}/"):
+            self.store.delete(key)
+
+    def launched(self, step_name: str, messages: List) -> int:
+        """스텝 실행 시작. 이번 실행의 세대를 반환."""
+        with self._lock:
+            generation = self.manifest["generations"].get(step_name, 0) + 1
+            self.manifest["generations"][step_name] = generation
+            self.manifest["steps"][step_name] = {
+                "status": "running", "generation": generation, "messages": list(messages)}
+            self._save()
+        return generation
+
+    def agent_saver(self, step_name: str, generation: int):
+        """run_parallel_agents의 checkpoint 콜백 (에이전트 이름, 부분 결과)."""
+
+        def save(agent_name: str, response: Response) -> None:
+            self.store.save(self._partial_key(step_name, agent_name), {
+                "generation": generation,
+                "response": dump_response(response, self.EXCLUDE_CONTEXT),
+            })
+
+        return save
+
+    def partials(self, step_name: str, agents: Dict[str, Agent]) -> Dict[str, Response]:
+        """실행 중이던 스텝의 에이전트별 부분 결과 (시작 에이전트 이름 -> Response)."""
+        record = self.manifest["steps"].get(step_name) or {}
+        found = {}
+        for key in self.store.keys(f"{self.workflow_id}/{step_name}/"):
+            data = self.store.load(key)
+            if data is not None and data["generation"] == record.get("generation"):
+                found[key.rsplit("/", 1)[1]] = load_response(data["response"], agents)
+        return found
+
+    def completed(self, step_name: str, results: List[Response]) -> None:
+        with self._lock:
+            record = self.manifest["steps"].setdefault(step_name, {})
+            record["status"] = "completed"
+            record["results"] = [dump_response(r, self.EXCLUDE_CONTEXT) for r in results]
+            self._save()
+        self._drop_partials(step_name)
+
+    def approved(self, step_name: str) -> None:
+        with self._lock:
+            self.manifest["steps"][step_name]["status"] = "approved"
+            self._save()
+
+    def reset(self, step_name: str) -> None:
+        """retry로 취소된 스텝의 체크포인트 삭제."""
+        with self._lock:
+            self.manifest["steps"].pop(step_name, None)
+            self._save()
+        self._drop_partials(step_name)
+
+    def set_feedback(self, feedback: str) -> None:
+        with self._lock:
+            self.manifest["feedback"] = feedback
+            self._save()
+
+    def finished(self) -> None:
+        with self._lock:
+            self.manifest["done"] = True
+            self._save()
+
+    def step_records(self) -> Dict[str, dict]:
+        return self.manifest["steps"]
@@ -0,0 +1,235 @@
+import hashlib
+import json
+import math
+import threading
+from collections import OrderedDict
+from typing import Callable, List, Optional, Sequence
+
+# 메시지마다 role/구분자 등으로 추가되는 대략적인 토큰 수
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+def _default_encoder() -> Optional[Callable[[str], int]]:
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    encoding = tiktoken.get_encoding("o200k_base")
+    return lambda text: len(encoding.encode(text, disallowed_special=()))
+
+
+class TokenCounter:
+    """
+    메시지별 토큰 수를 계산하고 기억해 두는 카운터.
+
+    한 번 계산한 메시지는 다시 계산하지 않는다. 메모는 메시지 내용(role, content, tool_calls)의
+    다이제스트 -> 토큰 수만 저장하므로 메시지 dict를 붙잡아 두지 않고, 매 턴 새로 만들어지는
+    dict (잘린 tool 출력, system 메시지)도 내용이 같으면 다시 계산하지 않는다.
+    tiktoken이 설치되어 있으면 사용하고, 없으면 4글자당 1토큰으로 추정한다.
+
+    Args:
+        encode (Callable): 문자열 -> 토큰 수. None이면 기본 인코더.
+        max_entries (int): 기억할 메시지 수.
+    """
+
+    def __init__(self, encode: Callable[[str], int] = None, max_entries: int = 65536):
+        self.encode = encode or _default_encoder() or (lambda text: math.ceil(len(text) / 4))
+        self.max_entries = max_entries
+        self._memo: "OrderedDict[bytes, int]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def count_text(self, text: str) -> int:
+        return self.encode(text) if text else 0
+
+    def count(self, message: dict) -> int:
+        text = _message_text(message)
+        key = hashlib.blake2b(
+            f"{message.get('role')}\0{text}".encode("utf-8", "surrogatepass"), digest_size=16
+        ).digest()
+        with self._lock:
+            tokens = self._memo.get(key)
+            if tokens is not None:
+                self._memo.move_to_end(key)
+                return tokens
+
+        tokens = MESSAGE_OVERHEAD_TOKENS + self.count_text(text)
+        with self._lock:
+            self._memo[key] = tokens
+            if len(self._memo) > self.max_entries:
+                self._memo.popitem(last=False)
+        return tokens
+
+    def total(self, messages: Sequence[dict]) -> int:
+        return sum(self.count(message) for message in messages)
+
+
+def _message_text(message: dict) -> str:
+    content = message.get("content")
+    if content is None:
+        text = ""
+    elif isinstance(content, str):
+        text = content
+    else:
+        text = json.dumps(content, ensure_ascii=False)
+    for tool_call in message.get("tool_calls") or ():
+        function = tool_call.get("function") or {}
+        text += (function.get("name") or "") + (function.get("arguments") or "")
+    return text
+
+
+def message_groups(messages: Sequence[dict]) -> List[List[dict]]:
+    """
+    메시지를 함께 유지/삭제해야 하는 묶음으로 나눈다.
+    tool_calls가 있는 assistant 메시지와 뒤따르는 tool 메시지들은 하나의 묶음이다.
+    """
+    groups: List[List[dict]] = []
+    for message in messages:
+        if message.get("role") == "tool" and groups and (
+            groups[-1][0].get("tool_calls") or groups[-1][0].get("role") == "tool"
+        ):
+            groups[-1].append(message)
+        else:
+            groups.append([message])
+    return groups
+
+
+class ContextPolicy:
+    """history를 줄이는 정책. apply()는 원본 메시지를 수정하지 않고 새 리스트를 반환."""
+
+    def apply(self, history: List[dict], budget: int, counter: TokenCounter) -> List[dict]:
+        raise NotImplementedError
+
+
+class TruncateToolOutputs(ContextPolicy):
+    """
+    max_tokens보다 긴 tool 메시지 content를 잘라낸다 (TavilySearch의 raw 페이지 등).
+
+    Args:
+        max_tokens (int): tool 출력당 최대 토큰 수.
+    """
+
+    def __init__(self, max_tokens: int = 1000):
+        self.max_tokens = max_tokens
+
+    def apply(self, history: List[dict], budget: int, counter: TokenCounter) -> List[dict]:
+        result = []
+        for message in history:
+            content = message.get("content")
+            if message.get("role") == "tool" and isinstance(content, str):
+                tokens = counter.count(message) - MESSAGE_OVERHEAD_TOKENS
+                if tokens > self.max_tokens:
+                    keep = max(1, len(content) * self.max_tokens // tokens)
+                    message = {
+                        **message,
+                        "content": content[:keep] + f"\n...[truncated {tokens - self.max_tokens} tokens]",
+                    }
+            result.append(message)
+        return result
+
+
+class Summarize(ContextPolicy):
+    """
+    오래된 메시지를 hook이 만든 요약 하나로 대체한다. 같은 구간의 요약은 재사용한다.
+
+    요약은 메시지 내용의 해시로 찾으므로, 앞선 정책(TruncateToolOutputs 등)이 매번 새 dict를 만들어도
+    내용이 같으면 hook을 다시 호출하지 않는다.
+
+    Args:
+        hook (Callable): 요약할 메시지 리스트 -> 요약 문자열 (예: 작은 모델 호출).
+        keep_last (int): 요약하지 않고 그대로 둘 최근 메시지 묶음 수.
+    """
+
+    def __init__(self, hook: Callable[[List[dict]], str], keep_last: int = 4):
+        self.hook = hook
+        self.keep_last = keep_last
+        self._summaries: "OrderedDict[bytes, dict]" = OrderedDict()
+
+    def apply(self, history: List[dict], budget: int, counter: TokenCounter) -> List[dict]:
+        groups = message_groups(history)
+        if len(groups) <= self.keep_last:
+            return history
+        old = [m for group in groups[:-self.keep_last] for m in group]
+        recent = [m for group in groups[-self.keep_last:] for m in group]
+
+        key = hashlib.sha256(
+            json.dumps(old, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8")
+        ).digest()
+        summary = self._summaries.get(key)
+        if summary is not None:
+            self._summaries.move_to_end(key)
+        else:
+            summary = {
+                "role": "user",
+                "content": f"Summary of the earlier conversation:\n{self.hook(old)}",
+            }
+            self._summaries[key] = summary
+            if len(self._summaries) > 64:
+                self._summaries.popitem(last=False)
+        return [summary] + recent
+
+
+class DropOldest(ContextPolicy):
+    """
+    예산에 맞을 때까지 가장 오래된 메시지 묶음부터 제거한다. 최근 keep_last 묶음은 남긴다.
+
+    Args:
+        keep_last (int): 항상 유지할 최근 메시지 묶음 수.
+    """
+
+    def __init__(self, keep_last: int = 1):
+        self.keep_last = keep_last
+
+    def apply(self, history: List[dict], budget: int, counter: TokenCounter) -> List[dict]:
+        groups = message_groups(history)
+        sizes = [counter.total(group) for group in groups]
+        total = sum(sizes)
+        start = 0
+        while total > budget and len(groups) - start > self.keep_last:
+            total -= sizes[start]
+            start += 1
+        return [m for group in groups[start:] for m in group]
+
+
+class ContextWindowManager:
+    """
+    요청 전에 [system] + history를 토큰 예산에 맞춘다.
+
+    정책은 순서대로 적용되며, 예산 안에 들어오면 나머지 정책은 건너뛴다.
+
+    Args:
+        max_tokens (int): 기본 토큰 예산. Agent.token_budget이 있으면 그 값을 사용.
+        policies (List[ContextPolicy]): 적용할 정책. 기본값은 tool 출력 자르기 -> 오래된 메시지 제거.
+        counter (TokenCounter): 토큰 카운터.
+    """
+
+    def __init__(
+        self,
+        max_tokens: int = None,
+        policies: List[ContextPolicy] = None,
+        counter: TokenCounter = None,
+    ):
+        self.max_tokens = max_tokens
+        self.policies = policies if policies is not None else [TruncateToolOutputs(), DropOldest()]
+        self.counter = counter or TokenCounter()
+
+    def fit(self, system_message: dict, history: Sequence[dict], budget: int = None) -> List[dict]:
+        """
+        Args:
+            system_message (dict): system 메시지 (항상 유지).
+            history (Sequence[dict]): 대화 히스토리.
+            budget (int): 토큰 예산. None이면 max_tokens.
+
+        Returns:
+            List[dict]: 모델에 보낼 메시지 리스트.
+        """
+        budget = budget or self.max_tokens
+        history = list(history)
+        if budget is None:
+            return [system_message] + history
+
+        history_budget = budget - self.counter.count(system_message)
+        for policy in self.policies:
+            if self.counter.total(history) <= history_budget:
+                break
+            history = policy.apply(history, history_budget, self.counter)
+        return [system_message] + history
@@ -1,17 +1,46 @@
 # Standard library imports
-import copy
+import functools
 import json
 from collections import defaultdict
-from typing import List, Callable, Union, Dict, Any
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager, nullcontext
+from typing import List, Callable, Union, Dict, Any, Optional
+from concurrent.futures import (
+    Future,
+    ThreadPoolExecutor,
+    TimeoutError as FuturesTimeoutError,
+)
 import asyncio
+import contextvars
+import inspect
+import threading
+import time
+import uuid
 
 # Package/library imports
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 
 
 # Local imports
-from .util import function_to_json, debug_print, merge_chunk
+from .history import History, context_overlay
+from .streaming import StreamAssembler
+from .approval import ApprovalGate, CallbackApproval
+from .cache import CompletionCache, completion_cache_key
+from .checkpoint import CheckpointError, CheckpointStore, WorkflowCheckpoint, load_response
+from .context_window import ContextWindowManager
+from .dispatch import Dispatcher
+from .guard import RunGuard, RunLimits
+from .multiplex import EventChannel
+from .process_pool import ProcessToolBackend, is_process_tool
+from .recorder import SessionRecorder
+from .state import RunState, RunStateRegistry
+from .tracing import Span, Tracer, record_usage
+from .workflow import WorkflowGraph, reachable_agents
+from .util import (
+    compile_tools,
+    debug_print,
+    message_to_dict,
+    __CTX_VARS_NAME__,
+)
 from .types import (
     Agent,
     AgentFunction,
@@ -22,17 +51,147 @@ from .types import (
     Result,
 )
 
-__CTX_VARS_NAME__ = "context_variables"
+
+_MISSING = object()
+
+
+class _CancelScope:
+    """자신 또는 부모 이벤트 중 하나라도 설정되면 취소된 것으로 보는 이벤트."""
+
+    def __init__(self, parent: threading.Event = None):
+        self._event = threading.Event()
+        self._parent = parent
+
+    def set(self) -> None:
+        self._event.set()
+
+    def is_set(self) -> bool:
+        return self._event.is_set() or (self._parent is not None and self._parent.is_set())
+
+
+async def _await(awaitable):
+    return await awaitable
+
+
+def _run_awaitable(awaitable):
+    """
+    동기 코드에서 코루틴 도구의 결과를 기다린다.
+
+    현재 스레드에서 이벤트 루프가 돌고 있으면 (Jupyter, async 핸들러에서 Swarm.run 호출) asyncio.run을
+    쓸 수 없으므로 별도 스레드의 새 루프에서 실행한다. 이 경우 호출한 루프는 도구가 끝날 때까지 멈춘다.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(_await(awaitable))
+    context = contextvars.copy_context()
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="swarm-async-tool") as executor:
+        return executor.submit(context.run, asyncio.run, _await(awaitable)).result()
+
+
+def _tool_call_objects(tool_calls: List[dict]) -> List[ChatCompletionMessageToolCall]:
+    return [
+        ChatCompletionMessageToolCall(
+            id=tool_call["id"],
+            function=Function(
+                arguments=tool_call["function"]["arguments"],
+                name=tool_call["function"]["name"],
+            ),
+            type=tool_call["type"],
+        )
+        for tool_call in tool_calls
+    ]
+
+
+# 현재 tool call이 속한 (run id, 에이전트 이름). 세션 레코더의 tool_call 이벤트용
+_current_run: contextvars.ContextVar = contextvars.ContextVar("swarm_current_run", default=None)
+# 현재 실행의 취소 이벤트. 취소된 뒤에는 아직 시작하지 않은 tool call을 실행하지 않는다
+_current_cancel: contextvars.ContextVar = contextvars.ContextVar("swarm_current_cancel", default=None)
+
+
+def _picklable_args(args: dict) -> dict:
+    """워커 프로세스로 보낼 인자. context_variables 오버레이(ChainMap)는 dict 복사본으로 바꾼다."""
+    if __CTX_VARS_NAME__ in args:
+        args = {**args, __CTX_VARS_NAME__: dict(args[__CTX_VARS_NAME__])}
+    return args
+
+
+def _acceptable(response: Response) -> bool:
+    """run_first의 기본 validator: 에러나 중단 없이 메시지를 만든 결과."""
+    return bool(response.messages) and response.error is None and response.stop_reason is None
+
+
+class RunCancelled(Exception):
+    """cancel_event가 설정되어 실행이 턴 경계에서 중단되었을 때 발생."""
 
 
 class Swarm:
-    def __init__(self, client=None):
+    def __init__(
+        self,
+        client=None,
+        tool_workers: int = 8,
+        agent_workers: int = None,
+        cache: CompletionCache = None,
+        context_manager: ContextWindowManager = None,
+        limits: RunLimits = None,
+        tracer: Tracer = None,
+        states: RunStateRegistry = None,
+        dispatcher: Dispatcher = None,
+        recorder: SessionRecorder = None,
+        process_backend: ProcessToolBackend = None,
+    ):
         if not client:
             client = OpenAI()
         self.client = client
+        self.limits = limits
+        self.tracer = tracer
+        self.states = states if states is not None else RunStateRegistry()
+        self.dispatcher = dispatcher
+        self.recorder = recorder
+        self.process_backend = process_backend
+        if recorder is not None:
+            self.states.subscribe(recorder.state)
+        self.cache = cache
+        self.context_manager = context_manager
         self.task_results = []
+        self.tool_workers = tool_workers
+        self.agent_workers = agent_workers
+        self._tool_executor = None
+        self._agent_executor = None
+        self._tool_semaphores = {}
+        self._tool_lock = threading.Lock()
 
-    def get_chat_completion(
+    def _get_agent_executor(self) -> ThreadPoolExecutor:
+        with self._tool_lock:
+            if self._agent_executor is None:
+                self._agent_executor = ThreadPoolExecutor(
+                    max_workers=self.agent_workers, thread_name_prefix="swarm-agent"
+                )
+            return self._agent_executor
+
+    def close(self, wait: bool = True) -> None:
+        """
+        Swarm이 소유한 에이전트/도구 스레드 풀을 종료.
+
+        Args:
+            wait (bool): 실행 중인 에이전트가 끝날 때까지 기다릴지 여부. 시간 초과로 취소된 에이전트도
+                다음 턴 경계까지는 계속 실행되므로, 기다리지 않으면 close() 이후에도 상태가 바뀔 수 있다.
+        """
+        with self._tool_lock:
+            executors = [self._agent_executor, self._tool_executor]
+            self._agent_executor = None
+            self._tool_executor = None
+        for executor in executors:
+            if executor is not None:
+                executor.shutdown(wait=wait, cancel_futures=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _build_create_params(
         self,
         agent: Agent,
         history: List,
@@ -40,23 +199,22 @@ class Swarm:
         model_override: str,
         stream: bool,
         debug: bool,
-    ) -> ChatCompletionMessage:
+    ) -> dict:
         context_variables = defaultdict(str, context_variables)
         instructions = (
             agent.instructions(context_variables)
             if callable(agent.instructions)
             else agent.instructions
         )
-        messages = [{"role": "system", "content": instructions}] + history
+        system_message = {"role": "system", "content": instructions}
+        if self.context_manager is not None:
+            messages = self.context_manager.fit(
+                system_message, history, agent.token_budget)
+        else:
+            messages = [system_message, *history]
         debug_print(debug, "Getting chat completion for...:", messages)
 
-        tools = [function_to_json(f) for f in agent.functions]
-        # hide context_variables from model
-        for tool in tools:
-            params = tool["function"]["parameters"]
-            params["properties"].pop(__CTX_VARS_NAME__, None)
-            if __CTX_VARS_NAME__ in params["required"]:
-                params["required"].remove(__CTX_VARS_NAME__)
+        tools = compile_tools(agent.functions).schemas
 
         create_params = {
             "model": model_override or agent.model,
@@ -65,11 +223,81 @@ class Swarm:
             "tool_choice": agent.tool_choice,
             "stream": stream,
         }
+        if stream:
+            # 마지막 청크로 usage를 받아 RunLimits.max_tokens와 Dispatcher 토큰 예약에 반영
+            create_params["stream_options"] = {"include_usage": True}
 
         if tools:
             create_params["parallel_tool_calls"] = agent.parallel_tool_calls
 
-        return self.client.chat.completions.create(**create_params)
+        return create_params
+
+    def get_chat_completion(
+        self,
+        agent: Agent,
+        history: List,
+        context_variables: dict,
+        model_override: str,
+        stream: bool,
+        debug: bool,
+    ) -> ChatCompletionMessage:
+        create_params = self._build_create_params(
+            agent, history, context_variables, model_override, stream, debug
+        )
+        if self.tracer is None:
+            return self._create_completion(create_params, debug, agent.priority)
+
+        span = self.tracer.start_span(
+            "llm.call", agent=agent.name, model=create_params["model"], stream=stream)
+        try:
+            completion = self._create_completion(create_params, debug, agent.priority)
+        except BaseException as e:
+            self.tracer.end_span(span, error=e)
+            raise
+        if stream:
+            return self._traced_stream(span, completion)
+        record_usage(span, completion)
+        self.tracer.end_span(span)
+        return completion
+
+    def _traced_stream(self, span: Span, completion):
+        """스트림을 그대로 넘겨주면서 첫 청크까지의 시간(time_to_first_token)을 기록."""
+        chunks = 0
+        try:
+            for chunk in completion:
+                if not chunks:
+                    span.set_attribute("time_to_first_token", span.elapsed())
+                chunks += 1
+                if getattr(chunk, "usage", None) is not None:
+                    record_usage(span, chunk)
+                yield chunk
+        except BaseException as e:
+            span.set_attribute("chunks", chunks)
+            self.tracer.end_span(span, error=e)
+            raise
+        span.set_attribute("chunks", chunks)
+        self.tracer.end_span(span)
+
+    def _create_completion(self, create_params: dict, debug: bool, priority: int = 0):
+        # 스트리밍 응답은 캐시하지 않음
+        if self.cache is None or create_params["stream"]:
+            return self._request_completion(create_params, priority)
+
+        key = completion_cache_key(create_params)
+        completion = self.cache.get(key)
+        if completion is not None:
+            debug_print(debug, f"Completion cache hit: {key}")
+            return completion
+        completion = self._request_completion(create_params, priority)
+        self.cache.set(key, completion)
+        return completion
+
+    def _request_completion(self, create_params: dict, priority: int):
+        create = self.client.chat.completions.create
+        if self.dispatcher is None:
+            return create(**create_params)
+        # 속도 제한/재시도는 Swarm의 모든 에이전트가 공유하는 dispatcher에서 처리
+        return self.dispatcher.call(create, create_params, priority)
 
     def handle_function_result(self, result, debug) -> Result:
         match result:
@@ -89,56 +317,158 @@ class Swarm:
                     debug_print(debug, error_message)
                     raise TypeError(error_message)
 
-    def handle_tool_calls(
+    def _tool_semaphore(self, func: AgentFunction, limit: int) -> threading.Semaphore:
+        """함수별 동시 실행 제한용 세마포어를 반환 (Swarm 인스턴스 전체에서 공유)."""
+        key = (func, limit)
+        with self._tool_lock:
+            semaphore = self._tool_semaphores.get(key)
+            if semaphore is None:
+                semaphore = threading.Semaphore(limit)
+                self._tool_semaphores[key] = semaphore
+            return semaphore
+
+    def _get_tool_executor(self) -> ThreadPoolExecutor:
+        with self._tool_lock:
+            if self._tool_executor is None:
+                self._tool_executor = ThreadPoolExecutor(
+                    max_workers=self.tool_workers, thread_name_prefix="swarm-tool"
+                )
+            return self._tool_executor
+
+    def _invoke_tool(self, func: AgentFunction, args: dict, limit: int = None):
+        """도구 함수를 호출하고, 코루틴을 반환하면 완료될 때까지 실행."""
+        semaphore = self._tool_semaphore(func, limit) if limit else None
+        if semaphore:
+            semaphore.acquire()
+        cancel = _current_cancel.get()
+        if cancel is not None and cancel.is_set():
+            if semaphore:
+                semaphore.release()
+            raise RunCancelled(f"Tool {func.__name__} was cancelled.")
+        span = self.tracer.start_span("tool.call", tool=func.__name__) if self.tracer else None
+        run = _current_run.get() if self.recorder is not None else None
+        start = time.perf_counter()
+        try:
+            if self._in_process_pool(func):
+                raw_result = self.process_backend.call(func, _picklable_args(args))
+            else:
+                raw_result = func(**args)
+            if inspect.isawaitable(raw_result):
+                raw_result = _run_awaitable(raw_result)
+        except BaseException as e:
+            self._end_tool_call(func, span, run, start, e)
+            raise
+        finally:
+            if semaphore:
+                semaphore.release()
+        self._end_tool_call(func, span, run, start)
+        return raw_result
+
+    def _in_process_pool(self, func: AgentFunction) -> bool:
+        return self.process_backend is not None and is_process_tool(func)
+
+    def _end_tool_call(self, func: AgentFunction, span: Optional[Span], run: Optional[tuple],
+                       start: float, error: BaseException = None):
+        if span is not None:
+            self.tracer.end_span(span, error=error)
+        if run is not None:
+            self.recorder.tool_call(
+                run[0], run[1], func.__name__, time.perf_counter() - start,
+                f"{type(error).__name__}: {error}" if error is not None else None)
+
+    def _prepare_tool_calls(
         self,
         tool_calls: List[ChatCompletionMessageToolCall],
         functions: List[AgentFunction],
         context_variables: dict,
         debug: bool,
-    ) -> Response:
-        function_map = {f.__name__: f for f in functions}
-        partial_response = Response(
-            messages=[], agent=None, context_variables={})
+    ) -> List[tuple]:
+        """
+        tool call을 (tool_call, name, func, args) 목록으로 변환. 없는 도구는 func가 None.
+        """
+        compiled = compile_tools(functions)
+        function_map = compiled.function_map
 
+        calls = []
         for tool_call in tool_calls:
             name = tool_call.function.name
             # handle missing tool case, skip to next tool
             if name not in function_map:
                 debug_print(debug, f"Tool {name} not found in function map.")
-                partial_response.messages.append(
-                    {
-                        "role": "tool",
-                        "tool_call_id": tool_call.id,
-                        "tool_name": name,
-                        "content": f"Error: Tool {name} not found.",
-                    }
-                )
+                calls.append((tool_call, name, None, None))
                 continue
             args = json.loads(tool_call.function.arguments)
             debug_print(
                 debug, f"Processing tool call: {name} with arguments {args}")
 
-            func = function_map[name]
             # pass context_variables to agent functions
-            if __CTX_VARS_NAME__ in func.__code__.co_varnames:
+            if name in compiled.context_injected:
                 args[__CTX_VARS_NAME__] = context_variables
-            raw_result = function_map[name](**args)
+            calls.append((tool_call, name, function_map[name], args))
+        return calls
 
-            result: Result = self.handle_function_result(raw_result, debug)
+    def _merge_tool_results(self, calls: List[tuple], raw_results: List, debug: bool) -> Response:
+        """
+        실행 결과를 tool_call 순서대로 병합 (context_variables/핸드오프 결정적 처리).
+        """
+        partial_response = Response(
+            messages=[], agent=None, context_variables={})
+        raw_results = iter(raw_results)
+
+        for tool_call, name, func, _ in calls:
+            if func is None:
+                content = f"Error: Tool {name} not found."
+            else:
+                result: Result = self.handle_function_result(
+                    next(raw_results), debug)
+                content = result.value
+                partial_response.context_variables.update(
+                    result.context_variables)
+                if result.agent:
+                    partial_response.agent = result.agent
             partial_response.messages.append(
                 {
                     "role": "tool",
                     "tool_call_id": tool_call.id,
                     "tool_name": name,
-                    "content": result.value,
+                    "content": content,
                 }
             )
-            partial_response.context_variables.update(result.context_variables)
-            if result.agent:
-                partial_response.agent = result.agent
 
         return partial_response
 
+    def handle_tool_calls(
+        self,
+        tool_calls: List[ChatCompletionMessageToolCall],
+        functions: List[AgentFunction],
+        context_variables: dict,
+        debug: bool,
+        concurrent: bool = False,
+        tool_concurrency: Dict[str, int] = None,
+    ) -> Response:
+        tool_concurrency = tool_concurrency or {}
+        calls = self._prepare_tool_calls(
+            tool_calls, functions, context_variables, debug)
+
+        runnable = [c for c in calls if c[2] is not None]
+        if concurrent and len(runnable) > 1:
+            executor = self._get_tool_executor()
+            futures = [
+                executor.submit(
+                    contextvars.copy_context().run,
+                    self._invoke_tool, func, args, tool_concurrency.get(name)
+                )
+                for _, name, func, args in runnable
+            ]
+            raw_results = [future.result() for future in futures]
+        else:
+            raw_results = [
+                self._invoke_tool(func, args, tool_concurrency.get(name))
+                for _, name, func, args in runnable
+            ]
+
+        return self._merge_tool_results(calls, raw_results, debug)
+
     def run_and_stream(
         self,
         agent: Agent,
@@ -148,97 +478,162 @@ class Swarm:
         debug: bool = False,
         max_turns: int = float("inf"),
         execute_tools: bool = True,
+        limits: RunLimits = None,
+        run_id: str = None,
     ):
-        active_agent = agent
-        context_variables = copy.deepcopy(context_variables)
-        history = copy.deepcopy(messages)
-        init_len = len(messages)
-
-        while len(history) - init_len < max_turns:
-
-            message = {
-                "content": "",
-                "sender": agent.name,
-                "role": "assistant",
-                "function_call": None,
-                "tool_calls": defaultdict(
-                    lambda: {
-                        "function": {"arguments": "", "name": ""},
-                        "id": "",
-                        "type": "",
-                    }
-                ),
-            }
+        if run_id is None:
+            run_id = uuid.uuid4().hex  # 세션 로그의 task_id
+        run_span = self._start_run_span(agent)
+        try:
+            active_agent = agent
+            context_variables = context_overlay(context_variables)
+            history = History(messages)
+            self._record_inputs(run_id, agent, history)
+            init_len = history.prefix_len
+            guard = self._run_guard(limits, agent)
+            stop_reason = None
 
-            # get completion with current history, agent
-            completion = self.get_chat_completion(
-                agent=active_agent,
-                history=history,
-                context_variables=context_variables,
-                model_override=model_override,
-                stream=True,
-                debug=debug,
-            )
+            while len(history) - init_len < max_turns:
+                if guard is not None:
+                    stop_reason = guard.check()
+                    if stop_reason:
+                        debug_print(debug, f"Stopping run: {stop_reason}")
+                        break
+                assembler = StreamAssembler(sender=active_agent.name)
 
-            yield {"delim": "start"}
-            for chunk in completion:
-                delta = json.loads(chunk.choices[0].delta.json())
-                if delta["role"] == "assistant":
-                    delta["sender"] = active_agent.name
-                yield delta
-                delta.pop("role", None)
-                delta.pop("sender", None)
-                merge_chunk(message, delta)
-            yield {"delim": "end"}
-
-            message["tool_calls"] = list(
-                message.get("tool_calls", {}).values())
-            if not message["tool_calls"]:
-                message["tool_calls"] = None
-            debug_print(debug, "Received completion:", message)
-            history.append(message)
-
-            if not message["tool_calls"] or not execute_tools:
-                debug_print(debug, "Ending turn.")
-                break
-
-            # convert tool_calls to objects
-            tool_calls = []
-            for tool_call in message["tool_calls"]:
-                function = Function(
-                    arguments=tool_call["function"]["arguments"],
-                    name=tool_call["function"]["name"],
-                )
-                tool_call_object = ChatCompletionMessageToolCall(
-                    id=tool_call["id"], function=function, type=tool_call["type"]
-                )
-                tool_calls.append(tool_call_object)
+                # get completion with current history, agent
+                with self._use_span(run_span):
+                    completion = self.get_chat_completion(
+                        agent=active_agent,
+                        history=history,
+                        context_variables=context_variables,
+                        model_override=model_override,
+                        stream=True,
+                        debug=debug,
+                    )
 
-            # handle function calls, updating context_variables, and switching agents
-            partial_response = self.handle_tool_calls(
-                tool_calls, active_agent.functions, context_variables, debug
-            )
-            history.extend(partial_response.messages)
-            context_variables.update(partial_response.context_variables)
-            if partial_response.agent:
-                active_agent = partial_response.agent
-
-        yield {
-            "response": Response(
-                messages=history[init_len:],
+                yield {"delim": "start"}
+                for chunk in completion:
+                    if assembler.add_usage(chunk):
+                        continue  # choices가 없는 usage 청크
+                    yield assembler.add(chunk.choices[0].delta)
+                yield {"delim": "end"}
+
+                message = assembler.message()
+                debug_print(debug, "Received completion:", message)
+                if guard is not None:
+                    guard.record_completion(assembler)  # 스트림의 usage는 마지막 청크에 온다
+                history.append(message)
+                self._record_messages(run_id, active_agent, history[-1:])
+
+                if not message["tool_calls"] or not execute_tools:
+                    debug_print(debug, "Ending turn.")
+                    break
+
+                # convert tool_calls to objects
+                tool_calls = _tool_call_objects(message["tool_calls"])
+
+                # handle function calls, updating context_variables, and switching agents
+                with self._tool_scope(run_span, run_id, active_agent):
+                    partial_response = self.handle_tool_calls(
+                        tool_calls,
+                        active_agent.functions,
+                        context_variables,
+                        debug,
+                        concurrent=active_agent.concurrent_tool_calls,
+                        tool_concurrency=active_agent.tool_concurrency,
+                    )
+                history.extend(partial_response.messages)
+                self._record_messages(run_id, active_agent, partial_response.messages)
+                if guard is not None:
+                    guard.record_tool_calls(tool_calls)
+                context_variables.update(partial_response.context_variables)
+                if partial_response.agent:
+                    self._trace_handoff(run_span, active_agent, partial_response.agent)
+                    active_agent = partial_response.agent
+                    if guard is not None:
+                        guard.record_handoff(active_agent.name)
+
+            response = Response(
+                messages=history.tail,
                 agent=active_agent,
-                context_variables=context_variables,
+                context_variables=dict(context_variables),
+                stop_reason=stop_reason,
             )
-        }
+        except BaseException as e:
+            # 실패하거나 소비자가 스트림을 중간에 닫은 경우 (GeneratorExit)
+            self._end_run_span(run_span, error=e)
+            raise
+        self._end_run_span(run_span, response)
+        yield {"response": response}
         
-    def initialize_agent_state(self, agents: List[Agent]):
-        """에이전트 상태를 초기화."""
-        self.agent_states = {agent.name: "Idle" for agent in agents}
+    def _start_run_span(self, agent: Agent) -> Optional[Span]:
+        if self.tracer is None:
+            return None
+        return self.tracer.start_span("swarm.run", agent=agent.name)
+
+    def _end_run_span(self, span: Optional[Span], response: Response = None, error: BaseException = None):
+        if span is None:
+            return
+        if response is not None:
+            span.set_attribute("final_agent", response.agent.name if response.agent else None)
+            span.set_attribute("messages", len(response.messages))
+            if response.stop_reason:
+                span.set_attribute("stop_reason", response.stop_reason)
+        self.tracer.end_span(span, error=error)
+
+    def _use_span(self, span: Optional[Span]):
+        return self.tracer.use_span(span) if span is not None else nullcontext()
+
+    def _trace_handoff(self, span: Optional[Span], from_agent: Agent, to_agent: Agent):
+        if span is not None:
+            self.tracer.event(
+                "swarm.handoff", parent=span, from_agent=from_agent.name, to_agent=to_agent.name)
+
+    def _record_inputs(self, run_id: str, agent: Agent, history: History):
+        # 이전 run에서 이미 기록한 대화 앞부분은 다시 쓰지 않는다
+        if self.recorder is not None:
+            self.recorder.inputs(run_id, agent.name, history)
+
+    def _record_messages(self, run_id: str, agent: Agent, messages: List[dict]):
+        if self.recorder is not None:
+            for message in messages:
+                self.recorder.message(run_id, agent.name, message)
+
+    @contextmanager
+    def _tool_scope(self, span: Optional[Span], run_id: str, agent: Agent):
+        """tool 실행 구간: 현재 span과 (run id, 에이전트)를 tool 호출에 전달."""
+        token = _current_run.set((run_id, agent.name)) if self.recorder is not None else None
+        try:
+            with self._use_span(span):
+                yield
+        finally:
+            if token is not None:
+                _current_run.reset(token)
+
+    def _run_guard(self, limits: RunLimits, agent: Agent) -> Optional[RunGuard]:
+        limits = limits or self.limits
+        return RunGuard(limits, agent.name) if limits is not None else None
+
+    def _save_checkpoint(self, checkpoint, history: History, agent: Agent, context_variables):
+        """턴이 끝날 때마다 지금까지의 부분 결과를 checkpoint 콜백에 전달."""
+        if checkpoint is not None:
+            checkpoint(Response(
+                messages=history.tail, agent=agent, context_variables=dict(context_variables)))
+
+    @property
+    def agent_states(self) -> Dict[str, RunState]:
+        """에이전트 이름 -> 가장 최근 run의 상태 (run별 상태는 self.states 참고)."""
+        return self.states.latest_by_agent()
 
-    def update_agent_state(self, agent: Agent, state: str):
-        """에이전트 상태 업데이트."""
-        self.agent_states[agent.name] = state
-        print(f"[Swarm] Agent {agent.name} state updated to {state}.")
+    def initialize_agent_state(self, agents: List[Agent]) -> List[str]:
+        """에이전트마다 Idle 상태의 run을 등록하고 run id 리스트를 반환."""
+        return [self.states.create(agent.name).run_id for agent in agents]
+
+    def update_agent_state(self, run_id: str, state: RunState, error: str = None):
+        """run 상태 업데이트."""
+        record = self.states.transition(run_id, state, error)
+        print(f"[Swarm] Agent {record.agent_name} state updated to {record.state.value}.")
 
 
     def run(
@@ -251,62 +646,110 @@ class Swarm:
         debug: bool = False,
         max_turns: int = float("inf"),
         execute_tools: bool = True,
+        limits: RunLimits = None,
+        cancel_event: threading.Event = None,
+        run_id: str = None,
+        checkpoint: Callable[[Response], None] = None,
+        resume: Response = None,
     ) -> Response:
+        if run_id is None:
+            run_id = self.states.create(agent.name).run_id
+        run_span = self._start_run_span(agent)
+        cancel_token = _current_cancel.set(cancel_event) if cancel_event is not None else None
         try:
             # 에이전트 상태를 Running으로 업데이트
-            self.update_agent_state(agent, "Running")
+            self.update_agent_state(run_id, RunState.RUNNING)
 
             active_agent = agent
-            context_variables = copy.deepcopy(context_variables)
-            history = copy.deepcopy(messages)
-            init_len = len(messages)
+            context_variables = context_overlay(context_variables)
+            history = History(messages)
+            self._record_inputs(run_id, agent, history)
+            init_len = history.prefix_len
+            if resume is not None:
+                # 체크포인트의 부분 결과에서 이어서 실행
+                history.extend(resume.messages)
+                context_variables.update(resume.context_variables)
+                active_agent = resume.agent or agent
+            guard = self._run_guard(limits, agent)
+            stop_reason = None
 
             while len(history) - init_len < max_turns and active_agent:
+                if guard is not None:
+                    stop_reason = guard.check()
+                    if stop_reason:
+                        debug_print(debug, f"Stopping run: {stop_reason}")
+                        break
+                if cancel_event is not None and cancel_event.is_set():
+                    raise RunCancelled(f"Agent {agent.name} was cancelled.")
                 # get completion with current history, agent
-                completion = self.get_chat_completion(
-                    agent=active_agent,
-                    history=history,
-                    context_variables=context_variables,
-                    model_override=model_override,
-                    stream=stream,
-                    debug=debug,
-                )
+                with self._use_span(run_span):
+                    completion = self.get_chat_completion(
+                        agent=active_agent,
+                        history=history,
+                        context_variables=context_variables,
+                        model_override=model_override,
+                        stream=stream,
+                        debug=debug,
+                    )
                 message = completion.choices[0].message
                 debug_print(debug, "Received completion:", message)
-                message.sender = active_agent.name
-                history.append(
-                    json.loads(message.model_dump_json())
-                )  # to avoid OpenAI types (?)
+                if guard is not None:
+                    guard.record_completion(completion)
+                history.append(message_to_dict(message, active_agent.name))
+                self._record_messages(run_id, active_agent, history[-1:])
 
                 if not message.tool_calls or not execute_tools:
                     debug_print(debug, "Ending turn.")
                     break
 
                 # handle function calls, updating context_variables, and switching agents
-                partial_response = self.handle_tool_calls(
-                    message.tool_calls, active_agent.functions, context_variables, debug
-                )
+                with self._tool_scope(run_span, run_id, active_agent):
+                    partial_response = self.handle_tool_calls(
+                        message.tool_calls,
+                        active_agent.functions,
+                        context_variables,
+                        debug,
+                        concurrent=active_agent.concurrent_tool_calls,
+                        tool_concurrency=active_agent.tool_concurrency,
+                    )
                 history.extend(partial_response.messages)
+                self._record_messages(run_id, active_agent, partial_response.messages)
+                if guard is not None:
+                    guard.record_tool_calls(message.tool_calls)
                 context_variables.update(partial_response.context_variables)
                 if partial_response.agent:
+                    self._trace_handoff(run_span, active_agent, partial_response.agent)
                     active_agent = partial_response.agent
+                    if guard is not None:
+                        guard.record_handoff(active_agent.name)
+                self._save_checkpoint(checkpoint, history, active_agent, context_variables)
 
             # 작업이 성공적으로 완료되었으므로 상태를 Completed로 업데이트
-            self.update_agent_state(agent, "Completed")
-            return Response(
-                messages=history[init_len:],
+            self.update_agent_state(run_id, RunState.COMPLETED)
+            response = Response(
+                messages=history.tail,
                 agent=active_agent,
-                context_variables=context_variables,
+                context_variables=dict(context_variables),
+                stop_reason=stop_reason,
             )
+            self._end_run_span(run_span, response)
+            return response
 
+        except RunCancelled as e:
+            self._end_run_span(run_span, error=e)
+            self.update_agent_state(run_id, RunState.CANCELLED, str(e))
+            debug_print(debug, f"Agent {agent.name} was cancelled.")
+            raise
         except Exception as e:
             # 작업 중 실패 시 상태를 Failed로 업데이트
-            self.update_agent_state(agent, "Failed")
+            self._end_run_span(run_span, error=e)
+            self.update_agent_state(run_id, RunState.FAILED, f"{type(e).__name__}: {e}")
             debug_print(debug, f"Agent {agent.name} failed with error: {e}")
             raise e
-        
-        
-    
+        finally:
+            if cancel_token is not None:
+                _current_cancel.reset(cancel_token)
+
     def run_parallel_agents(
         self,
         agents: List[Agent],
@@ -314,9 +757,13 @@ class Swarm:
         context_variables: dict = {},
         model_override: str = None,
         debug: bool = False,
+        timeout: Union[float, Dict[str, float]] = None,
+        cancel_event: threading.Event = None,
+        checkpoint: Callable[[str, Response], None] = None,
+        resume: Dict[str, Response] = None,
     ) -> List[Response]:
         """
-        여러 에이전트를 병렬로 실행하며 상태를 추적.
+        여러 에이전트를 Swarm이 소유한 스레드 풀에서 병렬로 실행하며 상태를 추적.
 
         Args:
             agents (List[Agent]): 병렬로 실행할 에이전트 리스트.
@@ -324,75 +771,802 @@ class Swarm:
             context_variables (dict): 공유 컨텍스트 변수.
             model_override (str): 모델 이름을 오버라이드할 옵션.
             debug (bool): 디버그 모드 활성화 여부.
+            timeout (float | Dict[str, float]): 에이전트별 제한 시간(초). 에이전트 이름 -> 초 dict도 가능.
+            cancel_event (threading.Event): 설정되면 모든 에이전트를 턴 경계에서 중단.
+            checkpoint (Callable): 턴이 끝날 때마다 checkpoint(에이전트 이름, 부분 결과)를 호출.
+            resume (Dict[str, Response]): 에이전트 이름 -> 이어서 실행할 부분 결과 (checkpoint로 받은 값).
 
         Returns:
-            List[Response]: 각 에이전트 실행 결과 리스트.
+            List[Response]: 입력 순서와 같은 순서의 실행 결과. 실패/시간 초과한 에이전트는
+                messages가 비어 있고 error가 설정된 Response.
+
+        시간 초과한 에이전트는 바로 결과에서 빠지지만 스레드는 진행 중인 LLM/도구 호출이 끝나고
+        다음 턴 경계에서 Cancelled가 될 때까지 계속 실행된다. close()가 이 스레드들을 기다린다.
         """
-        # 상태 초기화
-        self.initialize_agent_state(agents)
+        # 에이전트별 run 등록 (Idle)
+        run_ids = self.initialize_agent_state(agents)
 
-        results = []
-        with ThreadPoolExecutor() as executor:
-            # 에이전트별 Future 생성
-            future_to_agent = {
-                executor.submit(
-                    self.run,  # 기존의 단일 실행 메서드를 호출
-                    agent,
-                    messages,
-                    context_variables.copy(),
-                    model_override,
-                    False,  # stream 비활성화
-                    debug,
-                ): agent
-                for agent in agents
-            }
+        executor = self._get_agent_executor()
+        start = time.monotonic()
+        runs = []
+        for agent, run_id in zip(agents, run_ids):
+            agent_cancel = _CancelScope(parent=cancel_event)
+            future = executor.submit(
+                contextvars.copy_context().run,  # 현재 span을 부모로 전달
+                self.run,  # 기존의 단일 실행 메서드를 호출
+                agent,
+                messages,
+                context_variables,
+                model_override,
+                False,  # stream 비활성화
+                debug,
+                cancel_event=agent_cancel,
+                run_id=run_id,
+                checkpoint=functools.partial(checkpoint, agent.name) if checkpoint else None,
+                resume=(resume or {}).get(agent.name),
+            )
+            agent_timeout = timeout.get(agent.name) if isinstance(timeout, dict) else timeout
+            deadline = None if agent_timeout is None else start + agent_timeout
+            runs.append((agent, run_id, future, agent_cancel, deadline))
 
-            for future in as_completed(future_to_agent):
-                agent = future_to_agent[future]
-                try:
-                    response = future.result()
-                    results.append(response)
-                    debug_print(debug, f"Agent {agent.name} completed successfully.")
-                except Exception as e:
-                    debug_print(debug, f"Agent {agent.name} failed with error: {e}")
+        results = []
+        for agent, run_id, future, agent_cancel, deadline in runs:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                response = future.result(timeout=remaining)
+                debug_print(debug, f"Agent {agent.name} completed successfully.")
+            except FuturesTimeoutError:
+                # 대기 중이면 취소, 실행 중이면 다음 턴 경계에서 중단
+                agent_cancel.set()
+                if future.cancel():
+                    # 시작하지 못한 run은 여기서 종료 상태로 기록
+                    self.update_agent_state(run_id, RunState.CANCELLED, "timed out")
+                debug_print(debug, f"Agent {agent.name} timed out.")
+                response = Response(
+                    agent=agent, error=f"TimeoutError: Agent {agent.name} timed out.")
+            except Exception as e:
+                debug_print(debug, f"Agent {agent.name} failed with error: {e}")
+                response = Response(agent=agent, error=f"{type(e).__name__}: {e}")
+            results.append(response)
 
         return results
-    
+
+    def stream_parallel_agents(
+        self,
+        agents: List[Agent],
+        messages: List,
+        context_variables: dict = {},
+        model_override: str = None,
+        debug: bool = False,
+        cancel_event: threading.Event = None,
+        max_buffer: int = 256,
+    ):
+        """
+        여러 에이전트의 run_and_stream 이벤트를 하나의 스트림으로 합쳐서 yield.
+
+        각 이벤트에는 "agent" 키로 에이전트 이름이 붙고, 한 에이전트의 이벤트는 순서대로 나온다.
+        에이전트가 끝나면 {"agent": ..., "response": Response}가 나오며, 실패/취소된 경우 error가 설정된다.
+        소비자가 max_buffer개 이상 밀리면 에이전트 스트림 읽기가 멈추고 (back-pressure),
+        제너레이터를 닫으면 남은 에이전트는 다음 청크에서 중단된다.
+
+        Args:
+            agents (List[Agent]): 병렬로 실행할 에이전트 리스트.
+            messages (List): 에이전트에 전달할 메시지 히스토리.
+            context_variables (dict): 공유 컨텍스트 변수.
+            model_override (str): 모델 이름을 오버라이드할 옵션.
+            debug (bool): 디버그 모드 활성화 여부.
+            cancel_event (threading.Event): 설정되면 모든 에이전트를 다음 청크에서 중단.
+            max_buffer (int): 소비자가 가져가지 않은 이벤트의 최대 수.
+        """
+        run_ids = self.initialize_agent_state(agents)
+        channel = EventChannel(max_buffer)
+        cancel = _CancelScope(parent=cancel_event)
+        executor = self._get_agent_executor()
+        for agent, run_id in zip(agents, run_ids):
+            executor.submit(
+                contextvars.copy_context().run,  # 현재 span을 부모로 전달
+                self._pump_stream,
+                channel,
+                cancel,
+                agent,
+                run_id,
+                messages,
+                context_variables,
+                model_override,
+                debug,
+            )
+
+        remaining = len(agents)
+        try:
+            while remaining:
+                event = channel.get()
+                if "response" in event:
+                    remaining -= 1
+                yield event
+        finally:
+            cancel.set()
+            channel.close()
+
+    def run_first(
+        self,
+        agents: List[Agent],
+        messages: List,
+        context_variables: dict = {},
+        validator: Callable[[Response], bool] = None,
+        model_override: str = None,
+        debug: bool = False,
+        cancel_event: threading.Event = None,
+        on_event: Callable[[dict], bool] = None,
+        max_buffer: int = 256,
+    ) -> Response:
+        """
+        여러 에이전트를 동시에 실행하고 validator를 통과한 첫 결과를 반환 (hedged 실행).
+
+        나머지 에이전트는 바로 취소된다. 스트리밍으로 실행하므로 진행 중인 LLM 스트림은 다음 청크에서 닫히고,
+        아직 시작하지 않은 tool call은 실행되지 않는다 (이미 실행 중인 도구 함수는 끝날 때까지 둔다).
+
+        Args:
+            agents (List[Agent]): 동시에 실행할 에이전트 리스트.
+            messages (List): 에이전트에 전달할 메시지 히스토리.
+            context_variables (dict): 공유 컨텍스트 변수.
+            validator (Callable): Response -> bool. 없으면 에러 없이 메시지를 만든 첫 결과를 받는다.
+            model_override (str): 모델 이름을 오버라이드할 옵션.
+            debug (bool): 디버그 모드 활성화 여부.
+            cancel_event (threading.Event): 설정되면 모든 에이전트를 중단.
+            on_event (Callable): stream_parallel_agents 이벤트를 받는 함수. False를 반환하면 모두 중단.
+            max_buffer (int): stream_parallel_agents의 max_buffer.
+
+        Returns:
+            Response: 처음으로 받아들여진 결과. 받아들일 결과가 없으면 messages가 비어 있고
+                error가 설정된 Response (agent는 마지막으로 끝난 에이전트).
+        """
+        validator = validator or _acceptable
+        events = self.stream_parallel_agents(
+            agents, messages, context_variables, model_override, debug, cancel_event, max_buffer)
+        last = None
+        try:
+            for event in events:
+                if on_event is not None and on_event(event) is False:
+                    break
+                response = event.get("response")
+                if response is None:
+                    continue
+                last = response
+                if response.error is None and self._accepts(validator, response, debug):
+                    debug_print(debug, f"Accepted result from agent {event['agent']}.")
+                    return response
+        finally:
+            events.close()  # 나머지 에이전트 취소
+        return Response(
+            agent=last.agent if last is not None else None,
+            error=f"NoAcceptableResult: none of {[agent.name for agent in agents]} passed validation.",
+        )
+
+    def _accepts(self, validator: Callable[[Response], bool], response: Response, debug: bool) -> bool:
+        try:
+            return bool(validator(response))
+        except Exception as e:
+            debug_print(debug, f"Validator failed for agent {response.agent.name}: {e}")
+            return False
+
+    def _pump_stream(
+        self,
+        channel: EventChannel,
+        cancel: _CancelScope,
+        agent: Agent,
+        run_id: str,
+        messages: List,
+        context_variables: dict,
+        model_override: str,
+        debug: bool,
+    ):
+        """에이전트 하나의 run_and_stream 이벤트를 channel로 옮기고 run 상태를 기록."""
+        _current_cancel.set(cancel)  # copy_context()로 실행되므로 이 에이전트에만 적용
+        stream = self.run_and_stream(
+            agent, messages, context_variables, model_override, debug, run_id=run_id)
+        try:
+            if cancel.is_set():
+                raise RunCancelled(f"Agent {agent.name} was cancelled.")
+            self.update_agent_state(run_id, RunState.RUNNING)
+            response = None
+            for event in stream:
+                if cancel.is_set():
+                    raise RunCancelled(f"Agent {agent.name} was cancelled.")
+                if "response" in event:
+                    response = event["response"]
+                    break
+                if not channel.put({"agent": agent.name, **event}):
+                    raise RunCancelled(f"Agent {agent.name} was cancelled.")
+            self.update_agent_state(run_id, RunState.COMPLETED)
+            debug_print(debug, f"Agent {agent.name} completed successfully.")
+        except RunCancelled as e:
+            self.update_agent_state(run_id, RunState.CANCELLED, str(e))
+            response = Response(agent=agent, error=f"RunCancelled: {e}")
+        except Exception as e:
+            self.update_agent_state(run_id, RunState.FAILED, f"{type(e).__name__}: {e}")
+            debug_print(debug, f"Agent {agent.name} failed with error: {e}")
+            response = Response(agent=agent, error=f"{type(e).__name__}: {e}")
+        finally:
+            stream.close()
+        # 종료 이벤트는 버퍼가 가득 차도 잃지 않도록 notify로 전달
+        channel.notify({"agent": agent.name, "response": response})
+
+
+class AsyncSwarm(Swarm):
+    """
+    asyncio 기반 Swarm. 하나의 이벤트 루프로 다수의 에이전트 대화를 동시에 실행.
+
+    동기 도구 함수는 도구 스레드 풀에서, 코루틴 도구 함수는 이벤트 루프에서 직접 실행된다.
+    """
+
+    def __init__(
+        self,
+        client=None,
+        tool_workers: int = 8,
+        agent_workers: int = None,
+        cache: CompletionCache = None,
+        context_manager: ContextWindowManager = None,
+        limits: RunLimits = None,
+        tracer: Tracer = None,
+        states: RunStateRegistry = None,
+        dispatcher: Dispatcher = None,
+        recorder: SessionRecorder = None,
+        process_backend: ProcessToolBackend = None,
+    ):
+        if not client:
+            client = AsyncOpenAI()
+        super().__init__(client=client, tool_workers=tool_workers,
+                         agent_workers=agent_workers, cache=cache,
+                         context_manager=context_manager, limits=limits,
+                         tracer=tracer, states=states, dispatcher=dispatcher,
+                         recorder=recorder, process_backend=process_backend)
+        self._async_tool_semaphores = {}
+
+    async def get_chat_completion(
+        self,
+        agent: Agent,
+        history: List,
+        context_variables: dict,
+        model_override: str,
+        stream: bool,
+        debug: bool,
+    ) -> ChatCompletionMessage:
+        create_params = self._build_create_params(
+            agent, history, context_variables, model_override, stream, debug
+        )
+        if self.tracer is None:
+            return await self._create_completion(create_params, debug, agent.priority)
+
+        span = self.tracer.start_span(
+            "llm.call", agent=agent.name, model=create_params["model"], stream=stream)
+        try:
+            completion = await self._create_completion(create_params, debug, agent.priority)
+        except BaseException as e:
+            self.tracer.end_span(span, error=e)
+            raise
+        if stream:
+            return self._traced_stream_async(span, completion)
+        record_usage(span, completion)
+        self.tracer.end_span(span)
+        return completion
+
+    async def _traced_stream_async(self, span: Span, completion):
+        chunks = 0
+        try:
+            async for chunk in completion:
+                if not chunks:
+                    span.set_attribute("time_to_first_token", span.elapsed())
+                chunks += 1
+                if getattr(chunk, "usage", None) is not None:
+                    record_usage(span, chunk)
+                yield chunk
+        except BaseException as e:
+            span.set_attribute("chunks", chunks)
+            self.tracer.end_span(span, error=e)
+            raise
+        span.set_attribute("chunks", chunks)
+        self.tracer.end_span(span)
+
+    async def _create_completion(self, create_params: dict, debug: bool, priority: int = 0):
+        if self.cache is None or create_params["stream"]:
+            return await self._request_completion(create_params, priority)
+
+        key = completion_cache_key(create_params)
+        completion = self.cache.get(key)
+        if completion is not None:
+            debug_print(debug, f"Completion cache hit: {key}")
+            return completion
+        completion = await self._request_completion(create_params, priority)
+        self.cache.set(key, completion)
+        return completion
+
+    async def _request_completion(self, create_params: dict, priority: int):
+        create = self.client.chat.completions.create
+        if self.dispatcher is None:
+            return await create(**create_params)
+        return await self.dispatcher.acall(create, create_params, priority)
+
+    async def _invoke_tool_async(self, func: AgentFunction, args: dict, limit: int = None):
+        semaphore = None
+        if limit:
+            key = (func, limit)
+            semaphore = self._async_tool_semaphores.setdefault(
+                key, asyncio.Semaphore(limit))
+            await semaphore.acquire()
+        span = self.tracer.start_span("tool.call", tool=func.__name__) if self.tracer else None
+        run = _current_run.get() if self.recorder is not None else None
+        start = time.perf_counter()
+        try:
+            if self._in_process_pool(func):
+                raw_result = await asyncio.wrap_future(
+                    self.process_backend.submit(func, _picklable_args(args)))
+            elif inspect.iscoroutinefunction(func):
+                raw_result = await func(**args)
+            else:
+                loop = asyncio.get_running_loop()
+                raw_result = await loop.run_in_executor(
+                    self._get_tool_executor(), lambda: func(**args)
+                )
+                if inspect.isawaitable(raw_result):
+                    raw_result = await raw_result
+        except BaseException as e:
+            self._end_tool_call(func, span, run, start, e)
+            raise
+        finally:
+            if semaphore:
+                semaphore.release()
+        self._end_tool_call(func, span, run, start)
+        return raw_result
+
+    async def handle_tool_calls(
+        self,
+        tool_calls: List[ChatCompletionMessageToolCall],
+        functions: List[AgentFunction],
+        context_variables: dict,
+        debug: bool,
+        concurrent: bool = False,
+        tool_concurrency: Dict[str, int] = None,
+    ) -> Response:
+        tool_concurrency = tool_concurrency or {}
+        calls = self._prepare_tool_calls(
+            tool_calls, functions, context_variables, debug)
+
+        runnable = [c for c in calls if c[2] is not None]
+        if concurrent and len(runnable) > 1:
+            raw_results = await asyncio.gather(
+                *(
+                    self._invoke_tool_async(
+                        func, args, tool_concurrency.get(name))
+                    for _, name, func, args in runnable
+                )
+            )
+        else:
+            raw_results = [
+                await self._invoke_tool_async(func, args, tool_concurrency.get(name))
+                for _, name, func, args in runnable
+            ]
+
+        return self._merge_tool_results(calls, raw_results, debug)
+
+    async def run_and_stream(
+        self,
+        agent: Agent,
+        messages: List,
+        context_variables: dict = {},
+        model_override: str = None,
+        debug: bool = False,
+        max_turns: int = float("inf"),
+        execute_tools: bool = True,
+        limits: RunLimits = None,
+        run_id: str = None,
+    ):
+        if run_id is None:
+            run_id = uuid.uuid4().hex  # 세션 로그의 task_id
+        run_span = self._start_run_span(agent)
+        try:
+            active_agent = agent
+            context_variables = context_overlay(context_variables)
+            history = History(messages)
+            self._record_inputs(run_id, agent, history)
+            init_len = history.prefix_len
+            guard = self._run_guard(limits, agent)
+            stop_reason = None
+
+            while len(history) - init_len < max_turns:
+                if guard is not None:
+                    stop_reason = guard.check()
+                    if stop_reason:
+                        debug_print(debug, f"Stopping run: {stop_reason}")
+                        break
+                assembler = StreamAssembler(sender=active_agent.name)
+
+                # get completion with current history, agent
+                with self._use_span(run_span):
+                    completion = await self.get_chat_completion(
+                        agent=active_agent,
+                        history=history,
+                        context_variables=context_variables,
+                        model_override=model_override,
+                        stream=True,
+                        debug=debug,
+                    )
+
+                yield {"delim": "start"}
+                async for chunk in completion:
+                    if assembler.add_usage(chunk):
+                        continue  # choices가 없는 usage 청크
+                    yield assembler.add(chunk.choices[0].delta)
+                yield {"delim": "end"}
+
+                message = assembler.message()
+                debug_print(debug, "Received completion:", message)
+                if guard is not None:
+                    guard.record_completion(assembler)  # 스트림의 usage는 마지막 청크에 온다
+                history.append(message)
+                self._record_messages(run_id, active_agent, history[-1:])
+
+                if not message["tool_calls"] or not execute_tools:
+                    debug_print(debug, "Ending turn.")
+                    break
+
+                # convert tool_calls to objects
+                tool_calls = _tool_call_objects(message["tool_calls"])
+
+                # handle function calls, updating context_variables, and switching agents
+                with self._tool_scope(run_span, run_id, active_agent):
+                    partial_response = await self.handle_tool_calls(
+                        tool_calls,
+                        active_agent.functions,
+                        context_variables,
+                        debug,
+                        concurrent=active_agent.concurrent_tool_calls,
+                        tool_concurrency=active_agent.tool_concurrency,
+                    )
+                history.extend(partial_response.messages)
+                self._record_messages(run_id, active_agent, partial_response.messages)
+                if guard is not None:
+                    guard.record_tool_calls(tool_calls)
+                context_variables.update(partial_response.context_variables)
+                if partial_response.agent:
+                    self._trace_handoff(run_span, active_agent, partial_response.agent)
+                    active_agent = partial_response.agent
+                    if guard is not None:
+                        guard.record_handoff(active_agent.name)
+
+            response = Response(
+                messages=history.tail,
+                agent=active_agent,
+                context_variables=dict(context_variables),
+                stop_reason=stop_reason,
+            )
+        except BaseException as e:
+            # 실패하거나 소비자가 스트림을 중간에 닫은 경우 (GeneratorExit)
+            self._end_run_span(run_span, error=e)
+            raise
+        self._end_run_span(run_span, response)
+        yield {"response": response}
+
+    async def run(
+        self,
+        agent: Agent,
+        messages: List,
+        context_variables: dict = {},
+        model_override: str = None,
+        stream: bool = False,
+        debug: bool = False,
+        max_turns: int = float("inf"),
+        execute_tools: bool = True,
+        limits: RunLimits = None,
+        run_id: str = None,
+        checkpoint: Callable[[Response], None] = None,
+        resume: Response = None,
+    ) -> Response:
+        if stream:
+            return self.run_and_stream(
+                agent=agent,
+                messages=messages,
+                context_variables=context_variables,
+                model_override=model_override,
+                debug=debug,
+                max_turns=max_turns,
+                execute_tools=execute_tools,
+                limits=limits,
+            )
+        if run_id is None:
+            run_id = self.states.create(agent.name).run_id
+        run_span = self._start_run_span(agent)
+        try:
+            self.update_agent_state(run_id, RunState.RUNNING)
+
+            active_agent = agent
+            context_variables = context_overlay(context_variables)
+            history = History(messages)
+            self._record_inputs(run_id, agent, history)
+            init_len = history.prefix_len
+            if resume is not None:
+                # 체크포인트의 부분 결과에서 이어서 실행
+                history.extend(resume.messages)
+                context_variables.update(resume.context_variables)
+                active_agent = resume.agent or agent
+            guard = self._run_guard(limits, agent)
+            stop_reason = None
+
+            while len(history) - init_len < max_turns and active_agent:
+                if guard is not None:
+                    stop_reason = guard.check()
+                    if stop_reason:
+                        debug_print(debug, f"Stopping run: {stop_reason}")
+                        break
+                # get completion with current history, agent
+                with self._use_span(run_span):
+                    completion = await self.get_chat_completion(
+                        agent=active_agent,
+                        history=history,
+                        context_variables=context_variables,
+                        model_override=model_override,
+                        stream=False,
+                        debug=debug,
+                    )
+                message = completion.choices[0].message
+                debug_print(debug, "Received completion:", message)
+                if guard is not None:
+                    guard.record_completion(completion)
+                history.append(message_to_dict(message, active_agent.name))
+                self._record_messages(run_id, active_agent, history[-1:])
+
+                if not message.tool_calls or not execute_tools:
+                    debug_print(debug, "Ending turn.")
+                    break
+
+                # handle function calls, updating context_variables, and switching agents
+                with self._tool_scope(run_span, run_id, active_agent):
+                    partial_response = await self.handle_tool_calls(
+                        message.tool_calls,
+                        active_agent.functions,
+                        context_variables,
+                        debug,
+                        concurrent=active_agent.concurrent_tool_calls,
+                        tool_concurrency=active_agent.tool_concurrency,
+                    )
+                history.extend(partial_response.messages)
+                self._record_messages(run_id, active_agent, partial_response.messages)
+                if guard is not None:
+                    guard.record_tool_calls(message.tool_calls)
+                context_variables.update(partial_response.context_variables)
+                if partial_response.agent:
+                    self._trace_handoff(run_span, active_agent, partial_response.agent)
+                    active_agent = partial_response.agent
+                    if guard is not None:
+                        guard.record_handoff(active_agent.name)
+                self._save_checkpoint(checkpoint, history, active_agent, context_variables)
+
+            self.update_agent_state(run_id, RunState.COMPLETED)
+            response = Response(
+                messages=history.tail,
+                agent=active_agent,
+                context_variables=dict(context_variables),
+                stop_reason=stop_reason,
+            )
+            self._end_run_span(run_span, response)
+            return response
+
+        except asyncio.CancelledError as e:
+            self._end_run_span(run_span, error=e)
+            self.update_agent_state(run_id, RunState.CANCELLED, "cancelled")
+            debug_print(debug, f"Agent {agent.name} was cancelled.")
+            raise
+        except Exception as e:
+            self._end_run_span(run_span, error=e)
+            self.update_agent_state(run_id, RunState.FAILED, f"{type(e).__name__}: {e}")
+            debug_print(debug, f"Agent {agent.name} failed with error: {e}")
+            raise e
+
+    async def run_parallel_agents(
+        self,
+        agents: List[Agent],
+        messages: List,
+        context_variables: dict = {},
+        model_override: str = None,
+        debug: bool = False,
+        timeout: Union[float, Dict[str, float]] = None,
+        checkpoint: Callable[[str, Response], None] = None,
+        resume: Dict[str, Response] = None,
+    ) -> List[Response]:
+        """
+        여러 에이전트를 하나의 이벤트 루프에서 동시에 실행하며 상태를 추적.
+
+        Args:
+            agents (List[Agent]): 동시에 실행할 에이전트 리스트.
+            messages (List): 에이전트에 전달할 메시지 히스토리.
+            context_variables (dict): 공유 컨텍스트 변수.
+            model_override (str): 모델 이름을 오버라이드할 옵션.
+            debug (bool): 디버그 모드 활성화 여부.
+            timeout (float | Dict[str, float]): 에이전트별 제한 시간(초). 초과하면 해당 실행을 취소.
+            checkpoint (Callable): 턴이 끝날 때마다 checkpoint(에이전트 이름, 부분 결과)를 호출.
+            resume (Dict[str, Response]): 에이전트 이름 -> 이어서 실행할 부분 결과 (checkpoint로 받은 값).
+
+        Returns:
+            List[Response]: 입력 순서와 같은 순서의 실행 결과. 실패/시간 초과한 에이전트는 error가 설정된 Response.
+        """
+        run_ids = self.initialize_agent_state(agents)
+
+        async def run_one(agent: Agent, run_id: str) -> Response:
+            agent_timeout = timeout.get(agent.name) if isinstance(timeout, dict) else timeout
+            try:
+                response = await asyncio.wait_for(
+                    self.run(agent, messages, context_variables,
+                             model_override, False, debug, run_id=run_id,
+                             checkpoint=functools.partial(checkpoint, agent.name) if checkpoint else None,
+                             resume=(resume or {}).get(agent.name)),
+                    agent_timeout,
+                )
+                debug_print(debug, f"Agent {agent.name} completed successfully.")
+                return response
+            except asyncio.TimeoutError:
+                debug_print(debug, f"Agent {agent.name} timed out.")
+                return Response(
+                    agent=agent, error=f"TimeoutError: Agent {agent.name} timed out.")
+            except Exception as e:
+                debug_print(debug, f"Agent {agent.name} failed with error: {e}")
+                return Response(agent=agent, error=f"{type(e).__name__}: {e}")
+
+        return list(await asyncio.gather(
+            *(run_one(agent, run_id) for agent, run_id in zip(agents, run_ids))))
+
+    async def stream_parallel_agents(
+        self,
+        agents: List[Agent],
+        messages: List,
+        context_variables: dict = {},
+        model_override: str = None,
+        debug: bool = False,
+        max_buffer: int = 256,
+    ):
+        """
+        Swarm.stream_parallel_agents의 asyncio 버전 (async 제너레이터).
+        제너레이터를 닫으면 아직 실행 중인 에이전트 task는 취소된다.
+        """
+        run_ids = self.initialize_agent_state(agents)
+        queue: asyncio.Queue = asyncio.Queue(max_buffer)
+
+        async def pump(agent: Agent, run_id: str):
+            self.update_agent_state(run_id, RunState.RUNNING)
+            stream = self.run_and_stream(
+                agent, messages, context_variables, model_override, debug, run_id=run_id)
+            try:
+                response = None
+                async for event in stream:
+                    if "response" in event:
+                        response = event["response"]
+                        break
+                    await queue.put({"agent": agent.name, **event})
+                self.update_agent_state(run_id, RunState.COMPLETED)
+                debug_print(debug, f"Agent {agent.name} completed successfully.")
+            except asyncio.CancelledError:
+                self.update_agent_state(run_id, RunState.CANCELLED, "cancelled")
+                raise
+            except Exception as e:
+                self.update_agent_state(run_id, RunState.FAILED, f"{type(e).__name__}: {e}")
+                debug_print(debug, f"Agent {agent.name} failed with error: {e}")
+                response = Response(agent=agent, error=f"{type(e).__name__}: {e}")
+            finally:
+                await stream.aclose()
+            await queue.put({"agent": agent.name, "response": response})
+
+        tasks = [asyncio.ensure_future(pump(agent, run_id)) for agent, run_id in zip(agents, run_ids)]
+        remaining = len(tasks)
+        try:
+            while remaining:
+                event = await queue.get()
+                if "response" in event:
+                    remaining -= 1
+                yield event
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            for run_id in run_ids:
+                # 시작하기 전에 취소된 task
+                if self.states.get(run_id).state == RunState.IDLE:
+                    self.update_agent_state(run_id, RunState.CANCELLED, "cancelled")
+
+    async def run_first(
+        self,
+        agents: List[Agent],
+        messages: List,
+        context_variables: dict = {},
+        validator: Callable[[Response], bool] = None,
+        model_override: str = None,
+        debug: bool = False,
+        max_buffer: int = 256,
+    ) -> Response:
+        """
+        Swarm.run_first의 asyncio 버전. 나머지 에이전트 task는 취소되므로
+        진행 중인 스트림과 코루틴 도구도 바로 중단된다.
+        """
+        validator = validator or _acceptable
+        events = self.stream_parallel_agents(
+            agents, messages, context_variables, model_override, debug, max_buffer)
+        last = None
+        try:
+            async for event in events:
+                response = event.get("response")
+                if response is None:
+                    continue
+                last = response
+                if response.error is None and self._accepts(validator, response, debug):
+                    debug_print(debug, f"Accepted result from agent {event['agent']}.")
+                    return response
+        finally:
+            await events.aclose()  # 나머지 에이전트 취소
+        return Response(
+            agent=last.agent if last is not None else None,
+            error=f"NoAcceptableResult: none of {[agent.name for agent in agents]} passed validation.",
+        )
+
 
 class CentralOrchestrator:
-    def __init__(self, swarm: Swarm, agent_results: Dict[str, Any]):
+    def __init__(
+        self,
+        swarm: Swarm,
+        agent_results: Dict[str, Any],
+        approval: ApprovalGate = None,
+        speculative: bool = False,
+        checkpoints: CheckpointStore = None,
+        validators: Dict[str, Callable[[Response], bool]] = None,
+    ):
         """
         중앙 오케스트레이터 초기화.
 
         Args:
             swarm (Swarm): 에이전트를 관리하는 Swarm 인스턴스.
             agent_results (Dict[str, Any]): 에이전트 결과를 저장할 외부 데이터 구조.
+            approval (ApprovalGate): 스텝 승인 인터페이스. 없으면 get_user_feedback()으로 콘솔 입력을 받고,
+                이 기본 게이트는 워크플로우가 끝날 때마다 닫는다. 직접 넘긴 게이트는 호출자가 닫는다.
+            speculative (bool): 승인을 기다리는 동안 의존 스텝을 미리 실행할지 여부.
+                retry가 선택되면 미리 실행한 의존 스텝은 취소되고 결과가 롤백된다.
+                미리 실행한 스텝의 출력이 콘솔 입력과 섞이므로 QueueApproval 같은 비대화형 게이트와 함께 쓴다.
+            checkpoints (CheckpointStore): 설정되면 스텝/에이전트 턴마다 체크포인트를 저장하고
+                resume_workflow()로 이어서 실행할 수 있다.
+            validators (Dict[str, Callable]): 스텝 이름 -> validator. "hedged": True인 스텝은 에이전트를 동시에
+                실행해 validator를 통과한 첫 결과만 쓰고 나머지를 취소한다 (Swarm.run_first).
         """
         self.swarm = swarm
-        self.agent_states: Dict[str, str] = {}  # 각 에이전트 상태 저장
+        self.agent_states: Dict[str, RunState] = {}  # 각 에이전트 상태 저장
         self.agent_results = agent_results  # 외부 제공 데이터 구조를 참조
         self.failed_agents: List[str] = []      # 실패한 에이전트 목록
+        self.step_outputs: Dict[str, List[str]] = {}  # 스텝 이름 -> 그 스텝이 결과를 쓴 에이전트 이름
+        self._owns_approval = approval is None
+        self.approval = approval or CallbackApproval(
+            lambda step_name, results: self.get_user_feedback(step_name)
+        )
+        self.speculative = speculative
+        self.checkpoints = checkpoints
+        self.validators = validators or {}
+        self.workflow_id: Optional[str] = None
 
     def initialize_states(self, agents: List[Agent]):
         """
         모든 에이전트의 초기 상태를 설정.
         """
-        self.swarm.initialize_agent_state(agents)
-        self.agent_states = self.swarm.agent_states
+        self.agent_states = {agent.name: RunState.IDLE for agent in agents}
 
-    def update_agent_state_and_result(self, agent_name: str, state: str, result: Any = None):
+    def update_agent_state_and_result(self, agent_name: str, state: Union[RunState, str], result: Any = None):
         """
         에이전트 상태와 결과를 업데이트.
 
         Args:
             agent (Agent): 상태를 업데이트할 에이전트.
-            state (str): 에이전트의 새로운 상태.
+            state (RunState | str): 에이전트의 새로운 상태. 문자열은 RunState로 변환해서 저장.
             result (Any): 에이전트 작업 결과 또는 에러 메시지.
         """
+        state = RunState(state)
         self.agent_states[agent_name] = state
         self.agent_results[agent_name] = result  # 외부 데이터 구조에 결과 저장
-        print(f"[Orchestrator] Agent {agent_name} state updated to {state}.")
-        if result:
+        print(f"[Orchestrator] Agent {agent_name} state updated to {state.value}.")
+        if result and result.error:
+            print(f"[Orchestrator] Agent {agent_name} error: {result.error}")
+        elif result:
             print(f"[Orchestrator] Agent {agent_name} result: {result.messages[-1]['content']}")
             
     def get_user_feedback(self, step_name: str):
@@ -422,70 +1596,438 @@ class CentralOrchestrator:
             else:
                 print("[Orchestrator] Invalid input. Please enter 1 or 2.")
 
-    def execute_workflow(self, workflow: List[Dict], agents: List[Agent], messages: List):
+    def _step_inputs(self, step: Dict, agents: List[Agent]) -> tuple:
+        """스텝의 에이전트 목록과 (의존 스텝 결과가 담긴) context_variables."""
+        step_name = step["name"]
+        dependent_on = step.get("dependent_on", [])
+        print(f"[Workflow] Executing step: {step_name}")
+
+        # 의존성이 있는 경우, 해당 에이전트들의 결과를 context_variables에 병합
+        if dependent_on:
+            print(f"[Workflow] Step {step_name} depends on: {dependent_on}")
+            # 스텝 이름은 그 스텝이 결과를 쓴 에이전트들로 펼친다 (핸드오프된 에이전트, hedged 스텝의 승자 포함)
+            dependent_results = {
+                agent_name: self.agent_results[agent_name]
+                for name in dependent_on
+                for agent_name in self.step_outputs.get(name, [name])
+                if agent_name in self.agent_results
+            }
+            # 의존성 결과를 context_variables에 추가
+            context_variables = {"dependent_results": dependent_results}
+        else:
+            context_variables = {}
+
+        # 현재 스텝에 해당하는 에이전트 선택
+        step_agents = [agent for agent in agents if agent.name in step["agents"]]
+        return step_agents, context_variables
+
+    def _step_span(self, step_name: str):
+        tracer = self.swarm.tracer
+        return tracer.span("workflow.step", step=step_name) if tracer else nullcontext()
+
+    def run_step(
+        self,
+        step: Dict,
+        agents: List[Agent],
+        messages: List,
+        cancel_event: threading.Event = None,
+        checkpoint: Callable[[str, Response], None] = None,
+        resume: Dict[str, Response] = None,
+    ) -> List[Response]:
+        """
+        하나의 스텝을 실행하고 결과를 반환 (agent_results에는 쓰지 않음).
+
+        Args:
+            step (Dict): 실행할 스텝 정의.
+            agents (List[Agent]): 실행할 에이전트 목록.
+            messages (List): 스텝 입력 메시지.
+            cancel_event (threading.Event): 설정되면 실행 중인 에이전트를 턴 경계에서 중단.
+            checkpoint (Callable): 에이전트 턴마다 호출할 체크포인트 콜백 (run_parallel_agents 참고).
+            resume (Dict[str, Response]): 에이전트 이름 -> 이어서 실행할 부분 결과.
+
+        Returns:
+            List[Response]: 스텝 에이전트들의 실행 결과. hedged 스텝은 받아들여진 결과 하나.
+        """
+        step_agents, context_variables = self._step_inputs(step, agents)
+
+        # 에이전트 병렬 실행 및 결과 수집
+        with self._step_span(step["name"]):
+            if step.get("hedged"):
+                return [self.swarm.run_first(
+                    step_agents,
+                    messages,
+                    context_variables,
+                    validator=self.validators.get(step["name"]),
+                    cancel_event=cancel_event,
+                )]
+            return self.swarm.run_parallel_agents(
+                step_agents,
+                messages,
+                context_variables,  # 의존성 결과를 전달
+                cancel_event=cancel_event,
+                checkpoint=checkpoint,
+                resume=resume,
+            )
+
+    def stream_step(
+        self,
+        step: Dict,
+        agents: List[Agent],
+        messages: List,
+        cancel_event: threading.Event = None,
+        emit: Callable[[dict], bool] = None,
+        max_buffer: int = 256,
+    ) -> List[Response]:
+        """
+        run_step의 스트리밍 버전. 에이전트들의 run_and_stream 이벤트를 도착하는 대로 emit(event)에 넘긴다.
+
+        Args:
+            step (Dict): 실행할 스텝 정의.
+            agents (List[Agent]): 실행할 에이전트 목록.
+            messages (List): 스텝 입력 메시지.
+            cancel_event (threading.Event): 설정되면 실행 중인 에이전트를 다음 청크에서 중단.
+            emit (Callable): 이벤트를 받는 함수. False를 반환하면 (소비자가 떠남) 스텝을 중단.
+            max_buffer (int): Swarm.stream_parallel_agents의 max_buffer.
+
+        Returns:
+            List[Response]: 스텝 에이전트들의 실행 결과 (에이전트 순서).
+        """
+        step_agents, context_variables = self._step_inputs(step, agents)
+        responses = {}
+        with self._step_span(step["name"]):
+            if step.get("hedged"):
+                return [self.swarm.run_first(
+                    step_agents,
+                    messages,
+                    context_variables,
+                    validator=self.validators.get(step["name"]),
+                    cancel_event=cancel_event,
+                    on_event=emit,
+                    max_buffer=max_buffer,
+                )]
+            events = self.swarm.stream_parallel_agents(
+                step_agents,
+                messages,
+                context_variables,
+                cancel_event=cancel_event,
+                max_buffer=max_buffer,
+            )
+            try:
+                for event in events:
+                    if "response" in event:
+                        responses[event["agent"]] = event["response"]
+                    if emit is not None and emit(event) is False:
+                        break
+            finally:
+                events.close()
+        return [responses[agent.name] for agent in step_agents if agent.name in responses]
+
+    def execute_workflow(
+        self,
+        workflow: List[Dict],
+        agents: List[Agent],
+        messages: List,
+        workflow_id: str = None,
+    ):
+        """
+        워크플로우를 의존성 그래프에 따라 실행하며 상태 및 결과를 관리.
+        의존성이 모두 끝난 스텝은 즉시 동시에 실행되고, 이전 스텝의 결과는 다음 스텝으로 전달된다.
+
+        스텝이 끝나면 승인을 요청하고, speculative 모드에서는 승인을 기다리는 동안 의존 스텝을 먼저 시작한다.
+        retry가 선택되면 그 스텝의 하위 스텝들을 취소/롤백하고 피드백과 함께 스텝을 다시 실행한다.
+
+        Args:
+            workflow (List[Dict]): 작업 단계와 종속성을 정의한 워크플로우.
+            agents (List[Agent]): 실행할 에이전트 목록.
+            messages (List): 초기 메시지.
+            workflow_id (str): 체크포인트 id (checkpoints가 설정된 경우). 없으면 새로 만들고 self.workflow_id에 저장.
+
+        Raises:
+            WorkflowValidationError: 없는 에이전트, 순환 의존성, 잘못된 의존성 이름이 있는 경우.
+        """
+        checkpoint = self._new_checkpoint(workflow_id, workflow, messages)
+        for _ in self._workflow_events(workflow, agents, messages, stream=False, checkpoint=checkpoint):
+            pass
+
+    def resume_workflow(self, workflow_id: str, workflow: List[Dict], agents: List[Agent]):
+        """
+        체크포인트에서 워크플로우를 이어서 실행.
+
+        승인된 스텝은 다시 실행하지 않고 저장된 결과를 agent_results에 복원하며, 승인을 기다리던 스텝은
+        결과를 복원한 뒤 승인만 다시 요청한다. 실행 중이던 스텝의 에이전트는 마지막으로 끝난 턴의
+        히스토리, context_variables, 활성 에이전트에서 이어서 실행한다.
+        에이전트는 이름으로 저장되므로 agents (와 핸드오프로 도달할 수 있는 에이전트)에서 찾는다.
+
+        Args:
+            workflow_id (str): execute_workflow에서 사용한 체크포인트 id.
+            workflow (List[Dict]): 워크플로우 정의 (체크포인트를 만들 때와 같아야 함).
+            agents (List[Agent]): 실행할 에이전트 목록.
+
+        Raises:
+            CheckpointError: checkpoints가 없거나, 체크포인트가 없거나, 워크플로우 정의가 바뀐 경우.
+        """
+        if self.checkpoints is None:
+            raise CheckpointError("resume_workflow requires a CheckpointStore (checkpoints=...)")
+        checkpoint = WorkflowCheckpoint.load(self.checkpoints, workflow_id, workflow)
+        self.workflow_id = workflow_id
+        messages = checkpoint.manifest["messages"]
+        events = self._workflow_events(
+            workflow, agents, messages, stream=False, checkpoint=checkpoint, resume=True)
+        for _ in events:
+            pass
+
+    def _new_checkpoint(self, workflow_id: str, workflow: List[Dict], messages: List):
+        if self.checkpoints is None:
+            return None
+        self.workflow_id = workflow_id or uuid.uuid4().hex
+        return WorkflowCheckpoint(self.checkpoints, self.workflow_id, workflow, messages)
+
+    def stream_workflow(
+        self,
+        workflow: List[Dict],
+        agents: List[Agent],
+        messages: List,
+        max_buffer: int = 256,
+        workflow_id: str = None,
+    ):
         """
-        워크플로우를 실행하며 상태 및 결과를 관리.
-        이전 스텝의 결과를 다음 스텝으로 전달.
+        execute_workflow의 스트리밍 버전. 스텝 에이전트들의 run_and_stream 이벤트를 도착하는 대로 yield한다.
+        실행 순서, 승인, retry, agent_results 갱신은 execute_workflow와 같다.
+
+        이벤트 (모두 "step" 키를 가짐):
+            {"step", "agent", ...}: run_and_stream 이벤트 (delim/content/tool_calls 등). 에이전트별 순서 보장.
+            {"step", "agent", "response"}: 에이전트 실행 종료.
+            {"step", "results"}: 스텝 종료 (승인 요청 직전).
+            {"step", "decision"}: 승인 결과 ("next" 또는 "retry").
+            {"step", "cancelled": True}: 상위 스텝의 retry로 취소된 스텝. 이 스텝의 이전 이벤트는 무효.
+
+        소비자가 max_buffer개 이상 밀리면 에이전트 스트림 읽기가 멈추고,
+        제너레이터를 닫으면 실행 중인 스텝은 모두 취소된다.
 
         Args:
             workflow (List[Dict]): 작업 단계와 종속성을 정의한 워크플로우.
             agents (List[Agent]): 실행할 에이전트 목록.
             messages (List): 초기 메시지.
+            max_buffer (int): 소비자가 가져가지 않은 이벤트의 최대 수.
+            workflow_id (str): 체크포인트 id. 스트리밍 실행은 스텝 단위로만 체크포인트를 저장한다.
         """
+        checkpoint = self._new_checkpoint(workflow_id, workflow, messages)
+        return self._workflow_events(
+            workflow, agents, messages, stream=True, max_buffer=max_buffer, checkpoint=checkpoint)
+
+    def _workflow_events(
+        self,
+        workflow: List[Dict],
+        agents: List[Agent],
+        messages: List,
+        stream: bool,
+        max_buffer: int = 256,
+        checkpoint: WorkflowCheckpoint = None,
+        resume: bool = False,
+    ):
+        # 실행 전에 그래프 검증
+        graph = WorkflowGraph(workflow, agents)
+        dependents = graph.dependents()
+        roots = set(graph.roots())
+
         # 초기 상태 설정
         self.initialize_states(agents)
 
-        for step in workflow:
-            step_name = step["name"]
-            dependent_on = step.get("dependent_on", [])
-            if step_name == workflow[0]["name"]:
-                first_query = messages[0]["content"]+","+step["description"]
-                step_messages = [{"role":"user", "content":first_query}]
+        descendants = {}
+        for step_name in reversed(graph.order):
+            descendants[step_name] = set(dependents[step_name]).union(
+                *(descendants[child] for child in dependents[step_name]))
+
+        step_messages = {}
+        for step_name, step in graph.steps.items():
+            if step_name in roots:
+                # 시작 스텝에는 사용자 질의를 함께 전달
+                content = messages[0]["content"]+","+step["description"]
             else:
-                step_messages = [{"role":"user", "content":step["description"]}]
-            messages = step_messages
-            while True:
-
-                print(f"[Workflow] Executing step: {step_name}")
-
-                # 의존성이 있는 경우, 해당 에이전트들의 결과를 context_variables에 병합
-                if dependent_on:
-                    print(f"[Workflow] Step {step_name} depends on: {dependent_on}")
-                    dependent_results = {
-                        agent_name: self.agent_results[agent_name]
-                        for agent_name in dependent_on
-                        if agent_name in self.agent_results
-                    }
-                    # 의존성 결과를 context_variables에 추가
-                    context_variables = {"dependent_results": dependent_results}
+                content = step["description"]
+            step_messages[step_name] = [{"role": "user", "content": content}]
+
+        epochs = {name: 0 for name in graph.steps}
+        cancel_events = {}
+        rollback = {}          # step -> {agent_name: 이전 값 (없으면 _MISSING)}
+        launched = set()       # 실행 중이거나 실행이 끝난 스텝
+        provisional = set()    # 실행이 끝나고 승인을 기다리는 스텝
+        confirmed = set()      # 승인된 스텝
+        pending = {}           # Future -> (kind, step_name, epoch)
+        self.step_durations = {}
+        self.step_outputs = {}
+        started = {}
+        # 끝난 Future와 (stream이면) 에이전트 이벤트가 함께 들어오는 채널
+        channel = EventChannel(max_buffer)
+
+        with ThreadPoolExecutor(max_workers=len(graph.steps) or 1,
+                                thread_name_prefix="swarm-step") as executor:
+
+            def ready(step_name: str) -> bool:
+                finished = confirmed | provisional if self.speculative else confirmed
+                return graph.dependencies[step_name] <= finished
+
+            def track(future, kind: str, step_name: str):
+                pending[future] = (kind, step_name, epochs[step_name])
+                future.add_done_callback(channel.notify)
+
+            def launch(step_name: str):
+                launched.add(step_name)
+                cancel_events[step_name] = threading.Event()
+                started[step_name] = time.monotonic()
+                if checkpoint is not None:
+                    generation = checkpoint.launched(step_name, step_messages[step_name])
+                if stream:
+                    epoch = epochs[step_name]
+                    future = executor.submit(
+                        self.stream_step,
+                        graph.steps[step_name],
+                        agents,
+                        step_messages[step_name],
+                        cancel_events[step_name],
+                        lambda event: channel.put((step_name, epoch, event)),
+                        max_buffer,
+                    )
                 else:
-                    context_variables = {}
+                    future = executor.submit(
+                        self.run_step,
+                        graph.steps[step_name],
+                        agents,
+                        step_messages[step_name],
+                        cancel_events[step_name],
+                        checkpoint.agent_saver(step_name, generation) if checkpoint else None,
+                        partials.pop(step_name, None),
+                    )
+                track(future, "run", step_name)
 
-                # 현재 스텝에 해당하는 에이전트 선택
-                step_agents = [agent for agent in agents if agent.name in step["agents"]]
+            def launch_ready():
+                for step_name in graph.order:
+                    if step_name not in launched and ready(step_name):
+                        launch(step_name)
 
-                # 에이전트 병렬 실행 및 결과 수집
-                results = self.swarm.run_parallel_agents(
-                    step_agents,
-                    messages,
-                    context_variables  # 의존성 결과를 전달
-                )
+            def reset(step_name: str):
+                """스텝을 취소하고 그 스텝이 쓴 결과를 롤백."""
+                epochs[step_name] += 1
+                if step_name in cancel_events:
+                    cancel_events[step_name].set()
+                # 기다리던 승인 요청은 철회 (그대로 두면 응답이 오지 않아 루프가 끝나지 않는다)
+                for future, (kind, name, _) in list(pending.items()):
+                    if kind == "approval" and name == step_name:
+                        del pending[future]
+                        self.approval.withdraw(future)
+                for agent_name, previous in rollback.pop(step_name, {}).items():
+                    if previous is _MISSING:
+                        self.agent_results.pop(agent_name, None)
+                    else:
+                        self.agent_results[agent_name] = previous
+                self.step_outputs.pop(step_name, None)
+                launched.discard(step_name)
+                provisional.discard(step_name)
+                confirmed.discard(step_name)
+                if checkpoint is not None:
+                    checkpoint.reset(step_name)
 
+            def record_results(step_name: str, results: List[Response]):
                 # 에이전트 상태 및 결과 업데이트
+                previous = rollback.setdefault(step_name, {})
+                self.step_outputs[step_name] = [result.agent.name for result in results]
                 for result in results:
                     agent_name = result.agent.name
-                    state = "Completed" if result.messages else "Failed"
+                    previous.setdefault(
+                        agent_name, self.agent_results.get(agent_name, _MISSING))
+                    state = RunState.COMPLETED if result.messages else RunState.FAILED
                     self.update_agent_state_and_result(agent_name, state, result)
-                        
-                # 사용자 입력 처리
-                user_decision = self.get_user_feedback(step_name)
-                if user_decision == "retry":
-                    print(f"[Orchestrator] Retrying step: {step_name}")
-                    feedback = self.agent_results.get("feedback", "No feedback provided.")
-                    messages.append({"role": "user","content": f"{step_messages}\nFeedback: {feedback}"})
-                    continue  # 현재 스텝 다시 실행
-                elif user_decision == "next":
-                    print(f"[Orchestrator] Proceeding to the next step.")
-                    break
 
-        print("[Orchestrator] Workflow execution completed.")
\ No newline at end of file
+            partials = {}  # step -> 이어서 실행할 에이전트별 부분 결과
+            if resume:
+                agent_map = reachable_agents(agents)
+                if checkpoint.manifest["feedback"] is not None:
+                    self.agent_results["feedback"] = checkpoint.manifest["feedback"]
+                for step_name, record in checkpoint.step_records().items():
+                    step_messages[step_name] = record["messages"]
+                    if record["status"] == "running":
+                        partials[step_name] = checkpoint.partials(step_name, agent_map)
+                        continue
+                    print(f"[Orchestrator] Restoring step from checkpoint: {step_name}")
+                    results = [load_response(r, agent_map) for r in record["results"]]
+                    record_results(step_name, results)
+                    launched.add(step_name)
+                    if record["status"] == "approved":
+                        confirmed.add(step_name)
+                    else:
+                        # 승인을 기다리던 스텝은 승인만 다시 요청
+                        provisional.add(step_name)
+                        track(self.approval.request(step_name, results), "approval", step_name)
+
+            try:
+                launch_ready()
+                while pending:
+                    item = channel.get()
+                    if not isinstance(item, Future):
+                        step_name, epoch, event = item
+                        if epoch == epochs[step_name]:  # 취소된 실행의 이벤트는 버림
+                            yield {"step": step_name, **event}
+                        continue
+
+                    if item not in pending:
+                        continue  # 철회된 승인
+                    kind, step_name, epoch = pending.pop(item)
+                    if epoch != epochs[step_name]:
+                        continue  # 취소된 실행/승인은 무시
+
+                    if kind == "run":
+                        results = item.result()  # 스텝 실패 시 예외 전파
+                        self.step_durations[step_name] = time.monotonic() - started[step_name]
+                        record_results(step_name, results)
+                        if checkpoint is not None:
+                            checkpoint.completed(step_name, results)
+                        provisional.add(step_name)
+                        yield {"step": step_name, "results": results}
+                        track(self.approval.request(step_name, results), "approval", step_name)
+
+                    else:
+                        decision = item.result()
+                        provisional.discard(step_name)
+                        yield {"step": step_name, "decision": decision.action}
+                        if decision.action == "retry":
+                            print(f"[Orchestrator] Retrying step: {step_name}")
+                            feedback = decision.feedback
+                            if feedback is not None:
+                                self.agent_results["feedback"] = feedback
+                                if checkpoint is not None:
+                                    checkpoint.set_feedback(feedback)
+                            else:
+                                feedback = self.agent_results.get("feedback", "No feedback provided.")
+                            for child in descendants[step_name]:
+                                if child in launched:
+                                    print(f"[Orchestrator] Cancelling speculative step: {child}")
+                                    reset(child)
+                                    yield {"step": child, "cancelled": True}
+                            step_messages[step_name].append(
+                                {"role": "user", "content": f"{step_messages[step_name]}\nFeedback: {feedback}"})
+                            epochs[step_name] += 1
+                            launch(step_name)
+                        else:
+                            print(f"[Orchestrator] Proceeding to the next step.")
+                            confirmed.add(step_name)
+                            if checkpoint is not None:
+                                checkpoint.approved(step_name)
+
+                    launch_ready()
+            finally:
+                # 소비자가 떠났거나 실패한 경우 실행 중인 스텝을 멈춘다
+                channel.close()
+                for cancel_event in cancel_events.values():
+                    cancel_event.set()
+                for future, (kind, _, _) in list(pending.items()):
+                    if kind == "approval":
+                        self.approval.withdraw(future)
+                if self._owns_approval:
+                    self.approval.close()
+
+        if checkpoint is not None:
+            checkpoint.finished()
+        self.critical_path = graph.critical_path(self.step_durations)
+        path, duration = self.critical_path
+        print(f"[Workflow] Critical path: {' -> '.join(path)} ({duration:.2f}s)")
+        print("[Orchestrator] Workflow execution completed.")
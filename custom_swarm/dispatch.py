@@ -0,0 +1,370 @@
+import asyncio
+import functools
+import heapq
+import itertools
+import random
+import threading
+import time
+from typing import Any, Callable, List, Optional, Tuple, Type
+
+import openai
+from pydantic import BaseModel
+
+from .context_window import TokenCounter
+
+# 재시도할 HTTP 상태 코드 (timeout, conflict, rate limit, 서버 오류)
+RETRYABLE_STATUS_CODES = frozenset({408, 409, 429, 500, 502, 503, 504})
+
+
+class RetryPolicy(BaseModel):
+    """
+    지수 백오프 + full jitter 재시도 정책.
+
+    Attributes:
+        max_attempts (int): 첫 시도를 포함한 최대 시도 횟수.
+        initial_delay (float): 첫 재시도 전 최대 대기 시간(초).
+        max_delay (float): 대기 시간 상한(초).
+        multiplier (float): 시도마다 대기 시간 상한에 곱하는 값.
+        jitter (bool): True면 [0, 상한] 구간에서 무작위로 대기 (동시 재시도 분산).
+        retry_on (Tuple[type, ...]): 상태 코드와 무관하게 재시도할 예외 타입.
+    """
+
+    max_attempts: int = 5
+    initial_delay: float = 0.5
+    max_delay: float = 30.0
+    multiplier: float = 2.0
+    jitter: bool = True
+    retry_on: Tuple[Type[BaseException], ...] = (openai.APIConnectionError,)
+
+    def is_retryable(self, error: BaseException) -> bool:
+        if isinstance(error, self.retry_on):
+            return True
+        return isinstance(error, openai.APIStatusError) and error.status_code in RETRYABLE_STATUS_CODES
+
+    def delay(self, attempt: int, retry_after: float = None) -> float:
+        """attempt번째 시도가 실패한 뒤 기다릴 시간(초). 서버가 준 Retry-After보다 짧지 않다."""
+        ceiling = min(self.max_delay, self.initial_delay * self.multiplier ** (attempt - 1))
+        delay = random.uniform(0, ceiling) if self.jitter else ceiling
+        return max(delay, retry_after or 0.0)
+
+
+def retry_after(error: BaseException) -> Optional[float]:
+    """응답의 retry-after-ms / retry-after 헤더(초 단위)를 읽는다."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000
+        if headers.get("retry-after"):
+            return float(headers["retry-after"])
+    except ValueError:
+        return None
+    return None
+
+
+class TokenBucket:
+    """
+    분당 rate만큼 채워지는 토큰 버킷. 스레드 안전하지 않으므로 Dispatcher의 잠금 안에서 사용.
+
+    Args:
+        per_minute (float): 분당 허용량.
+        capacity (float): 최대 버스트. 기본값은 per_minute.
+    """
+
+    def __init__(self, per_minute: float, capacity: float = None):
+        self.rate = per_minute / 60.0
+        self.capacity = capacity if capacity is not None else per_minute
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """amount를 가져갈 수 있을 때까지 남은 시간(초). 0이면 지금 가능."""
+        self._refill(now)
+        # 용량보다 큰 요청은 버킷이 가득 찼을 때 허용 (이후 요청들이 빚을 갚을 때까지 대기)
+        needed = min(amount, self.capacity) - self.tokens
+        return 0.0 if needed <= 0 else needed / self.rate
+
+    def take(self, amount: float) -> None:
+        self.tokens -= amount
+
+    def adjust(self, amount: float) -> None:
+        """예상과 실제 사용량의 차이를 반영 (음수면 돌려받음)."""
+        self.tokens = min(self.capacity, self.tokens - amount)
+
+
+class _Ticket:
+    __slots__ = ("priority", "seq", "tokens", "wake")
+
+    def __init__(self, priority: int, seq: int, tokens: int, wake: Callable[[], None]):
+        self.priority = priority
+        self.seq = seq
+        self.tokens = tokens
+        self.wake = wake
+
+    def __lt__(self, other: "_Ticket") -> bool:
+        # priority가 큰 요청 먼저, 같으면 먼저 온 요청 먼저
+        return (-self.priority, self.seq) < (-other.priority, other.seq)
+
+
+class Dispatcher:
+    """
+    LLM 요청을 보내는 공유 관문. 하나의 Swarm의 모든 병렬 에이전트가 같은 Dispatcher를 거친다.
+
+    - requests_per_minute / tokens_per_minute 토큰 버킷으로 요청 속도를 제한한다.
+    - 대기 중인 요청은 priority(큰 값 우선) 순서로 허용된다.
+    - 재시도 가능한 오류(429, 5xx, 연결 오류)는 RetryPolicy에 따라 재시도하고,
+      429가 오면 Retry-After 동안 모든 요청을 멈춘다.
+
+    OpenAI 클라이언트의 자체 재시도와 겹치지 않도록 클라이언트는 max_retries=0으로 만드는 것을 권장.
+
+    Args:
+        requests_per_minute (float): 분당 요청 수 제한.
+        tokens_per_minute (float): 분당 토큰 수 제한 (프롬프트 추정치 + max_tokens로 예약 후 실제 사용량으로 보정).
+        max_in_flight (int): 동시에 진행 중인 요청 수 제한. 스트리밍 요청은 스트림을 다 읽거나 닫을 때까지 진행 중으로 본다.
+        retry (RetryPolicy): 재시도 정책. None이면 기본 정책 (재시도를 끄려면 max_attempts=1).
+        counter (TokenCounter): 프롬프트 토큰 추정용 카운터.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float = None,
+        tokens_per_minute: float = None,
+        max_in_flight: int = None,
+        retry: RetryPolicy = None,
+        counter: TokenCounter = None,
+    ):
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.max_in_flight = max_in_flight
+        self.retry = retry if retry is not None else RetryPolicy()
+        self.counter = counter or (TokenCounter() if tokens_per_minute else None)
+        self.in_flight = 0
+        self.retries = 0
+        self._paused_until = 0.0
+        self._queue: List[_Ticket] = []
+        self._seq = itertools.count()
+        self._timer: Optional[threading.Timer] = None
+        self._lock = threading.Lock()
+
+    @property
+    def queued(self) -> int:
+        return len(self._queue)
+
+    def estimate_tokens(self, create_params: dict) -> int:
+        if self.counter is None:
+            return 0
+        return self.counter.total(create_params.get("messages", ())) + (
+            create_params.get("max_tokens") or 0)
+
+    # -- 허용(admission) --
+
+    def _enqueue(self, ticket: _Ticket) -> None:
+        with self._lock:
+            heapq.heappush(self._queue, ticket)
+            self._admit()
+
+    def _admit(self) -> None:
+        # self._lock을 잡은 상태에서 호출. 대기열 맨 앞부터 가능한 만큼 허용한다.
+        while self._queue:
+            if self.max_in_flight is not None and self.in_flight >= self.max_in_flight:
+                return  # _release()에서 다시 시도
+            ticket = self._queue[0]
+            now = time.monotonic()
+            wait = self._paused_until - now
+            if self.requests is not None:
+                wait = max(wait, self.requests.wait_time(1, now))
+            if self.tokens is not None:
+                wait = max(wait, self.tokens.wait_time(ticket.tokens, now))
+            if wait > 0:
+                self._schedule(wait)
+                return
+            heapq.heappop(self._queue)
+            if self.requests is not None:
+                self.requests.take(1)
+            if self.tokens is not None:
+                self.tokens.take(ticket.tokens)
+            self.in_flight += 1
+            ticket.wake()
+
+    def _schedule(self, wait: float) -> None:
+        if self._timer is None:
+            self._timer = threading.Timer(wait, self._on_timer)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _on_timer(self) -> None:
+        with self._lock:
+            self._timer = None
+            self._admit()
+
+    def _release(self, reserved: int, used: int = None) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            if self.tokens is not None and used is not None:
+                self.tokens.adjust(used - reserved)
+            self._admit()
+
+    def _pause(self, seconds: float) -> None:
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def _acquire(self, priority: int, tokens: int) -> None:
+        admitted = threading.Event()
+        self._enqueue(_Ticket(priority, next(self._seq), tokens, admitted.set))
+        admitted.wait()
+
+    async def _acquire_async(self, priority: int, tokens: int) -> None:
+        loop = asyncio.get_running_loop()
+        admitted = loop.create_future()
+
+        def wake():
+            loop.call_soon_threadsafe(lambda: admitted.done() or admitted.set_result(None))
+
+        ticket = _Ticket(priority, next(self._seq), tokens, wake)
+        self._enqueue(ticket)
+        try:
+            await admitted
+        except asyncio.CancelledError:
+            with self._lock:
+                waiting = ticket in self._queue
+                if waiting:
+                    self._queue.remove(ticket)
+                    heapq.heapify(self._queue)
+            if not waiting:
+                # 허용된 직후 취소됨: 예약한 슬롯을 돌려준다
+                self._release(tokens)
+            raise
+
+    # -- 요청 --
+
+    def _after_failure(self, error: BaseException, attempt: int) -> Optional[float]:
+        """재시도할 경우 대기 시간, 아니면 None."""
+        if attempt >= self.retry.max_attempts or not self.retry.is_retryable(error):
+            return None
+        server_delay = retry_after(error)
+        if getattr(error, "status_code", None) == 429:
+            # 한 에이전트가 429를 받으면 다른 에이전트들도 같이 물러난다
+            self._pause(server_delay if server_delay is not None else self.retry.initial_delay)
+        self.retries += 1
+        return self.retry.delay(attempt, server_delay)
+
+    def call(self, create: Callable[..., Any], create_params: dict, priority: int = 0):
+        """create(**create_params)를 속도 제한/재시도와 함께 호출."""
+        reserved = self.estimate_tokens(create_params)
+        attempt = 0
+        while True:
+            attempt += 1
+            self._acquire(priority, reserved)
+            try:
+                result = create(**create_params)
+            except Exception as e:
+                self._release(reserved)
+                delay = self._after_failure(e, attempt)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                continue
+            except BaseException:
+                self._release(reserved)
+                raise
+            if create_params.get("stream"):
+                return _StreamSlot(result, functools.partial(self._release, reserved))
+            self._release(reserved, _used_tokens(result))
+            return result
+
+    async def acall(self, create: Callable[..., Any], create_params: dict, priority: int = 0):
+        """call()의 asyncio 버전. create는 코루틴 함수."""
+        reserved = self.estimate_tokens(create_params)
+        attempt = 0
+        while True:
+            attempt += 1
+            await self._acquire_async(priority, reserved)
+            try:
+                result = await create(**create_params)
+            except Exception as e:
+                self._release(reserved)
+                delay = self._after_failure(e, attempt)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                continue
+            except BaseException:
+                self._release(reserved)
+                raise
+            if create_params.get("stream"):
+                return _StreamSlot(result, functools.partial(self._release, reserved))
+            self._release(reserved, _used_tokens(result))
+            return result
+
+
+class _StreamSlot:
+    """
+    스트리밍 응답 래퍼. 스트림을 끝까지 읽거나, 닫거나, 버릴 때 in-flight 슬롯을 반납한다.
+    마지막 청크에 usage가 있으면 (stream_options={"include_usage": True}) 토큰 예약을 보정한다.
+    """
+
+    def __init__(self, stream, release: Callable[[Optional[int]], None]):
+        self._stream = stream
+        self._release = release
+        self._released = False
+        self._used: Optional[int] = None
+        self._iterator = None
+
+    def _done(self) -> None:
+        if not self._released:
+            self._released = True
+            self._release(self._used)
+
+    def _seen(self, chunk):
+        used = _used_tokens(chunk)
+        if used is not None:
+            self._used = used
+        return chunk
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self._iterator is None:
+            self._iterator = iter(self._stream)
+        try:
+            return self._seen(next(self._iterator))
+        except BaseException:
+            self._done()
+            raise
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self._iterator is None:
+            self._iterator = self._stream.__aiter__()
+        try:
+            return self._seen(await self._iterator.__anext__())
+        except BaseException:
+            self._done()
+            raise
+
+    def close(self):
+        try:
+            close = getattr(self._stream, "close", None)
+            return close() if close is not None else None
+        finally:
+            self._done()
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+    def __del__(self):
+        self._done()
+
+
+def _used_tokens(completion) -> Optional[int]:
+    usage = getattr(completion, "usage", None)
+    return usage.total_tokens if usage is not None else None
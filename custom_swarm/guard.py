@@ -0,0 +1,108 @@
+import json
+import time
+from collections import Counter
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class RunLimits(BaseModel):
+    """
+    한 번의 run에 대한 상한. None이면 제한 없음.
+
+    Attributes:
+        max_turns (int): LLM 호출 수.
+        max_handoffs (int): 에이전트 전환 수.
+        max_wall_time (float): 경과 시간(초).
+        max_tokens (int): completion usage 기준 총 토큰 수. 스트리밍은 마지막 청크의 usage (stream_options.include_usage).
+        max_cycle_repeats (int): 같은 에이전트 전환 순환(A -> B -> A ...)이 연속으로 반복될 수 있는 횟수.
+        max_identical_tool_calls (int): 같은 이름/인자의 tool call이 반복될 수 있는 횟수.
+    """
+
+    max_turns: Optional[int] = None
+    max_handoffs: Optional[int] = None
+    max_wall_time: Optional[float] = None
+    max_tokens: Optional[int] = None
+    max_cycle_repeats: Optional[int] = 3
+    max_identical_tool_calls: Optional[int] = 3
+
+
+class RunGuard:
+    """
+    run 루프의 비용을 추적하고 한도를 넘으면 중단 사유를 돌려준다.
+
+    Args:
+        limits (RunLimits): 적용할 상한.
+        agent_name (str): 시작 에이전트 이름.
+    """
+
+    def __init__(self, limits: RunLimits, agent_name: str):
+        self.limits = limits
+        self.started = time.monotonic()
+        self.turns = 0
+        self.handoffs = 0
+        self.tokens = 0
+        self.agent_path: List[str] = [agent_name]
+        self.tool_call_counts: Counter = Counter()
+        self._tripped: Optional[str] = None
+
+    def record_completion(self, completion) -> None:
+        self.turns += 1
+        usage = getattr(completion, "usage", None)
+        if usage is not None:
+            self.tokens += usage.total_tokens or 0
+
+    def record_tool_calls(self, tool_calls) -> None:
+        limit = self.limits.max_identical_tool_calls
+        for tool_call in tool_calls:
+            function = tool_call.function
+            try:
+                arguments = json.dumps(json.loads(function.arguments), sort_keys=True)
+            except (TypeError, ValueError):
+                arguments = function.arguments
+            key = (function.name, arguments)
+            self.tool_call_counts[key] += 1
+            if limit is not None and self.tool_call_counts[key] > limit and not self._tripped:
+                self._tripped = (
+                    f"identical_tool_calls: {function.name}({arguments}) "
+                    f"called {self.tool_call_counts[key]} times (limit {limit})"
+                )
+
+    def record_handoff(self, agent_name: str) -> None:
+        self.handoffs += 1
+        self.agent_path.append(agent_name)
+        cycle = self._repeating_cycle()
+        if cycle and not self._tripped:
+            self._tripped = (
+                f"handoff_cycle: {' -> '.join(cycle + cycle[:1])} repeated "
+                f"{self.limits.max_cycle_repeats} times"
+            )
+
+    def _repeating_cycle(self) -> Optional[List[str]]:
+        """agent_path 끝부분이 같은 전환 블록의 max_cycle_repeats회 반복이면 그 블록을 반환."""
+        repeats = self.limits.max_cycle_repeats
+        if repeats is None:
+            return None
+        # 전환(A -> B) 기준으로 보려면 블록 길이 * repeats + 1 개의 에이전트가 필요
+        path = self.agent_path
+        for period in range(1, (len(path) - 1) // repeats + 1):
+            tail = path[-(period * repeats + 1):]
+            if all(tail[i] == tail[i + period] for i in range(len(tail) - period)):
+                return tail[:period]
+        return None
+
+    def check(self) -> Optional[str]:
+        """다음 턴을 시작하기 전에 호출. 한도를 넘었으면 중단 사유, 아니면 None."""
+        if self._tripped:
+            return self._tripped
+        limits = self.limits
+        if limits.max_turns is not None and self.turns >= limits.max_turns:
+            return f"max_turns: {self.turns} turns (limit {limits.max_turns})"
+        if limits.max_handoffs is not None and self.handoffs > limits.max_handoffs:
+            return f"max_handoffs: {self.handoffs} handoffs (limit {limits.max_handoffs})"
+        if limits.max_tokens is not None and self.tokens >= limits.max_tokens:
+            return f"max_tokens: {self.tokens} tokens (limit {limits.max_tokens})"
+        elapsed = time.monotonic() - self.started
+        if limits.max_wall_time is not None and elapsed >= limits.max_wall_time:
+            return f"max_wall_time: {elapsed:.1f}s (limit {limits.max_wall_time}s)"
+        return None
@@ -0,0 +1,128 @@
+from collections import ChainMap
+from collections.abc import Mapping, MutableMapping, Sequence
+from types import MappingProxyType
+from typing import Iterator, List
+
+
+class History(Sequence):
+    """
+    공유 prefix + 실행별 tail로 구성된 append-only 메시지 히스토리.
+
+    호출자가 넘긴 메시지 리스트는 복사하지 않고 참조만 유지하며(생성 시점의 길이까지),
+    실행 중 추가되는 메시지는 tail에만 쌓인다. prefix 메시지는 수정하지 않는다.
+    """
+
+    __slots__ = ("_prefix", "_prefix_len", "_tail")
+
+    def __init__(self, prefix: Sequence = ()):
+        self._prefix = prefix
+        self._prefix_len = len(prefix)
+        self._tail: List[dict] = []
+
+    @property
+    def prefix_len(self) -> int:
+        return self._prefix_len
+
+    @property
+    def tail(self) -> List[dict]:
+        """이번 실행에서 추가된 메시지 (복사본)."""
+        return list(self._tail)
+
+    def append(self, message: dict) -> None:
+        self._tail.append(message)
+
+    def extend(self, messages) -> None:
+        self._tail.extend(messages)
+
+    def __len__(self) -> int:
+        return self._prefix_len + len(self._tail)
+
+    def __iter__(self) -> Iterator[dict]:
+        prefix = self._prefix
+        for i in range(self._prefix_len):
+            yield prefix[i]
+        yield from self._tail
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step == 1 and start >= self._prefix_len:
+                return self._tail[start - self._prefix_len:stop - self._prefix_len]
+            return [self[i] for i in range(start, stop, step)]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("History index out of range")
+        if index < self._prefix_len:
+            return self._prefix[index]
+        return self._tail[index - self._prefix_len]
+
+    def __repr__(self) -> str:
+        return f"History(prefix_len={self._prefix_len}, tail_len={len(self._tail)})"
+
+
+_MISSING = object()
+
+
+class _ContextOverlay(ChainMap):
+    """
+    쓰기/삭제는 maps[0]와 삭제 표시(deleted)에만 기록하고 원본 매핑은 건드리지 않는 ChainMap.
+    도구가 호출자가 넘긴 키를 pop/del해도 KeyError 없이 이 실행에서만 지워진 것으로 보인다.
+    """
+
+    def __init__(self, base: Mapping):
+        super().__init__({}, MappingProxyType(base))
+        self.deleted = set()
+
+    def __getitem__(self, key):
+        if key in self.deleted:
+            return self.__missing__(key)
+        return super().__getitem__(key)
+
+    def __setitem__(self, key, value):
+        self.maps[0][key] = value
+        self.deleted.discard(key)
+
+    def __delitem__(self, key):
+        if key in self.deleted:
+            raise KeyError(key)
+        found = self.maps[0].pop(key, _MISSING) is not _MISSING
+        if any(key in mapping for mapping in self.maps[1:]):
+            self.deleted.add(key)
+        elif not found:
+            raise KeyError(key)
+
+    def __contains__(self, key):
+        return key not in self.deleted and super().__contains__(key)
+
+    def __iter__(self) -> Iterator:
+        return (key for key in super().__iter__() if key not in self.deleted)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __bool__(self) -> bool:
+        return any(True for _ in self)
+
+    # ChainMap의 pop/popitem/clear는 maps[0]만 보므로 MutableMapping 기본 구현을 쓴다
+    pop = MutableMapping.pop
+    popitem = MutableMapping.popitem
+    clear = MutableMapping.clear
+
+    def copy(self) -> "_ContextOverlay":
+        overlay = _ContextOverlay(self.maps[1])
+        overlay.maps = [self.maps[0].copy(), *self.maps[1:]]
+        overlay.deleted = set(self.deleted)
+        return overlay
+
+    __copy__ = copy
+
+
+def context_overlay(context_variables: Mapping) -> ChainMap:
+    """
+    context_variables를 얕게 고정(read-only)한 뒤, 쓰기는 별도 dict에 기록하는 ChainMap으로 감싼다.
+
+    deepcopy 없이 호출자의 dict를 보호한다. 중첩된 값 자체는 공유되므로 in-place로 수정하지 않는다.
+    호출자가 넘긴 키를 삭제해도 원본은 그대로 두고 이 오버레이에서만 지운다.
+    """
+    return _ContextOverlay(context_variables)
@@ -0,0 +1,59 @@
+import threading
+from collections import deque
+from typing import Any
+
+
+class EventChannel:
+    """
+    여러 생산자 스레드의 이벤트를 한 소비자에게 전달하는 채널.
+
+    put()은 버퍼에 maxsize개가 쌓여 있으면 소비자가 가져갈 때까지 블로킹한다 (back-pressure).
+    notify()는 종료 표식처럼 잃어버리면 안 되는 항목용으로, 버퍼 크기와 관계없이 바로 넣는다.
+    생산자 한 명이 넣은 항목은 넣은 순서대로 나온다.
+
+    Args:
+        maxsize (int): put()으로 쌓일 수 있는 최대 항목 수.
+    """
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self._items: deque = deque()
+        self._buffered = 0  # put()으로 들어와 아직 나가지 않은 항목 수
+        self._closed = False
+        self._cond = threading.Condition()
+
+    def put(self, item: Any) -> bool:
+        """버퍼에 자리가 날 때까지 기다렸다가 넣는다. 채널이 닫혔으면 False."""
+        with self._cond:
+            while self._buffered >= self.maxsize and not self._closed:
+                self._cond.wait()
+            if self._closed:
+                return False
+            self._items.append((True, item))
+            self._buffered += 1
+            self._cond.notify_all()
+            return True
+
+    def notify(self, item: Any) -> None:
+        with self._cond:
+            if not self._closed:
+                self._items.append((False, item))
+                self._cond.notify_all()
+
+    def get(self) -> Any:
+        with self._cond:
+            while not self._items:
+                self._cond.wait()
+            buffered, item = self._items.popleft()
+            if buffered:
+                self._buffered -= 1
+                self._cond.notify_all()
+            return item
+
+    def close(self) -> None:
+        """소비자가 떠날 때 호출. 기다리던 생산자를 깨우고 이후 put()은 False를 반환."""
+        with self._cond:
+            self._closed = True
+            self._items.clear()
+            self._buffered = 0
+            self._cond.notify_all()
@@ -0,0 +1,148 @@
+import multiprocessing
+import pickle
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, Callable, Union
+
+_PROCESS_TOOL_ATTR = "__swarm_process_tool__"
+
+
+def process_tool(func: Callable = None):
+    """
+    도구 함수를 프로세스 풀에서 실행하도록 표시하는 데코레이터 (@process_tool).
+
+    Swarm에 process_backend가 설정된 경우에만 효과가 있고, 없으면 평소처럼 현재 스레드에서 실행된다.
+    워커 프로세스로 보내기 위해 함수는 모듈 최상위에 정의되어야 하며 인자와 반환값은 pickle 가능해야 한다.
+    context_variables는 dict 복사본으로 전달되므로 도구 안에서 수정해도 호출자에게 반영되지 않는다.
+    """
+
+    def mark(f: Callable) -> Callable:
+        setattr(f, _PROCESS_TOOL_ATTR, True)
+        return f
+
+    return mark(func) if func is not None else mark
+
+
+def is_process_tool(func: Callable) -> bool:
+    return getattr(func, _PROCESS_TOOL_ATTR, False)
+
+
+def _pack(obj: Any, threshold: int) -> tuple:
+    """pickle한 값. threshold 바이트 이상이면 공유 메모리 블록에 넣고 (이름, 크기)만 전달."""
+    data = pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+    if threshold is None or len(data) < threshold:
+        return ("inline", data)
+    block = shared_memory.SharedMemory(create=True, size=len(data))
+    block.buf[:len(data)] = data
+    block.close()
+    return ("shm", block.name, len(data))
+
+
+def _unpack(payload: tuple, unlink: bool) -> Any:
+    if payload[0] == "inline":
+        return pickle.loads(payload[1])
+    _, name, size = payload
+    block = shared_memory.SharedMemory(name=name)
+    view = block.buf[:size]
+    try:
+        return pickle.loads(view)
+    finally:
+        view.release()
+        block.close()
+        if unlink:
+            block.unlink()
+
+
+def _release(payload: tuple) -> None:
+    if payload[0] == "shm":
+        try:
+            block = shared_memory.SharedMemory(name=payload[1])
+        except FileNotFoundError:
+            return
+        block.close()
+        block.unlink()
+
+
+def _call_in_worker(func: Callable, payload: tuple, threshold: int) -> tuple:
+    """워커 프로세스에서 실행: 인자를 읽고 func(**args)를 호출한 뒤 결과를 같은 방식으로 돌려준다."""
+    args = _unpack(payload, unlink=False)  # 인자 블록은 호출한 쪽에서 정리
+    return _pack(func(**args), threshold)
+
+
+class ProcessToolBackend:
+    """
+    @process_tool로 표시된 도구를 워커 프로세스에서 실행하는 백엔드. Swarm(process_backend=...)로 사용.
+
+    CPU를 많이 쓰는 도구가 GIL을 잡고 있어서 다른 에이전트 스레드가 멈추는 것을 막는다.
+    인자와 결과는 pickle로 전달하며, shm_threshold 바이트 이상인 값은 파이프 대신 공유 메모리 블록으로
+    넘기고 받는 쪽이 읽은 뒤 바로 해제한다.
+
+    Args:
+        max_workers (int): 워커 프로세스 수. None이면 CPU 수.
+        shm_threshold (int): 공유 메모리로 보낼 최소 크기(바이트). None이면 항상 파이프로 보냄.
+        mp_context (str): multiprocessing 시작 방식. 스레드와 함께 쓰므로 기본값은 "spawn".
+    """
+
+    def __init__(
+        self,
+        max_workers: int = None,
+        shm_threshold: int = 1024 * 1024,
+        mp_context: Union[str, Any] = "spawn",
+    ):
+        self.max_workers = max_workers
+        self.shm_threshold = shm_threshold
+        self.mp_context = mp_context
+        self.calls = 0
+        self.shared_bytes = 0  # 공유 메모리로 보낸 인자 크기 합계
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                context = self.mp_context
+                if isinstance(context, str):
+                    context = multiprocessing.get_context(context)
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=context)
+            return self._executor
+
+    def submit(self, func: Callable, args: dict) -> Future:
+        """func(**args)를 워커 프로세스에서 실행. Future의 결과는 언팩된 반환값."""
+        payload = _pack(args, self.shm_threshold)
+        with self._lock:
+            self.calls += 1
+            if payload[0] == "shm":
+                self.shared_bytes += payload[2]
+        try:
+            inner = self._get_executor().submit(_call_in_worker, func, payload, self.shm_threshold)
+        except BaseException:
+            _release(payload)
+            raise
+
+        outer = Future()
+
+        def done(inner: Future):
+            _release(payload)
+            try:
+                outer.set_result(_unpack(inner.result(), unlink=True))
+            except BaseException as e:
+                outer.set_exception(e)
+
+        inner.add_done_callback(done)
+        return outer
+
+    def call(self, func: Callable, args: dict) -> Any:
+        return self.submit(func, args).result()
+
+    def close(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self) -> "ProcessToolBackend":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
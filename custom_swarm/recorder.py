@@ -0,0 +1,230 @@
+import gzip
+import hashlib
+import json
+import os
+import queue
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+from .state import TERMINAL_STATES, RunRecord
+
+_STOP = object()
+
+
+def _chain(previous: bytes, message: dict) -> bytes:
+    """대화에서 message까지의 위치를 나타내는 연쇄 해시."""
+    encoded = json.dumps(message, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8")
+    return hashlib.blake2b(previous + encoded, digest_size=16).digest()
+
+
+class SessionRecorder:
+    """
+    메시지, tool call, 상태 전이를 append-only JSONL로 기록하는 세션 레코더.
+
+    record()는 큐에 넣기만 하고 바로 반환하며, 직렬화와 쓰기는 백그라운드 스레드가 맡는다.
+    큐가 가득 차면 이벤트를 버리고 dropped를 증가시킨다 (에이전트 루프를 막지 않음).
+
+    한 줄은 {"ts", "type", "task_id", "agent", ...} 형태이며 type은 "message", "tool_call", "state".
+    message 이벤트는 기존 logs/session_*.json 항목처럼 task_id/role/content 키를 가진다.
+
+    run에 입력으로 들어온 히스토리는 inputs()로 기록하며, 이 세션에서 이미 기록한 대화의 앞부분은
+    다시 쓰지 않는다 (REPL/오케스트레이터가 매번 전체 히스토리를 넘겨도 로그가 제곱으로 늘지 않음).
+    대화는 메시지 내용의 연쇄 해시로 식별하므로, 같은 내용이라도 대화의 다른 위치에 있으면 기록된다.
+
+    Args:
+        directory (str): 로그 디렉토리.
+        prefix (str): 파일 이름 접두사. 파일 이름은 {prefix}_{시작 시각}_{순번}.jsonl[.gz].
+        compress (bool): gzip으로 압축 (배치마다 sync flush 하므로 쓰는 중에도 읽을 수 있음).
+        fsync_interval (float): 이 간격(초)마다 fsync. None이면 하지 않고, 0이면 배치마다.
+        max_bytes (int): 파일당 최대 크기(압축 전). 넘으면 새 파일로 교체.
+        max_queue (int): 쓰기 대기 이벤트 수 상한.
+        max_seen (int): 기억할 기록된 대화 위치 수 (넘으면 오래된 것부터 잊고 다시 기록).
+    """
+
+    def __init__(
+        self,
+        directory: str = "logs",
+        prefix: str = "session",
+        compress: bool = False,
+        fsync_interval: Optional[float] = 1.0,
+        max_bytes: int = 64 * 1024 * 1024,
+        max_queue: int = 100_000,
+        max_seen: int = 100_000,
+    ):
+        self.directory = directory
+        self.prefix = prefix
+        self.compress = compress
+        self.fsync_interval = fsync_interval
+        self.max_bytes = max_bytes
+        self.session = time.strftime("%Y%m%d-%H%M%S")
+        self.dropped = 0
+        self.written = 0
+        self.path: Optional[str] = None
+        self._part = 0
+        self._file = None
+        self._bytes = 0
+        self._last_sync = time.monotonic()
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._closed = False
+        self.max_seen = max_seen
+        self._seen: "OrderedDict[bytes, None]" = OrderedDict()  # 기록한 대화 위치의 연쇄 해시
+        self._chains: Dict[str, bytes] = {}  # task_id -> 마지막으로 기록한 위치
+        self._seen_lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._thread = threading.Thread(target=self._writer, name="swarm-recorder", daemon=True)
+        self._thread.start()
+
+    # -- 기록 API (에이전트 루프에서 호출) --
+
+    def record(self, event: dict) -> None:
+        if self._closed:
+            return
+        event.setdefault("ts", time.time())
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            self.dropped += 1
+
+    def message(self, task_id: str, agent: str, message: dict) -> None:
+        if self._closed:
+            return
+        with self._seen_lock:
+            chain = _chain(self._chains.get(task_id, b""), message)
+            self._chains[task_id] = chain
+            self._remember(chain)
+        self.record({"type": "message", "task_id": task_id, "agent": agent, **message})
+
+    def inputs(self, task_id: str, agent: str, messages: List[dict]) -> int:
+        """run의 입력 히스토리 중 이 세션에서 아직 기록하지 않은 메시지만 기록. 기록한 수를 반환."""
+        if self._closed:
+            return 0
+        chain = b""
+        new = []
+        with self._seen_lock:
+            for message in messages:
+                chain = _chain(chain, message)
+                if chain not in self._seen:
+                    self._remember(chain)
+                    new.append(message)
+            self._chains[task_id] = chain
+        for message in new:
+            self.record({"type": "message", "task_id": task_id, "agent": agent, **message})
+        return len(new)
+
+    def _remember(self, chain: bytes) -> None:
+        # self._seen_lock을 잡은 상태에서 호출
+        self._seen[chain] = None
+        self._seen.move_to_end(chain)
+        if len(self._seen) > self.max_seen:
+            self._seen.popitem(last=False)
+
+    def tool_call(self, task_id: str, agent: str, tool: str, duration: float, error: str = None) -> None:
+        self.record({"type": "tool_call", "task_id": task_id, "agent": agent, "tool": tool,
+                     "duration": duration, "error": error})
+
+    def state(self, record: RunRecord) -> None:
+        """RunStateRegistry.subscribe 콜백."""
+        if record.state in TERMINAL_STATES:
+            with self._seen_lock:
+                self._chains.pop(record.run_id, None)
+        self.record({"type": "state", "task_id": record.run_id, "agent": record.agent_name,
+                     "state": record.state.value, "error": record.error, "ts": record.updated_at})
+
+    # -- 백그라운드 쓰기 --
+
+    def _open(self) -> None:
+        self._part += 1
+        suffix = ".jsonl.gz" if self.compress else ".jsonl"
+        self.path = os.path.join(
+            self.directory, f"{self.prefix}_{self.session}_{self._part:04d}{suffix}")
+        self._file = gzip.open(self.path, "ab") if self.compress else open(self.path, "ab")
+        self._bytes = 0
+
+    def _close_file(self) -> None:
+        if self._file is not None:
+            self._file.flush()
+            self._fsync()
+            self._file.close()
+            self._file = None
+
+    def _fsync(self) -> None:
+        raw = self._file.fileobj if self.compress else self._file
+        os.fsync(raw.fileno())
+        self._last_sync = time.monotonic()
+
+    def _writer(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            # 쌓여 있는 이벤트를 한 번에 쓴다
+            while len(batch) < 1024:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = False
+            for event in batch:
+                if event is _STOP:
+                    stop = True
+                    continue
+                self._write(event)
+            if self._file is not None:
+                self._file.flush()
+                if self.fsync_interval is not None and (
+                    time.monotonic() - self._last_sync >= self.fsync_interval
+                ):
+                    self._fsync()
+            if stop:
+                self._close_file()
+                return
+
+    def _write(self, event) -> None:
+        if callable(event):  # flush() 표식
+            event()
+            return
+        line = (json.dumps(event, ensure_ascii=False, default=str) + "\n").encode("utf-8")
+        if self._file is None or (self._bytes and self._bytes + len(line) > self.max_bytes):
+            self._close_file()
+            self._open()
+        self._file.write(line)
+        self._bytes += len(line)
+        self.written += 1
+
+    def flush(self, timeout: float = None) -> bool:
+        """
+        지금까지 record()된 이벤트가 파일에 쓰이고 fsync될 때까지 기다린다.
+        close() 후에는 쓰기 스레드가 남은 이벤트를 쓰고 끝날 때까지만 기다린다.
+        """
+        if self._closed:
+            self._thread.join(timeout)
+            return not self._thread.is_alive()
+        done = threading.Event()
+
+        def marker():
+            if self._file is not None:
+                self._file.flush()
+                self._fsync()
+            done.set()
+
+        self._queue.put(marker)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not done.wait(0.1 if deadline is None else max(0.0, min(0.1, deadline - time.monotonic()))):
+            if not self._thread.is_alive():
+                return done.is_set()  # 표식을 넣기 전에 close()되어 쓰기 스레드가 끝남
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+        return True
+
+    def close(self, timeout: float = None) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def __enter__(self) -> "SessionRecorder":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
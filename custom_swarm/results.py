@@ -0,0 +1,211 @@
+import json
+import os
+import shutil
+import tempfile
+import threading
+import weakref
+from collections import OrderedDict
+from collections.abc import MutableMapping, Sequence
+from typing import Any, Iterator, List, Optional
+
+from .types import Response
+
+RETENTION_MODES = ("final", "last_n", "full")
+
+
+def _payload_size(messages) -> int:
+    return len(json.dumps(list(messages), ensure_ascii=False, default=str))
+
+
+def _remove_file(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+class SpilledMessages(Sequence):
+    """
+    디스크로 내보낸 메시지 리스트. 마지막 메시지는 메모리에 두므로
+    messages[-1]['content']는 파일을 읽지 않는다. 나머지는 접근할 때 파일에서 읽는다.
+
+    파일은 이 객체를 참조하는 곳이 모두 없어지면 삭제된다. 저장소에서 덮어쓴 결과라도
+    워크플로우 롤백처럼 이전 결과를 들고 있는 곳이 있으면 계속 읽을 수 있다.
+    """
+
+    __slots__ = ("path", "_length", "_last", "_cleanup", "__weakref__")
+
+    def __init__(self, path: str, length: int, last: Optional[dict]):
+        self.path = path
+        self._length = length
+        self._last = last
+        self._cleanup = weakref.finalize(self, _remove_file, path)
+
+    def load(self) -> List[dict]:
+        with open(self.path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, index):
+        if isinstance(index, int) and (index == -1 or index == self._length - 1):
+            return self._last
+        return self.load()[index]
+
+    def __iter__(self) -> Iterator[dict]:
+        return iter(self.load())
+
+    def __repr__(self) -> str:
+        return f"SpilledMessages({self.path!r}, {self._length} messages)"
+
+
+class ResultStore(MutableMapping):
+    """
+    CentralOrchestrator의 agent_results로 쓰는 dict 대용 저장소.
+
+    Response를 저장할 때 retention에 따라 메시지를 줄이고, 큰 결과는 디스크로 내보낸 뒤
+    필요할 때 다시 읽는다. 메모리 사용량이 max_bytes를 넘으면 가장 오래 사용하지 않은 결과부터
+    디스크로 내보낸다. 어느 경우에도 result.messages[-1]['content']는 그대로 동작한다.
+    Response가 아닌 값 (예: "feedback")은 그대로 저장한다.
+
+    Args:
+        retention (str): "final" (마지막 메시지만), "last_n" (최근 keep_last개), "full" (전부).
+        keep_last (int): retention="last_n"일 때 유지할 메시지 수.
+        spill_threshold (int): 메시지 크기(JSON 바이트)가 이보다 크면 디스크로 내보냄. None이면 하지 않음.
+        max_bytes (int): 메모리에 둘 메시지의 최대 총 크기. None이면 제한 없음.
+        spill_dir (str): 내보낼 디렉토리. None이면 필요할 때 임시 디렉토리를 만들고 close()에서 삭제.
+    """
+
+    def __init__(
+        self,
+        retention: str = "full",
+        keep_last: int = 4,
+        spill_threshold: Optional[int] = 256 * 1024,
+        max_bytes: Optional[int] = 64 * 1024 * 1024,
+        spill_dir: str = None,
+    ):
+        if retention not in RETENTION_MODES:
+            raise ValueError(f"retention must be one of {RETENTION_MODES}, got {retention!r}")
+        self.retention = retention
+        self.keep_last = keep_last
+        self.spill_threshold = spill_threshold
+        self.max_bytes = max_bytes
+        self.spill_dir = spill_dir
+        self._own_dir = False
+        self._data: "OrderedDict[str, Any]" = OrderedDict()
+        self._sizes = {}  # key -> 메모리에 있는 메시지 크기
+        self._bytes = 0
+        self._spills = 0
+        self._lock = threading.RLock()
+
+    @property
+    def memory_bytes(self) -> int:
+        return self._bytes
+
+    def _retain(self, messages: List) -> List:
+        if self.retention == "final":
+            return list(messages[-1:])
+        if self.retention == "last_n":
+            return list(messages[-self.keep_last:]) if self.keep_last else []
+        return list(messages)
+
+    def _spill_path(self, key: str) -> str:
+        if self.spill_dir is None:
+            self.spill_dir = tempfile.mkdtemp(prefix="swarm-results-")
+            self._own_dir = True
+        os.makedirs(self.spill_dir, exist_ok=True)
+        self._spills += 1
+        safe = "".join(c if c.isalnum() or c in "-_" else "_" for c in key)
+        return os.path.join(self.spill_dir, f"{safe}-{self._spills}.json")
+
+    def _spill(self, key: str, response: Response) -> Response:
+        messages = list(response.messages)
+        path = self._spill_path(key)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(messages, f, ensure_ascii=False, default=str)
+        spilled = SpilledMessages(path, len(messages), messages[-1] if messages else None)
+        return response.model_copy(update={"messages": spilled})
+
+    def _compact(self, key: str, value: Any) -> Any:
+        if not isinstance(value, Response) or isinstance(value.messages, SpilledMessages):
+            return value
+        messages = self._retain(value.messages)
+        compact = value.model_copy(update={"messages": messages})
+        size = _payload_size(messages)
+        if self.spill_threshold is not None and size > self.spill_threshold:
+            return self._spill(key, compact)
+        self._sizes[key] = size
+        self._bytes += size
+        return compact
+
+    def _evict(self) -> None:
+        # 가장 오래 사용하지 않은 결과부터 디스크로
+        for key in list(self._data):
+            if self._bytes <= self.max_bytes:
+                return
+            size = self._sizes.pop(key, None)
+            if size is not None:
+                self._bytes -= size
+                self._data[key] = self._spill(key, self._data[key])
+
+    def _discard(self, key: str) -> Any:
+        # 내보낸 파일은 SpilledMessages가 더 이상 참조되지 않을 때 삭제된다
+        old = self._data.pop(key)
+        self._bytes -= self._sizes.pop(key, 0)
+        return old
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        with self._lock:
+            if key in self._data:
+                if self._data[key] is value:
+                    self._data.move_to_end(key)
+                    return
+                self._discard(key)
+            self._data[key] = self._compact(key, value)
+            if self.max_bytes is not None and self._bytes > self.max_bytes:
+                self._evict()
+
+    def __getitem__(self, key: str) -> Any:
+        with self._lock:
+            value = self._data[key]
+            self._data.move_to_end(key)
+            return value
+
+    def __delitem__(self, key: str) -> None:
+        with self._lock:
+            self._discard(key)
+
+    def load(self, key: str) -> Any:
+        """디스크로 내보낸 메시지를 다시 읽어 일반 리스트로 채운 결과 (model_dump 등 직렬화용)."""
+        value = self[key]
+        if isinstance(value, Response) and isinstance(value.messages, SpilledMessages):
+            return value.model_copy(update={"messages": value.messages.load()})
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._data))
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key) -> bool:
+        return key in self._data
+
+    def close(self) -> None:
+        """내보낸 파일 정리 (임시 디렉토리를 만든 경우 디렉토리째 삭제)."""
+        with self._lock:
+            for key in list(self._data):
+                old = self._discard(key)
+                if isinstance(old, Response) and isinstance(old.messages, SpilledMessages):
+                    old.messages._cleanup()
+            if self._own_dir and self.spill_dir:
+                shutil.rmtree(self.spill_dir, ignore_errors=True)
+                self.spill_dir = None
+                self._own_dir = False
+
+    def __enter__(self) -> "ResultStore":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
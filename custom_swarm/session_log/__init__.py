@@ -0,0 +1,417 @@
+"""
+세션 로그 인덱스/조회.
+
+    python -m custom_swarm.session_log logs --stats
+    python -m custom_swarm.session_log logs --agent search_agent1 --tool search_on_web_1
+"""
+import glob
+import gzip
+import json
+import math
+import mmap
+import os
+import pickle
+import re
+import statistics
+import time
+from array import array
+from collections import OrderedDict, defaultdict
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence
+
+DEFAULT_PATTERNS = ("session_*.json", "session_*.jsonl", "session_*.jsonl.gz")
+
+_FILENAME_TIME = re.compile(r"(\d{8}-\d{6})")
+_DECODER = json.JSONDecoder()
+_WHITESPACE = " \t\r\n"
+
+
+class _Interner:
+    """문자열 <-> 정수 id. None은 -1."""
+
+    def __init__(self):
+        self.values: List[str] = []
+        self.ids: Dict[str, int] = {}
+
+    def id(self, value) -> int:
+        if value is None:
+            return -1
+        value = str(value)
+        found = self.ids.get(value)
+        if found is None:
+            found = self.ids[value] = len(self.values)
+            self.values.append(value)
+        return found
+
+    def get(self, value) -> Optional[int]:
+        return -1 if value is None else self.ids.get(value)
+
+    def value(self, index: int) -> Optional[str]:
+        return None if index < 0 else self.values[index]
+
+
+class LogEntry(NamedTuple):
+    """인덱스의 한 항목 (레코드 본문은 SessionLogIndex.load로 읽음)."""
+
+    position: int
+    path: str
+    offset: int
+    length: int
+    timestamp: float
+    task_id: Optional[str]
+    agent: Optional[str]
+    type: Optional[str]
+    role: Optional[str]
+    tool: Optional[str]
+    duration: Optional[float]
+
+
+class SessionLogIndex:
+    """
+    세션 로그 (logs/session_*.json 배열, SessionRecorder의 JSONL/JSONL.gz, 기타 JSONL)에 대한 압축 인덱스.
+
+    레코드마다 (파일, 바이트 오프셋, 길이, 시각, task_id, agent, type, role, tool, duration)만
+    array로 보관하고 본문은 필요할 때 mmap으로 읽는다. 문자열은 정수 id로 바꿔 저장한다.
+    JSONL 파일은 append-only로 보고 refresh() 시 마지막으로 읽은 위치 이후만 읽는다.
+
+    Args:
+        paths (Sequence[str]): 로그 파일, 디렉토리 (DEFAULT_PATTERNS로 검색), glob 패턴.
+    """
+
+    def __init__(self, paths: Sequence[str] = ("logs",)):
+        self.paths = [paths] if isinstance(paths, str) else list(paths)
+        self.files: List[str] = []
+        self._file_ids: Dict[str, int] = {}
+        self._scanned: Dict[str, int] = {}  # 파일 -> 인덱싱한 바이트 수 (압축 파일은 압축 해제 기준)
+        self._strings = _Interner()
+        self._file = array("i")
+        self._offset = array("q")
+        self._length = array("i")
+        self._timestamp = array("d")
+        self._task = array("i")
+        self._agent = array("i")
+        self._type = array("i")
+        self._role = array("i")
+        self._tool = array("i")
+        self._duration = array("d")
+        self._by_task: Dict[int, array] = defaultdict(lambda: array("i"))
+        self._maps: "OrderedDict[str, object]" = OrderedDict()
+        self.refresh()
+
+    def __len__(self) -> int:
+        return len(self._offset)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_by_task"] = dict(self._by_task)
+        state["_maps"] = OrderedDict()
+        return state
+
+    def __setstate__(self, state):
+        by_task = defaultdict(lambda: array("i"))
+        by_task.update(state["_by_task"])
+        state["_by_task"] = by_task
+        self.__dict__.update(state)
+
+    # -- 인덱싱 --
+
+    def _discover(self) -> List[str]:
+        found = []
+        for path in self.paths:
+            if os.path.isdir(path):
+                for pattern in DEFAULT_PATTERNS:
+                    found.extend(glob.glob(os.path.join(path, pattern)))
+            elif os.path.exists(path):
+                found.append(path)
+            else:
+                found.extend(glob.glob(path))
+        return sorted(set(found))
+
+    def refresh(self) -> int:
+        """새 파일과 JSONL 파일에 추가된 부분을 인덱싱. 추가된 항목 수를 반환."""
+        before = len(self)
+        for path in self._discover():
+            if path.endswith(".json"):
+                if path not in self._scanned:
+                    self._index_json_array(path)
+            elif path.endswith(".gz"):
+                self._index_gzip(path)
+            else:
+                self._index_jsonl(path)
+        return len(self) - before
+
+    def _file_id(self, path: str) -> int:
+        found = self._file_ids.get(path)
+        if found is None:
+            found = self._file_ids[path] = len(self.files)
+            self.files.append(path)
+        return found
+
+    def _add(self, file_id: int, offset: int, length: int, record: dict, default_ts: float) -> None:
+        strings = self._strings
+        position = len(self._offset)
+        self._file.append(file_id)
+        self._offset.append(offset)
+        self._length.append(length)
+        ts = record.get("ts", record.get("timestamp"))
+        self._timestamp.append(ts if isinstance(ts, (int, float)) else default_ts)
+        task = strings.id(record.get("task_id"))
+        self._task.append(task)
+        self._agent.append(strings.id(record.get("agent") or record.get("sender")))
+        self._type.append(strings.id(record.get("type", "message")))
+        self._role.append(strings.id(record.get("role")))
+        self._tool.append(strings.id(record.get("tool") or record.get("tool_name")))
+        duration = record.get("duration")
+        self._duration.append(duration if isinstance(duration, (int, float)) else math.nan)
+        if task >= 0:
+            self._by_task[task].append(position)
+
+    def _index_lines(self, path: str, data, start: int) -> int:
+        """data[start:]의 완결된 줄들을 인덱싱하고, 다음에 읽을 위치를 반환."""
+        file_id = self._file_id(path)
+        default_ts = _file_timestamp(path)
+        pos = start
+        end = len(data)
+        while pos < end:
+            newline = data.find(b"\n", pos)
+            if newline < 0:
+                break  # 아직 쓰는 중인 마지막 줄
+            line = data[pos:newline]
+            if line.strip():
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    record = None
+                if isinstance(record, dict):
+                    self._add(file_id, pos, newline - pos, record, default_ts)
+            pos = newline + 1
+        return pos
+
+    def _index_jsonl(self, path: str) -> None:
+        start = self._scanned.get(path, 0)
+        size = os.path.getsize(path)
+        if size <= start:
+            return
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            self._scanned[path] = self._index_lines(path, data, start)
+
+    def _index_gzip(self, path: str) -> None:
+        start = self._scanned.get(path, 0)
+        try:
+            with gzip.open(path, "rb") as f:
+                data = f.read()
+        except EOFError:
+            return  # 쓰는 중이라 끝이 없는 경우: 다음 refresh에서 다시 시도
+        if len(data) > start:
+            self._scanned[path] = self._index_lines(path, data, start)
+
+    def _index_json_array(self, path: str) -> None:
+        with open(path, "rb") as f:
+            raw = f.read()
+        text = raw.decode("utf-8")
+        file_id = self._file_id(path)
+        default_ts = _file_timestamp(path)
+        pos = _skip(text, 0)
+        if text[pos:pos + 1] != "[":
+            self._scanned[path] = len(raw)
+            return
+        pos = _skip(text, pos + 1)
+        byte_pos, char_pos = 0, 0
+        while pos < len(text) and text[pos] != "]":
+            record, end = _DECODER.raw_decode(text, pos)
+            # 문자 위치 -> 바이트 위치 (ASCII가 아닌 내용이 있어도 mmap으로 바로 읽을 수 있게)
+            byte_pos += len(text[char_pos:pos].encode("utf-8"))
+            length = len(text[pos:end].encode("utf-8"))
+            char_pos = pos
+            if isinstance(record, dict):
+                self._add(file_id, byte_pos, length, record, default_ts)
+            pos = _skip(text, end)
+            if text[pos:pos + 1] == ",":
+                pos = _skip(text, pos + 1)
+        self._scanned[path] = len(raw)
+
+    # -- 조회 --
+
+    def entry(self, position: int) -> LogEntry:
+        s = self._strings.value
+        duration = self._duration[position]
+        return LogEntry(
+            position,
+            self.files[self._file[position]],
+            self._offset[position],
+            self._length[position],
+            self._timestamp[position],
+            s(self._task[position]),
+            s(self._agent[position]),
+            s(self._type[position]),
+            s(self._role[position]),
+            s(self._tool[position]),
+            None if math.isnan(duration) else duration,
+        )
+
+    def _data(self, path: str):
+        data = self._maps.get(path)
+        if data is None:
+            if path.endswith(".gz"):
+                with gzip.open(path, "rb") as f:
+                    data = f.read()
+            else:
+                with open(path, "rb") as f:
+                    data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._maps[path] = data
+            while len(self._maps) > 16:
+                _, old = self._maps.popitem(last=False)
+                if isinstance(old, mmap.mmap):
+                    old.close()
+        else:
+            self._maps.move_to_end(path)
+        return data
+
+    def load(self, position: int) -> dict:
+        """position 위치의 레코드 본문을 읽는다."""
+        path = self.files[self._file[position]]
+        offset = self._offset[position]
+        data = self._data(path)
+        end = offset + self._length[position]
+        if end > len(data):  # 인덱싱 후 파일이 교체된 경우
+            self._maps.pop(path, None)
+            data = self._data(path)
+        return json.loads(data[offset:end])
+
+    def positions(
+        self,
+        task_id: str = None,
+        agent: str = None,
+        tool: str = None,
+        type: str = None,
+        role: str = None,
+        since: float = None,
+        until: float = None,
+    ) -> Iterator[int]:
+        """조건에 맞는 항목 위치를 기록 순서대로 반환 (since <= timestamp < until)."""
+        strings = self._strings
+        wanted = {}
+        for name, value in (("task", task_id), ("agent", agent), ("tool", tool),
+                            ("type", type), ("role", role)):
+            if value is not None:
+                index = strings.get(value)
+                if index is None:
+                    return iter(())  # 한 번도 나오지 않은 값
+                wanted[name] = index
+
+        if "task" in wanted:
+            candidates: Iterable[int] = self._by_task.get(wanted.pop("task"), ())
+        else:
+            candidates = range(len(self))
+        columns = [(getattr(self, f"_{name}"), index) for name, index in wanted.items()]
+        timestamps = self._timestamp
+
+        def matches(position: int) -> bool:
+            for column, index in columns:
+                if column[position] != index:
+                    return False
+            ts = timestamps[position]
+            return (since is None or ts >= since) and (until is None or ts < until)
+
+        return (position for position in candidates if matches(position))
+
+    def query(self, **filters) -> Iterator[dict]:
+        """조건에 맞는 레코드 본문을 지연 로딩으로 순회. 인자는 positions()와 같다."""
+        for position in self.positions(**filters):
+            yield self.load(position)
+
+    def entries(self, **filters) -> Iterator[LogEntry]:
+        for position in self.positions(**filters):
+            yield self.entry(position)
+
+    def tasks(self) -> List[str]:
+        return [self._strings.value(task) for task in self._by_task]
+
+    def stats(self) -> dict:
+        """
+        집계 통계: 항목/태스크 수, 태스크당 턴 수 (assistant 메시지 수), 에이전트별 항목 수,
+        tool별 호출 수와 지연 시간 (SessionRecorder의 tool_call 이벤트 기준).
+        """
+        assistant = self._strings.get("assistant")
+        turns = []
+        for positions in self._by_task.values():
+            turns.append(sum(1 for p in positions if self._role[p] == assistant))
+
+        by_agent = defaultdict(int)
+        for agent in self._agent:
+            if agent >= 0:
+                by_agent[self._strings.value(agent)] += 1
+
+        tool_call = self._strings.get("tool_call")
+        latencies = defaultdict(list)
+        for position in range(len(self)):
+            if self._type[position] == tool_call and self._tool[position] >= 0:
+                duration = self._duration[position]
+                if not math.isnan(duration):
+                    latencies[self._strings.value(self._tool[position])].append(duration)
+
+        return {
+            "entries": len(self),
+            "files": len(self.files),
+            "tasks": len(self._by_task),
+            "turns_per_task": _summary(turns),
+            "entries_by_agent": dict(by_agent),
+            "tool_latency": {tool: _summary(values) for tool, values in latencies.items()},
+        }
+
+    # -- 저장 --
+
+    def save(self, path: str) -> None:
+        """인덱스를 파일로 저장 (다음 실행에서 load 후 refresh()로 새 부분만 인덱싱)."""
+        with open(path, "wb") as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def open(cls, path: str, paths: Sequence[str] = None) -> "SessionLogIndex":
+        """
+        저장된 인덱스를 읽고 refresh().
+
+        Args:
+            path (str): save()로 저장한 파일.
+            paths (Sequence[str]): 인덱싱할 로그 경로. 저장된 인덱스의 경로와 다르면 새로 인덱싱한다.
+        """
+        with open(path, "rb") as f:
+            index = pickle.load(f)
+        if paths is not None:
+            paths = [paths] if isinstance(paths, str) else list(paths)
+            if paths != index.paths:
+                return cls(paths)
+        index.refresh()
+        return index
+
+    def close(self) -> None:
+        for data in self._maps.values():
+            if isinstance(data, mmap.mmap):
+                data.close()
+        self._maps.clear()
+
+
+def _skip(text: str, pos: int) -> int:
+    while pos < len(text) and text[pos] in _WHITESPACE:
+        pos += 1
+    return pos
+
+
+def _file_timestamp(path: str) -> float:
+    """파일 이름의 시각 (session_YYYYmmdd-HHMMSS), 없으면 수정 시각."""
+    match = _FILENAME_TIME.search(os.path.basename(path))
+    if match:
+        return time.mktime(time.strptime(match.group(1), "%Y%m%d-%H%M%S"))
+    return os.path.getmtime(path)
+
+
+def _summary(values: List[float]) -> dict:
+    if not values:
+        return {"count": 0}
+    ordered = sorted(values)
+    return {
+        "count": len(ordered),
+        "mean": statistics.fmean(ordered),
+        "p50": ordered[len(ordered) // 2],
+        "p95": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+        "max": ordered[-1],
+    }
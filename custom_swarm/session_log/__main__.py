@@ -0,0 +1,58 @@
+"""
+세션 로그 조회 CLI.
+
+    python -m custom_swarm.session_log logs --stats
+    python -m custom_swarm.session_log logs --agent search_agent1 --tool search_on_web_1
+    python -m custom_swarm.session_log logs --index logs/index.pkl --task <task_id>
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+from . import SessionLogIndex
+
+
+def _parse_time(value: str) -> float:
+    try:
+        return float(value)
+    except ValueError:
+        return time.mktime(time.strptime(value, "%Y-%m-%dT%H:%M:%S"))
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("paths", nargs="*",
+                        help="로그 파일/디렉토리/glob (기본값: logs, --index가 있으면 저장된 경로)")
+    parser.add_argument("--task")
+    parser.add_argument("--agent")
+    parser.add_argument("--tool")
+    parser.add_argument("--type")
+    parser.add_argument("--role")
+    parser.add_argument("--since", type=_parse_time, help="epoch 초 또는 YYYY-mm-ddTHH:MM:SS")
+    parser.add_argument("--until", type=_parse_time)
+    parser.add_argument("--stats", action="store_true", help="레코드 대신 집계 통계 출력")
+    parser.add_argument("--index", help="인덱스 캐시 파일 (있으면 읽고, 갱신 후 저장)")
+    args = parser.parse_args(argv)
+
+    paths = args.paths or None
+    if args.index and os.path.exists(args.index):
+        # 다른 경로를 주면 저장된 인덱스 대신 새로 인덱싱
+        index = SessionLogIndex.open(args.index, paths)
+    else:
+        index = SessionLogIndex(paths or ["logs"])
+    if args.index:
+        index.save(args.index)
+
+    if args.stats:
+        print(json.dumps(index.stats(), ensure_ascii=False, indent=2))
+        return 0
+    for record in index.query(task_id=args.task, agent=args.agent, tool=args.tool,
+                              type=args.type, role=args.role, since=args.since, until=args.until):
+        print(json.dumps(record, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
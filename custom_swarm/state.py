@@ -0,0 +1,219 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from enum import Enum
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+
+class RunState(str, Enum):
+    IDLE = "Idle"
+    RUNNING = "Running"
+    COMPLETED = "Completed"
+    FAILED = "Failed"
+    CANCELLED = "Cancelled"
+
+
+TERMINAL_STATES = frozenset({RunState.COMPLETED, RunState.FAILED, RunState.CANCELLED})
+
+# 허용되는 상태 전이 (종료 상태에서는 더 이상 전이할 수 없음)
+_TRANSITIONS = {
+    RunState.IDLE: frozenset({RunState.RUNNING, RunState.FAILED, RunState.CANCELLED}),
+    RunState.RUNNING: TERMINAL_STATES,
+}
+
+
+class InvalidStateTransition(ValueError):
+    pass
+
+
+class RunRecord(NamedTuple):
+    """
+    run 하나의 상태 스냅샷. 전이마다 새 레코드로 교체되므로 읽는 쪽에서 잠금이 필요 없다.
+
+    Attributes:
+        run_id (str): run id.
+        agent_name (str): 시작 에이전트 이름.
+        state (RunState): 현재 상태.
+        version (int): 레지스트리 전체에서 단조 증가하는 변경 번호.
+        created_at (float): 등록 시각 (epoch 초).
+        updated_at (float): 마지막 전이 시각.
+        started_at (float): Running이 된 시각.
+        finished_at (float): 종료 상태가 된 시각.
+        error (str): Failed/Cancelled 사유.
+    """
+
+    run_id: str
+    agent_name: str
+    state: RunState
+    version: int
+    created_at: float
+    updated_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    error: Optional[str] = None
+
+    @property
+    def done(self) -> bool:
+        return self.state in TERMINAL_STATES
+
+    @property
+    def duration(self) -> Optional[float]:
+        if self.started_at is None:
+            return None
+        return (self.finished_at or time.time()) - self.started_at
+
+
+class RunStateRegistry:
+    """
+    run id별 상태를 관리하는 스레드 안전한 레지스트리.
+
+    같은 에이전트를 동시에 여러 번 실행해도 run id가 다르므로 서로 덮어쓰지 않는다.
+    변경 사항은 subscribe()로 콜백을 받거나 poll()로 버전 이후의 변경을 가져올 수 있다.
+
+    Args:
+        max_finished (int): 보관할 종료된 run 수. 넘으면 가장 먼저 끝난 run부터 제거.
+        max_changes (int): poll()용으로 보관할 최근 변경 수.
+    """
+
+    def __init__(self, max_finished: int = 10000, max_changes: int = 10000):
+        self.max_finished = max_finished
+        self._runs: Dict[str, RunRecord] = {}
+        self._finished: "OrderedDict[str, None]" = OrderedDict()
+        self._changes: deque = deque(maxlen=max_changes)
+        self._version = 0
+        self._subscribers: List[Callable[[RunRecord], None]] = []
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def create(self, agent_name: str, run_id: str = None) -> RunRecord:
+        """Idle 상태의 run을 등록."""
+        now = time.time()
+        with self._lock:
+            run_id = run_id or uuid.uuid4().hex
+            if run_id in self._runs:
+                raise ValueError(f"Run {run_id!r} already exists.")
+            self._version += 1
+            record = RunRecord(run_id, agent_name, RunState.IDLE, self._version, now, now)
+            self._commit(record)
+        self._notify(record)
+        return record
+
+    def transition(self, run_id: str, state: RunState, error: str = None) -> RunRecord:
+        """
+        run의 상태를 원자적으로 변경.
+
+        Raises:
+            KeyError: 등록되지 않은 run id.
+            InvalidStateTransition: 허용되지 않는 전이 (예: Completed -> Running).
+        """
+        state = RunState(state)
+        now = time.time()
+        with self._lock:
+            current = self._runs[run_id]
+            if state not in _TRANSITIONS.get(current.state, ()):
+                raise InvalidStateTransition(
+                    f"Run {run_id!r} cannot go from {current.state.value} to {state.value}."
+                )
+            self._version += 1
+            record = current._replace(
+                state=state,
+                version=self._version,
+                updated_at=now,
+                started_at=now if state is RunState.RUNNING else current.started_at,
+                finished_at=now if state in TERMINAL_STATES else None,
+                error=error,
+            )
+            self._commit(record)
+        self._notify(record)
+        return record
+
+    def _commit(self, record: RunRecord) -> None:
+        # self._lock을 잡은 상태에서 호출
+        self._runs[record.run_id] = record
+        self._changes.append(record)
+        if record.done:
+            self._finished[record.run_id] = None
+            while len(self._finished) > self.max_finished:
+                old_id, _ = self._finished.popitem(last=False)
+                del self._runs[old_id]
+        self._changed.notify_all()
+
+    def _notify(self, record: RunRecord) -> None:
+        # 콜백은 잠금 밖에서 호출 (콜백이 레지스트리를 읽어도 교착되지 않음)
+        for callback in list(self._subscribers):
+            try:
+                callback(record)
+            except Exception as e:
+                print(f"[Swarm] State subscriber failed: {e}")
+
+    def get(self, run_id: str) -> Optional[RunRecord]:
+        return self._runs.get(run_id)
+
+    def runs(self, agent_name: str = None, state: RunState = None) -> List[RunRecord]:
+        """현재 보관 중인 run 스냅샷 (생성 순)."""
+        with self._lock:
+            records = list(self._runs.values())
+        return [
+            record
+            for record in records
+            if (agent_name is None or record.agent_name == agent_name)
+            and (state is None or record.state == state)
+        ]
+
+    def counts(self) -> Dict[RunState, int]:
+        """상태별 run 수."""
+        counts = {state: 0 for state in RunState}
+        for record in self.runs():
+            counts[record.state] += 1
+        return counts
+
+    def latest_by_agent(self) -> Dict[str, RunState]:
+        """에이전트 이름 -> 가장 최근에 등록된 run의 상태."""
+        return {record.agent_name: record.state for record in self.runs()}
+
+    def subscribe(self, callback: Callable[[RunRecord], None]) -> Callable[[], None]:
+        """
+        상태가 바뀔 때마다 callback(record)을 호출. 전이를 일으킨 스레드에서 호출된다.
+
+        Returns:
+            Callable: 구독 해제 함수.
+        """
+        with self._lock:
+            self._subscribers = self._subscribers + [callback]
+
+        def unsubscribe():
+            with self._lock:
+                self._subscribers = [s for s in self._subscribers if s is not callback]
+
+        return unsubscribe
+
+    def poll(self, since: int = 0, timeout: float = None) -> Tuple[int, List[RunRecord]]:
+        """
+        since 버전 이후의 변경을 반환. 변경이 없으면 timeout(초)까지 기다린다.
+
+        보관된 변경 기록보다 오래된 버전을 요청하면 변경 기록 대신 모든 run의 현재 상태를 돌려준다.
+
+        Returns:
+            Tuple[int, List[RunRecord]]: (다음 호출에 넘길 버전, 변경된 레코드).
+        """
+        with self._changed:
+            if self._version <= since and timeout != 0:
+                self._changed.wait_for(lambda: self._version > since, timeout)
+            version = self._version
+            if version <= since:
+                return version, []
+            if self._changes and self._changes[0].version <= since + 1:
+                return version, [r for r in self._changes if r.version > since]
+            return version, sorted(self._runs.values(), key=lambda r: r.version)
+
+    def wait(self, run_id: str, timeout: float = None) -> Optional[RunRecord]:
+        """run이 종료 상태가 될 때까지 기다린다. 시간 초과 시 현재 레코드를 반환."""
+        with self._changed:
+            self._changed.wait_for(
+                lambda: run_id not in self._runs or self._runs[run_id].done, timeout)
+            return self._runs.get(run_id)
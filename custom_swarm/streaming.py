@@ -0,0 +1,133 @@
+from typing import Dict, List, Optional
+
+
+class _ToolCallBuffer:
+    __slots__ = ("id", "type", "name", "arguments")
+
+    def __init__(self):
+        self.id: List[str] = []
+        self.type: List[str] = []
+        self.name: List[str] = []
+        self.arguments: List[str] = []
+
+    def to_dict(self) -> dict:
+        return {
+            "function": {
+                "arguments": "".join(self.arguments),
+                "name": "".join(self.name),
+            },
+            "id": "".join(self.id),
+            "type": "".join(self.type),
+        }
+
+
+class StreamAssembler:
+    """
+    스트리밍 delta를 하나의 assistant 메시지로 조립.
+
+    delta 속성을 직접 읽고 content/tool call 인자를 리스트 버퍼에 모아 메시지 종료 시 한 번만 join한다.
+    여러 tool call index가 섞여 들어오는 경우도 index별로 따로 조립한다.
+    stream_options={"include_usage": True}로 받은 토큰 사용량은 usage에 남는다.
+    """
+
+    __slots__ = ("sender", "usage", "_content", "_function_call", "_tool_calls")
+
+    def __init__(self, sender: str):
+        self.sender = sender
+        self.usage = None
+        self._content: List[str] = []
+        self._function_call: Optional[_ToolCallBuffer] = None
+        self._tool_calls: Dict[int, _ToolCallBuffer] = {}
+
+    def add_usage(self, chunk) -> bool:
+        """청크의 usage를 기록. choices가 없는 (usage만 담긴) 청크이면 True."""
+        usage = getattr(chunk, "usage", None)
+        if usage is not None:
+            self.usage = usage
+        return not chunk.choices
+
+    def add(self, delta) -> dict:
+        """
+        delta를 버퍼에 반영하고, 호출자에게 yield할 dict 형태의 delta를 반환.
+
+        Args:
+            delta: ChoiceDelta (OpenAI 스트리밍 청크의 choices[0].delta).
+
+        Returns:
+            dict: content/role/function_call/tool_calls 키를 가진 delta. role이 assistant이면 sender 포함.
+        """
+        content = delta.content
+        if content:
+            self._content.append(content)
+
+        function_call = delta.function_call
+        function_call_event = None
+        if function_call is not None:
+            if self._function_call is None:
+                self._function_call = _ToolCallBuffer()
+            if function_call.name:
+                self._function_call.name.append(function_call.name)
+            if function_call.arguments:
+                self._function_call.arguments.append(function_call.arguments)
+            function_call_event = {
+                "arguments": function_call.arguments,
+                "name": function_call.name,
+            }
+
+        tool_calls = delta.tool_calls
+        tool_call_events = None
+        if tool_calls:
+            tool_call_events = []
+            for tool_call in tool_calls:
+                buffer = self._tool_calls.get(tool_call.index)
+                if buffer is None:
+                    buffer = self._tool_calls[tool_call.index] = _ToolCallBuffer()
+                if tool_call.id:
+                    buffer.id.append(tool_call.id)
+                if tool_call.type:
+                    buffer.type.append(tool_call.type)
+                function = tool_call.function
+                if function is not None:
+                    if function.name:
+                        buffer.name.append(function.name)
+                    if function.arguments:
+                        buffer.arguments.append(function.arguments)
+                tool_call_events.append(
+                    {
+                        "index": tool_call.index,
+                        "id": tool_call.id,
+                        "function": {
+                            "arguments": function.arguments,
+                            "name": function.name,
+                        }
+                        if function is not None
+                        else None,
+                        "type": tool_call.type,
+                    }
+                )
+
+        event = {
+            "content": content,
+            "function_call": function_call_event,
+            "role": delta.role,
+            "tool_calls": tool_call_events,
+        }
+        if delta.role == "assistant":
+            event["sender"] = self.sender
+        return event
+
+    def message(self) -> dict:
+        """조립이 끝난 assistant 메시지를 반환. tool call이 없으면 tool_calls는 None."""
+        tool_calls = [
+            self._tool_calls[index].to_dict() for index in sorted(self._tool_calls)
+        ]
+        function_call = None
+        if self._function_call is not None:
+            function_call = self._function_call.to_dict()["function"]
+        return {
+            "content": "".join(self._content),
+            "sender": self.sender,
+            "role": "assistant",
+            "function_call": function_call,
+            "tool_calls": tool_calls or None,
+        }
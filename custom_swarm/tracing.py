@@ -0,0 +1,207 @@
+import contextvars
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+
+_current_span: contextvars.ContextVar = contextvars.ContextVar("swarm_current_span", default=None)
+
+
+class Span:
+    """
+    하나의 작업 구간 (run, LLM 호출, tool 호출, 핸드오프).
+
+    Attributes:
+        name (str): span 이름 (예: "swarm.run", "llm.call", "tool.call", "swarm.handoff").
+        trace_id (str): 같은 최상위 run에 속한 span들이 공유하는 id.
+        span_id (str): span id.
+        parent_id (str): 부모 span id.
+        start_time (float): 시작 시각 (epoch 초).
+        duration (float): 소요 시간(초). 끝나기 전에는 None.
+        attributes (dict): 에이전트 이름, 토큰 사용량, time_to_first_token 등.
+        error (str): 실패한 경우 에러 메시지.
+    """
+
+    __slots__ = (
+        "name", "trace_id", "span_id", "parent_id", "start_time", "duration",
+        "attributes", "error", "_start",
+    )
+
+    def __init__(self, name: str, parent: "Span" = None, attributes: Dict[str, Any] = None):
+        self.name = name
+        self.span_id = uuid.uuid4().hex[:16]
+        self.trace_id = parent.trace_id if parent is not None else uuid.uuid4().hex
+        self.parent_id = parent.span_id if parent is not None else None
+        self.start_time = time.time()
+        self._start = time.perf_counter()
+        self.duration: Optional[float] = None
+        self.attributes: Dict[str, Any] = attributes or {}
+        self.error: Optional[str] = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self._start
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_time": self.start_time,
+            "duration": self.duration,
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+    def __repr__(self) -> str:
+        return f"Span({self.name!r}, duration={self.duration}, attributes={self.attributes})"
+
+
+class SpanExporter:
+    """끝난 span을 받아 내보내는 인터페이스."""
+
+    def export(self, span: Span) -> None:
+        raise NotImplementedError
+
+    def shutdown(self) -> None:
+        pass
+
+
+class InMemoryExporter(SpanExporter):
+    """span을 메모리에 모은다 (테스트, 대시보드용)."""
+
+    def __init__(self):
+        self.spans: List[Span] = []
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        with self._lock:
+            self.spans.append(span)
+
+    def find(self, name: str) -> List[Span]:
+        with self._lock:
+            return [span for span in self.spans if span.name == name]
+
+
+class JSONLExporter(SpanExporter):
+    """span을 한 줄에 하나씩 JSON으로 파일에 추가한다."""
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(path, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        line = json.dumps(span.to_dict(), ensure_ascii=False, default=str)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+class OpenTelemetryExporter(SpanExporter):
+    """
+    span을 OpenTelemetry span으로 다시 기록한다 (opentelemetry-api 필요).
+
+    Args:
+        tracer: opentelemetry Tracer. 없으면 trace.get_tracer("custom_swarm").
+    """
+
+    def __init__(self, tracer=None):
+        from opentelemetry import trace
+
+        self._trace = trace
+        self.tracer = tracer or trace.get_tracer("custom_swarm")
+
+    def export(self, span: Span) -> None:
+        start_ns = int(span.start_time * 1e9)
+        otel_span = self.tracer.start_span(
+            span.name,
+            start_time=start_ns,
+            attributes={
+                f"swarm.{key}": value if isinstance(value, (str, bool, int, float)) else str(value)
+                for key, value in span.attributes.items()
+            },
+        )
+        otel_span.set_attribute("swarm.span_id", span.span_id)
+        otel_span.set_attribute("swarm.trace_id", span.trace_id)
+        if span.parent_id:
+            otel_span.set_attribute("swarm.parent_id", span.parent_id)
+        if span.error:
+            otel_span.set_status(self._trace.Status(self._trace.StatusCode.ERROR, span.error))
+        otel_span.end(end_time=start_ns + int((span.duration or 0.0) * 1e9))
+
+
+class Tracer:
+    """
+    span을 만들고 exporter로 내보낸다. 부모 span은 contextvars로 전파된다.
+
+    Args:
+        exporters (List[SpanExporter]): span을 받을 exporter 목록.
+    """
+
+    def __init__(self, exporters: List[SpanExporter] = None):
+        self.exporters = exporters if exporters is not None else [InMemoryExporter()]
+
+    def start_span(self, name: str, parent: Span = None, **attributes) -> Span:
+        """현재 컨텍스트를 바꾸지 않고 span을 시작 (제너레이터처럼 yield를 걸치는 구간용)."""
+        return Span(name, parent if parent is not None else _current_span.get(), attributes)
+
+    def end_span(self, span: Span, error: BaseException = None) -> None:
+        span.duration = span.elapsed()
+        if error is not None:
+            span.error = f"{type(error).__name__}: {error}"
+        for exporter in self.exporters:
+            exporter.export(span)
+
+    @contextmanager
+    def use_span(self, span: Span):
+        """span을 현재 컨텍스트의 부모 span으로 설정."""
+        token = _current_span.set(span)
+        try:
+            yield span
+        finally:
+            _current_span.reset(token)
+
+    @contextmanager
+    def span(self, name: str, **attributes):
+        """span을 시작하고 현재 span으로 설정한 뒤, 블록이 끝나면 종료/내보내기."""
+        span = self.start_span(name, **attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            _current_span.reset(token)
+            self.end_span(span, error=e)
+            raise
+        _current_span.reset(token)
+        self.end_span(span)
+
+    def event(self, name: str, parent: Span = None, **attributes) -> None:
+        """길이가 0인 span (예: 핸드오프)."""
+        self.end_span(self.start_span(name, parent=parent, **attributes))
+
+    def shutdown(self) -> None:
+        for exporter in self.exporters:
+            exporter.shutdown()
+
+
+def record_usage(span: Span, completion) -> None:
+    """completion.usage의 토큰 수를 span에 기록."""
+    usage = getattr(completion, "usage", None)
+    if usage is not None:
+        span.set_attribute("prompt_tokens", usage.prompt_tokens)
+        span.set_attribute("completion_tokens", usage.completion_tokens)
+        span.set_attribute("total_tokens", usage.total_tokens)
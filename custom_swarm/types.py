@@ -3,7 +3,7 @@ from openai.types.chat.chat_completion_message_tool_call import (
     ChatCompletionMessageToolCall,
     Function,
 )
-from typing import List, Callable, Union, Optional
+from typing import Dict, List, Callable, Union, Optional
 
 # Third-party imports
 from pydantic import BaseModel
@@ -18,12 +18,24 @@ class Agent(BaseModel):
     functions: List[AgentFunction] = []
     tool_choice: str = None
     parallel_tool_calls: bool = True
+    # 한 응답의 여러 tool call을 스레드 풀에서 동시에 실행할지 여부
+    concurrent_tool_calls: bool = False
+    # 함수 이름 -> 최대 동시 실행 수
+    tool_concurrency: Dict[str, int] = {}
+    # 요청당 최대 토큰 수 (Swarm에 context_manager가 설정된 경우 적용)
+    token_budget: Optional[int] = None
+    # Swarm에 dispatcher가 설정된 경우 LLM 요청 대기열 우선순위 (클수록 먼저)
+    priority: int = 0
 
         
 class Response(BaseModel):
     messages: List = []
     agent: Optional[Agent] = None
     context_variables: dict = {}
+    # 실행이 실패했을 때의 에러 메시지 (run_parallel_agents)
+    error: Optional[str] = None
+    # RunLimits에 걸려 실행이 중단된 경우 그 사유 (부분 결과)
+    stop_reason: Optional[str] = None
 
 
 class Result(BaseModel):
@@ -1,5 +1,11 @@
 import inspect
 from datetime import datetime
+from functools import lru_cache
+from typing import Any, Callable, Dict, FrozenSet, List, NamedTuple, Sequence
+
+from pydantic import BaseModel
+
+__CTX_VARS_NAME__ = "context_variables"
 
 
 def debug_print(debug: bool, *args: str) -> None:
@@ -10,6 +16,41 @@ def debug_print(debug: bool, *args: str) -> None:
     print(f"\033[97m[\033[90m{timestamp}\033[97m]\033[90m {message}\033[0m")
 
 
+_PLAIN_TYPES = frozenset((str, int, float, bool, type(None)))
+
+
+def model_to_dict(value: Any) -> Any:
+    """
+    pydantic 모델(OpenAI 타입 포함)을 JSON 호환 dict로 변환.
+
+    model_dump_json() 후 json.loads() 하는 것과 같은 결과를 문자열 직렬화 없이 만든다.
+    """
+    if type(value) in _PLAIN_TYPES:
+        return value
+    if isinstance(value, BaseModel):
+        data = {
+            key: item if type(item) in _PLAIN_TYPES else model_to_dict(item)
+            for key, item in value.__dict__.items()
+        }
+        extra = value.__pydantic_extra__
+        if extra:
+            for key, item in extra.items():
+                data[key] = model_to_dict(item)
+        return data
+    if isinstance(value, (list, tuple)):
+        return [model_to_dict(item) for item in value]
+    if isinstance(value, dict):
+        return {key: model_to_dict(item) for key, item in value.items()}
+    return value
+
+
+def message_to_dict(message, sender: str) -> dict:
+    """ChatCompletionMessage를 히스토리에 저장할 dict로 변환하고 sender를 기록."""
+    data = model_to_dict(message)
+    data["sender"] = sender
+    return data
+
+
 def merge_fields(target, source):
     for key, value in source.items():
         if isinstance(value, str):
@@ -85,3 +126,64 @@ def function_to_json(func) -> dict:
             },
         },
     }
+
+
+class CompiledTools(NamedTuple):
+    """
+    에이전트 함수 목록을 한 번만 컴파일한 결과.
+
+    Attributes:
+        schemas (List[dict]): 모델에 전달할 tool 스키마 (context_variables 제거됨). 공유 객체이므로 수정하지 않는다.
+        function_map (Dict[str, Callable]): 함수 이름 -> 함수.
+        context_injected (FrozenSet[str]): context_variables를 인자로 받는 함수 이름 집합.
+    """
+
+    schemas: List[dict]
+    function_map: Dict[str, Callable]
+    context_injected: FrozenSet[str]
+
+
+def _compile_tools(functions: Sequence[Callable]) -> CompiledTools:
+    schemas = []
+    context_injected = set()
+    for func in functions:
+        tool = function_to_json(func)
+        # hide context_variables from model
+        params = tool["function"]["parameters"]
+        params["properties"].pop(__CTX_VARS_NAME__, None)
+        if __CTX_VARS_NAME__ in params["required"]:
+            params["required"].remove(__CTX_VARS_NAME__)
+        schemas.append(tool)
+
+        code = getattr(func, "__code__", None)
+        if code is not None and __CTX_VARS_NAME__ in code.co_varnames:
+            context_injected.add(func.__name__)
+
+    return CompiledTools(
+        schemas=schemas,
+        function_map={f.__name__: f for f in functions},
+        context_injected=frozenset(context_injected),
+    )
+
+
+_compile_tools_cached = lru_cache(maxsize=512)(_compile_tools)
+
+
+def compile_tools(functions: Sequence[Callable]) -> CompiledTools:
+    """
+    Agent.functions를 tool 스키마로 컴파일하고 결과를 캐시한다.
+
+    캐시 키는 함수 객체들의 튜플이므로 Agent.functions가 바뀌면 자동으로 새로 컴파일된다.
+
+    Args:
+        functions: 에이전트 함수 목록.
+
+    Returns:
+        CompiledTools: 매 턴 재사용되는 컴파일 결과.
+    """
+    key = tuple(functions)
+    try:
+        return _compile_tools_cached(key)
+    except TypeError:
+        # unhashable callable, compile without caching
+        return _compile_tools(key)
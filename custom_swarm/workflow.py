@@ -0,0 +1,185 @@
+import difflib
+from collections import deque
+from typing import Dict, Iterable, List, Set, Tuple
+
+from .types import Agent
+
+
+class WorkflowValidationError(ValueError):
+    """워크플로우 정의가 잘못되었을 때 발생 (없는 에이전트, 순환 의존성, 잘못된 의존성 이름 등)."""
+
+
+def handoff_targets(agent: Agent) -> List[Agent]:
+    """
+    에이전트 함수가 참조하는 다른 Agent를 정적으로 찾는다 (함수를 호출하지 않음).
+
+    `def transfer_to_x(): return x_agent` 처럼 전역 변수나 클로저로 참조되는 Agent를 핸드오프 대상으로 본다.
+    """
+    targets = []
+    for func in agent.functions:
+        code = getattr(func, "__code__", None)
+        if code is None:
+            continue
+        func_globals = getattr(func, "__globals__", {})
+        candidates = [func_globals.get(name) for name in code.co_names]
+        for cell in getattr(func, "__closure__", None) or ():
+            try:
+                candidates.append(cell.cell_contents)
+            except ValueError:  # empty cell
+                continue
+        targets.extend(c for c in candidates if isinstance(c, Agent))
+    return targets
+
+
+def reachable_agents(agents: Iterable[Agent]) -> Dict[str, Agent]:
+    """agents에서 핸드오프로 도달할 수 있는 모든 에이전트 (이름 -> Agent)."""
+    found: Dict[str, Agent] = {}
+    queue = deque(agents)
+    while queue:
+        agent = queue.popleft()
+        if agent.name in found:
+            continue
+        found[agent.name] = agent
+        queue.extend(handoff_targets(agent))
+    return found
+
+
+class WorkflowGraph:
+    """
+    워크플로우 스텝의 의존성 그래프.
+
+    `dependent_on`에는 스텝 이름이나 에이전트 이름을 쓸 수 있다. 에이전트 이름은 그 에이전트를
+    (직접 또는 핸드오프로) 실행하는 스텝에 대한 의존성으로 해석한다.
+
+    Args:
+        workflow (List[Dict]): name, agents, dependent_on, description 키를 가진 스텝 목록.
+        agents (List[Agent]): 워크플로우에서 사용할 에이전트 목록.
+
+    Raises:
+        WorkflowValidationError: 검증에 실패한 경우.
+    """
+
+    def __init__(self, workflow: List[Dict], agents: List[Agent]):
+        self.steps: Dict[str, Dict] = {}
+        for step in workflow:
+            if step["name"] in self.steps:
+                raise WorkflowValidationError(f"Duplicate step name: {step['name']}")
+            self.steps[step["name"]] = step
+
+        agent_map = {agent.name: agent for agent in agents}
+        errors = []
+
+        # 스텝별로 실행될 수 있는 에이전트 (핸드오프 포함)
+        self.produces: Dict[str, Set[str]] = {}
+        for name, step in self.steps.items():
+            missing = [a for a in step["agents"] if a not in agent_map]
+            if missing:
+                errors.append(
+                    f"Step '{name}' uses unknown agents {missing}"
+                    + _suggestion(missing, agent_map)
+                )
+            step_agents = [agent_map[a] for a in step["agents"] if a in agent_map]
+            self.produces[name] = set(reachable_agents(step_agents))
+
+        self.dependencies: Dict[str, Set[str]] = {}
+        known = set(self.steps).union(*self.produces.values())
+        for name, step in self.steps.items():
+            deps = set()
+            for dep in step.get("dependent_on", []):
+                if dep in self.steps:
+                    deps.add(dep)
+                    continue
+                producers = {s for s, produced in self.produces.items() if dep in produced}
+                if not producers:
+                    errors.append(
+                        f"Step '{name}' depends on unknown step or agent '{dep}'"
+                        + _suggestion([dep], known)
+                    )
+                elif producers == {name}:
+                    errors.append(f"Step '{name}' depends on its own agent '{dep}'")
+                deps |= producers - {name}
+            self.dependencies[name] = deps
+
+        if errors:
+            raise WorkflowValidationError("; ".join(errors))
+
+        self.order = self._topological_order()
+
+    def _topological_order(self) -> List[str]:
+        indegree = {name: len(deps) for name, deps in self.dependencies.items()}
+        dependents = self.dependents()
+        ready = deque(name for name in self.steps if indegree[name] == 0)
+        order = []
+        while ready:
+            name = ready.popleft()
+            order.append(name)
+            for child in dependents[name]:
+                indegree[child] -= 1
+                if indegree[child] == 0:
+                    ready.append(child)
+        if len(order) != len(self.steps):
+            cyclic = [name for name in self.steps if name not in order]
+            raise WorkflowValidationError(f"Workflow has a dependency cycle among steps {cyclic}")
+        return order
+
+    def dependents(self) -> Dict[str, List[str]]:
+        """스텝 이름 -> 그 스텝에 의존하는 스텝 목록 (워크플로우 순서)."""
+        dependents = {name: [] for name in self.steps}
+        for name, deps in self.dependencies.items():
+            for dep in deps:
+                dependents[dep].append(name)
+        return dependents
+
+    def roots(self) -> List[str]:
+        return [name for name in self.order if not self.dependencies[name]]
+
+    def layers(self) -> List[List[str]]:
+        """동시에 실행될 수 있는 스텝 묶음 (의존성 깊이 순)."""
+        depth = {}
+        for name in self.order:
+            depth[name] = max((depth[d] + 1 for d in self.dependencies[name]), default=0)
+        layers = [[] for _ in range(max(depth.values(), default=-1) + 1)]
+        for name in self.order:
+            layers[depth[name]].append(name)
+        return layers
+
+    def critical_path(self, durations: Dict[str, float] = None) -> Tuple[List[str], float]:
+        """
+        가장 긴 의존성 경로와 그 길이를 반환.
+
+        Args:
+            durations (Dict[str, float]): 스텝별 소요 시간. 없으면 모든 스텝을 1로 계산.
+
+        Returns:
+            Tuple[List[str], float]: (스텝 이름 경로, 총 길이).
+        """
+        durations = durations or {}
+        finish: Dict[str, float] = {}
+        previous: Dict[str, str] = {}
+        for name in self.order:
+            best = None
+            for dep in self.dependencies[name]:
+                if best is None or finish[dep] > finish[best]:
+                    best = dep
+            start = finish[best] if best else 0.0
+            finish[name] = start + durations.get(name, 1.0)
+            if best:
+                previous[name] = best
+        if not finish:
+            return [], 0.0
+
+        end = max(finish, key=finish.get)
+        path = [end]
+        while path[-1] in previous:
+            path.append(previous[path[-1]])
+        return path[::-1], finish[end]
+
+
+def _suggestion(names: Iterable[str], known: Iterable[str]) -> str:
+    known = list(known)
+    hints = []
+    for name in names:
+        matches = difflib.get_close_matches(name, known, n=1)
+        if matches:
+            hints.append(f"'{name}' -> '{matches[0]}'")
+    return f" (did you mean {', '.join(hints)}?)" if hints else ""
@@ -1,15 +1,131 @@
-from tavily import TavilyClient
+import json
 import os
+import re
+import threading
+
+from custom_swarm.cache import LRUCache, SQLiteCache
+
 TAVILY_API_KEY = os.getenv("TAVILY_API_KEY")
 
 
+def _default_client_factory(api_key):
+    from tavily import TavilyClient
+
+    return TavilyClient(api_key=api_key)
+
+
+# API 키별로 하나의 클라이언트를 공유 (호출마다 새로 만들지 않음)
+_client_factory = _default_client_factory
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(api_key):
+    """api_key에 해당하는 공유 클라이언트를 반환 (없으면 생성)."""
+    with _clients_lock:
+        client = _clients.get(api_key)
+        if client is None:
+            client = _clients[api_key] = _client_factory(api_key)
+        return client
+
+
+def set_client_factory(factory):
+    """
+    클라이언트 생성 함수를 교체 (테스트에서 FakeTavilyClient 사용 등). 기존 공유 클라이언트는 폐기.
+    None이면 기본 TavilyClient로 되돌린다.
+    """
+    global _client_factory
+    with _clients_lock:
+        _client_factory = factory or _default_client_factory
+        _clients.clear()
+
+
+class FakeTavilyClient:
+    """네트워크 없이 결정적인 검색 결과를 돌려주는 로컬 백엔드."""
+
+    def __init__(self, api_key=None):
+        self.api_key = api_key
+        self.calls = []
+
+    def search(self, query, max_results=5, include_domains=None, **kwargs):
+        self.calls.append(query)
+        domains = include_domains or ["example.com"]
+        return {
+            "results": [
+                {
+                    "url": f"https://{domains[i % len(domains)]}/{i}",
+                    "title": f"{query} #{i}",
+                    "content": f"result {i} for {query}",
+                }
+                for i in range(max_results)
+            ]
+        }
+
+
+class SearchCache:
+    """
+    검색 결과 캐시. 정규화된 질의 + 도메인 + k를 키로 사용.
+
+    Args:
+        ttl (float): 결과 유효 시간(초).
+        max_entries (int): 메모리에 유지할 최대 결과 수.
+        max_bytes (int): 메모리에 유지할 결과의 최대 총 크기 (JSON 기준).
+        path (str): 지정하면 SQLite 파일에도 저장하여 프로세스 간/재시작 후 재사용.
+    """
+
+    def __init__(self, ttl=3600, max_entries=256, max_bytes=32 * 1024 * 1024, path=None):
+        self.memory = LRUCache(
+            max_entries=max_entries,
+            ttl=ttl,
+            max_bytes=max_bytes,
+            sizeof=lambda results: len(json.dumps(results, ensure_ascii=False)),
+        )
+        self.disk = (
+            SQLiteCache(
+                path,
+                ttl=ttl,
+                serialize=lambda results: json.dumps(results, ensure_ascii=False),
+                deserialize=json.loads,
+            )
+            if path
+            else None
+        )
+
+    @staticmethod
+    def key(query, domains, k):
+        normalized = re.sub(r"\s+", " ", query).strip().lower()
+        return json.dumps([normalized, sorted(domains), k], ensure_ascii=False)
+
+    def get(self, key):
+        results = self.memory.get(key)
+        if results is None and self.disk is not None:
+            results = self.disk.get(key)
+            if results is not None:
+                self.memory.set(key, results)
+        return results
+
+    def set(self, key, results):
+        self.memory.set(key, results)
+        if self.disk is not None:
+            self.disk.set(key, results)
+
+
+search_cache = SearchCache()
+
+
 class TavilySearch:
-    def __init__(self, API_KEY, domains=["google.com", "naver.com"], k=6):
-        self.client = TavilyClient(api_key=API_KEY)
+    def __init__(self, API_KEY, domains=["google.com", "naver.com"], k=6, cache=None):
+        self.client = get_client(API_KEY)
         self.domains = domains
         self.k = k
+        self.cache = cache if cache is not None else search_cache
 
     def search(self, query: str):
+        key = self.cache.key(query, self.domains, self.k)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
         response = self.client.search(
             query,
             search_depth="advanced",
@@ -26,6 +142,7 @@ class TavilySearch:
             for r in response["results"]
         ]
 
+        self.cache.set(key, search_results)
         return search_results
 
 
@@ -44,4 +161,4 @@ def search_on_web_2(query: str):
         domains=["naver.com"],
         k=3,
     )
-    return tavily_tool.search(query)
\ No newline at end of file
+    return tavily_tool.search(query)
@@ -2,13 +2,15 @@ from example_folder.tavily_search import search_on_web_1 as Search1
 from example_folder.tavily_search import search_on_web_2 as Search2
 from example_folder.prompts import topic_prompt, objective_prompt, search_prompt, validate_prompt, writing_prompt, criticize_prompt
 from example_folder.log_printer import log_printer
-from custom_swarm import Swarm, Agent, CentralOrchestrator
+from custom_swarm import Swarm, Agent, CentralOrchestrator, RunLimits, ResultStore
 import json
 import os
 
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-client = Swarm()
-agent_results = {}
+# 핸드오프 핑퐁(search <-> validate, writing <-> criticize)이 무한히 반복되지 않도록 제한
+client = Swarm(limits=RunLimits(max_turns=30, max_handoffs=12, max_wall_time=600))
+# 긴 검색 결과 대화는 디스크로 내보내고 메모리에는 마지막 메시지만 유지
+agent_results = ResultStore(retention="full", spill_threshold=256 * 1024, max_bytes=32 * 1024 * 1024)
 
 def transfer_to_topic():
     return topic_agent
@@ -80,13 +82,15 @@ objective_agent = Agent(
 search_agent1 = Agent(
     name = "search_agent1",
     instructions=search_prompt,
-    functions=[get_objective_data, web_search_1, transfer_to_validate_agent1]
+    functions=[get_objective_data, web_search_1, transfer_to_validate_agent1],
+    concurrent_tool_calls=True
 )
 
 search_agent2 = Agent(
     name = "search_agent2",
     instructions=search_prompt,
-    functions=[get_objective_data, web_search_2, transfer_to_validate_agent2]
+    functions=[get_objective_data, web_search_2, transfer_to_validate_agent2],
+    concurrent_tool_calls=True
 )
 
 validate_agent_1 = Agent(
@@ -118,7 +122,7 @@ criticize_agent = Agent(
 workflow = [
     {"name": "Layer_1", "agents": ['topic_agent'], "description":"연구의 주제와 세부 목적을 선정하고 구체화 해."},
     {"name": "Layer_2", "agents": ["search_agent1", "search_agent2"], "dependent_on": ["objective_agent"], "description":"연구 목적과 연구 질문에 필요한 정보들을 수집해."},
-    {"name": "Layer_3", "agents": ["writing_agent"], "dependent_on": ["objective_agent", "validate_agent1", "validate_agent2"], "description":"주어진 정보와 연구 목적을 바탕으로 보고서 혹은 논문을 작성해."}
+    {"name": "Layer_3", "agents": ["writing_agent"], "dependent_on": ["objective_agent", "validate_agent_1", "validate_agent_2"], "description":"주어진 정보와 연구 목적을 바탕으로 보고서 혹은 논문을 작성해."}
 ]
 
 agents = [topic_agent, search_agent1, search_agent2, writing_agent]
@@ -129,4 +133,5 @@ messages = [{"role":"user", "content":user_query}]
 orchestrator = CentralOrchestrator(client, agent_results)
 orchestrator.execute_workflow(workflow, agents, messages)
 
-log_printer(agent_results)
\ No newline at end of file
+log_printer(agent_results)
+agent_results.close()
\ No newline at end of file
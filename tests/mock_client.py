@@ -1,7 +1,14 @@
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock
 from custom_swarm.types import ChatCompletionMessage, ChatCompletionMessageToolCall, Function
 from openai import OpenAI
 from openai.types.chat.chat_completion import ChatCompletion, Choice
+from openai.types.chat.chat_completion_chunk import (
+    ChatCompletionChunk,
+    Choice as ChunkChoice,
+    ChoiceDelta,
+    ChoiceDeltaToolCall,
+    ChoiceDeltaToolCallFunction,
+)
 import json
 
 
@@ -41,6 +48,41 @@ def create_mock_response(message, function_calls=[], model="gpt-4o"):
     )
 
 
+def create_mock_chunk(content=None, role=None, tool_calls=None, model="gpt-4o"):
+    """
+    tool_calls: list of dicts with index and optional id/name/arguments.
+    """
+    return ChatCompletionChunk(
+        id="mock_chunk_id",
+        created=1234567890,
+        model=model,
+        object="chat.completion.chunk",
+        choices=[
+            ChunkChoice(
+                index=0,
+                delta=ChoiceDelta(
+                    role=role,
+                    content=content,
+                    tool_calls=[
+                        ChoiceDeltaToolCall(
+                            index=call["index"],
+                            id=call.get("id"),
+                            type="function" if call.get("id") else None,
+                            function=ChoiceDeltaToolCallFunction(
+                                name=call.get("name"),
+                                arguments=call.get("arguments"),
+                            ),
+                        )
+                        for call in tool_calls
+                    ]
+                    if tool_calls
+                    else None,
+                ),
+            )
+        ],
+    )
+
+
 class MockOpenAIClient:
     def __init__(self):
         self.chat = MagicMock()
@@ -64,6 +106,12 @@ class MockOpenAIClient:
         self.chat.completions.create.assert_called_with(**kwargs)
 
 
+class AsyncMockOpenAIClient(MockOpenAIClient):
+    def __init__(self):
+        super().__init__()
+        self.chat.completions.create = AsyncMock()
+
+
 # Initialize the mock client
 client = MockOpenAIClient()
 
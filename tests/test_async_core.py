@@ -0,0 +1,245 @@
+import asyncio
+import time
+
+from custom_swarm import AsyncSwarm, Agent, RunLimits, RunState
+from custom_swarm.types import ChatCompletionMessageToolCall, Function, Result
+from tests.mock_client import AsyncMockOpenAIClient, create_mock_chunk, create_mock_response
+
+DEFAULT_RESPONSE_CONTENT = "sample response content"
+
+
+def test_async_parallel_agents_with_async_tool():
+    calls = []
+
+    async def lookup(query):
+        await asyncio.sleep(0)
+        calls.append(query)
+        return f"found {query}"
+
+    agent1 = Agent(name="Agent 1", functions=[lookup])
+    agent2 = Agent(name="Agent 2")
+
+    client = AsyncMockOpenAIClient()
+    client.set_sequential_responses(
+        [
+            create_mock_response(
+                message={"role": "assistant", "content": ""},
+                function_calls=[{"name": "lookup", "args": {"query": "swarm"}}],
+            ),
+            create_mock_response({"role": "assistant", "content": "second"}),
+            create_mock_response(
+                {"role": "assistant", "content": DEFAULT_RESPONSE_CONTENT}
+            ),
+        ]
+    )
+
+    swarm = AsyncSwarm(client=client)
+    messages = [{"role": "user", "content": "Hello"}]
+    results = asyncio.run(swarm.run_parallel_agents([agent1, agent2], messages))
+
+    assert calls == ["swarm"]
+    assert len(results) == 2
+    assert {r.agent.name for r in results} == {"Agent 1", "Agent 2"}
+    assert swarm.agent_states == {"Agent 1": "Completed", "Agent 2": "Completed"}
+    assert messages == [{"role": "user", "content": "Hello"}]
+
+
+async def achunks(*chunks, delay=0.0):
+    for chunk in chunks:
+        if delay:
+            await asyncio.sleep(delay)
+        yield chunk
+
+
+def test_async_run_and_stream_assembles_content_and_tool_calls():
+    async def lookup(id):
+        return f"item {id}"
+
+    client = AsyncMockOpenAIClient()
+    client.chat.completions.create.side_effect = [
+        achunks(
+            create_mock_chunk(role="assistant"),
+            create_mock_chunk(tool_calls=[
+                {"index": 0, "id": "tc_0", "name": "lookup", "arguments": '{"id": '},
+            ]),
+            create_mock_chunk(tool_calls=[{"index": 0, "arguments": '"a"}'}]),
+        ),
+        achunks(
+            create_mock_chunk(role="assistant", content="Hel"),
+            create_mock_chunk(content="lo"),
+        ),
+    ]
+    swarm = AsyncSwarm(client=client)
+
+    async def collect():
+        stream = await swarm.run(Agent(functions=[lookup]), [{"role": "user", "content": "hi"}],
+                                 stream=True)
+        return [event async for event in stream]
+
+    events = asyncio.run(collect())
+    response = events[-1]["response"]
+
+    assert [e.get("delim") for e in events if "delim" in e] == ["start", "end", "start", "end"]
+    assert [m["role"] for m in response.messages] == ["assistant", "tool", "assistant"]
+    assert response.messages[1]["content"] == "item a"
+    assert response.messages[-1]["content"] == "Hello"
+    assert response.messages[-1]["tool_calls"] is None
+
+
+def test_async_concurrent_tool_calls_keep_order():
+    async def slow_search(query):
+        await asyncio.sleep(0.2)
+        return f"slow {query}"
+
+    def fast_search(query):
+        return Result(value=f"fast {query}", context_variables={"last": query})
+
+    def tool_call(id, name, args):
+        return ChatCompletionMessageToolCall(
+            id=id, type="function", function=Function(name=name, arguments=f'{{"query": "{args}"}}'))
+
+    swarm = AsyncSwarm(client=AsyncMockOpenAIClient())
+    tool_calls = [tool_call("tc_1", "slow_search", "a"), tool_call("tc_2", "fast_search", "b"),
+                  tool_call("tc_3", "slow_search", "c")]
+
+    start = time.perf_counter()
+    response = asyncio.run(swarm.handle_tool_calls(
+        tool_calls, [slow_search, fast_search], {}, False, concurrent=True))
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 0.35
+    assert [m["tool_call_id"] for m in response.messages] == ["tc_1", "tc_2", "tc_3"]
+    assert [m["content"] for m in response.messages] == ["slow a", "fast b", "slow c"]
+    assert response.context_variables == {"last": "b"}
+
+
+def test_async_run_parallel_agents_ordered_with_errors_and_timeout():
+    async def create(**params):
+        if params["model"] == "slow":
+            await asyncio.sleep(0.5)
+        if params["model"] == "broken":
+            raise RuntimeError("provider error")
+        return create_mock_response({"role": "assistant", "content": params["model"]})
+
+    client = AsyncMockOpenAIClient()
+    client.chat.completions.create.side_effect = create
+    swarm = AsyncSwarm(client=client)
+    agents = [Agent(name="slow", model="slow"), Agent(name="broken", model="broken"),
+              Agent(name="fast", model="fast")]
+
+    start = time.perf_counter()
+    results = asyncio.run(swarm.run_parallel_agents(
+        agents, [{"role": "user", "content": "hi"}], timeout={"slow": 0.1}))
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 0.4
+    assert [r.agent.name for r in results] == ["slow", "broken", "fast"]
+    assert results[0].error.startswith("TimeoutError") and results[0].messages == []
+    assert results[1].error == "RuntimeError: provider error"
+    assert results[2].messages[-1]["content"] == "fast"
+    # wait_for가 task를 취소하므로 바로 Cancelled
+    assert swarm.agent_states == {"slow": RunState.CANCELLED, "broken": RunState.FAILED,
+                                  "fast": RunState.COMPLETED}
+
+
+def test_async_stream_parallel_agents_interleaves_and_cancels_on_close():
+    async def create(**params):
+        if params["model"] == "slow":
+            return achunks(create_mock_chunk(role="assistant", content="slow"), delay=5)
+        return achunks(create_mock_chunk(role="assistant", content="fast"),
+                       create_mock_chunk(content="!"))
+
+    client = AsyncMockOpenAIClient()
+    client.chat.completions.create.side_effect = create
+    swarm = AsyncSwarm(client=client)
+    agents = [Agent(name="slow", model="slow"), Agent(name="fast", model="fast")]
+
+    async def consume():
+        events = swarm.stream_parallel_agents(agents, [{"role": "user", "content": "hi"}])
+        seen = []
+        async for event in events:
+            seen.append(event)
+            if "response" in event:
+                break  # 느린 에이전트를 기다리지 않고 닫는다
+        await events.aclose()
+        return seen
+
+    start = time.perf_counter()
+    seen = asyncio.run(consume())
+
+    assert time.perf_counter() - start < 1
+    assert {e["agent"] for e in seen} <= {"slow", "fast"}
+    assert seen[-1]["agent"] == "fast"
+    assert seen[-1]["response"].messages[-1]["content"] == "fast!"
+    assert swarm.agent_states == {"slow": RunState.CANCELLED, "fast": RunState.COMPLETED}
+
+
+def test_async_run_first_returns_first_valid_answer_and_cancels_the_rest():
+    ran = []
+
+    async def wait_tool():
+        ran.append("wait_tool")
+        await asyncio.sleep(5)
+        return "waited"
+
+    async def create(**params):
+        if params["model"] == "slow":
+            return achunks(create_mock_chunk(role="assistant", tool_calls=[
+                {"index": 0, "id": "tc_0", "name": "wait_tool", "arguments": "{}"},
+            ]))
+        if params["model"] == "good":
+            await asyncio.sleep(0.1)
+        answer = "evidence" if params["model"] == "good" else "no idea"
+        return achunks(create_mock_chunk(role="assistant", content=answer))
+
+    client = AsyncMockOpenAIClient()
+    client.chat.completions.create.side_effect = create
+    swarm = AsyncSwarm(client=client)
+    agents = [Agent(name="slow", model="slow", functions=[wait_tool]),
+              Agent(name="bad", model="bad"), Agent(name="good", model="good")]
+
+    start = time.perf_counter()
+    response = asyncio.run(swarm.run_first(
+        agents, [{"role": "user", "content": "hi"}],
+        validator=lambda r: "evidence" in r.messages[-1]["content"]))
+
+    assert time.perf_counter() - start < 1  # 코루틴 도구도 바로 취소된다
+    assert response.agent.name == "good"
+    assert response.messages[-1]["content"] == "evidence"
+    assert swarm.agent_states["slow"] == RunState.CANCELLED
+    assert ran == ["wait_tool"]
+
+    rejected = asyncio.run(swarm.run_first(
+        agents[1:2], [{"role": "user", "content": "hi"}], validator=lambda r: False))
+    assert rejected.error.startswith("NoAcceptableResult") and not rejected.messages
+
+
+def test_async_ping_pong_run_stops_on_handoff_cycle():
+    def transfer_to_validate():
+        return validate_agent
+
+    def transfer_to_search():
+        return search_agent
+
+    search_agent = Agent(name="search", functions=[transfer_to_search, transfer_to_validate])
+    validate_agent = Agent(name="validate", functions=[transfer_to_search, transfer_to_validate])
+    calls = []
+
+    async def create(**params):
+        name = "transfer_to_validate" if len(calls) % 2 == 0 else "transfer_to_search"
+        calls.append(name)
+        return create_mock_response({"role": "assistant", "content": ""}, [{"name": name}])
+
+    client = AsyncMockOpenAIClient()
+    client.chat.completions.create.side_effect = create
+    swarm = AsyncSwarm(client=client, limits=RunLimits(max_cycle_repeats=3))
+
+    [result] = asyncio.run(swarm.run_parallel_agents(
+        [search_agent], [{"role": "user", "content": "go"}]))
+
+    assert result.error is None
+    assert result.stop_reason.startswith("handoff_cycle")
+    assert len(calls) == 6
+    assert result.agent.name in {"search", "validate"}
+    assert result.messages[-1]["role"] == "tool"
+
@@ -0,0 +1,94 @@
+import json
+
+from custom_swarm import (
+    Agent,
+    BatchBackend,
+    BatchFileBackend,
+    BatchingClient,
+    HTTPBatchBackend,
+    LocalBatchServer,
+    LRUCache,
+    Swarm,
+    load_batch_results,
+)
+from tests.mock_client import create_mock_response
+
+
+def answer(body):
+    return create_mock_response({"role": "assistant", "content": f"batched {body['messages'][1]['content']}"})
+
+
+def test_parallel_agents_share_one_batch():
+    with LocalBatchServer(answer) as server:
+        client = BatchingClient(HTTPBatchBackend(server.url), window=5.0, max_batch_size=4)
+        swarm = Swarm(client=client)
+        agents = [Agent(name=f"agent_{i}") for i in range(4)]
+
+        results = swarm.run_parallel_agents(agents, [{"role": "user", "content": "q"}])
+        client.close()
+
+    assert [result.error for result in results] == [None] * 4
+    assert all(result.messages[-1]["content"] == "batched q" for result in results)
+    assert server.batch_sizes == [4]
+
+
+def test_window_flushes_partial_batch_and_reports_errors():
+    def responder(body):
+        if body["model"] == "broken":
+            raise RuntimeError("no such model")
+        return answer(body)
+
+    with LocalBatchServer(responder) as server:
+        client = BatchingClient(HTTPBatchBackend(server.url), window=0.01)
+        swarm = Swarm(client=client)
+        results = swarm.run_parallel_agents(
+            [Agent(name="ok"), Agent(name="bad", model="broken")],
+            [{"role": "user", "content": "q"}])
+        client.close()
+
+    assert results[0].error is None
+    assert "no such model" in results[1].error
+
+
+
+def test_short_backend_result_fails_every_request():
+    class ShortBackend(BatchBackend):
+        def submit(self, requests):
+            return [create_mock_response({"role": "assistant", "content": "only one"})]
+
+    client = BatchingClient(ShortBackend(), window=5.0, max_batch_size=2)
+    results = Swarm(client=client).run_parallel_agents(
+        [Agent(name="a"), Agent(name="b", model="other")], [{"role": "user", "content": "q"}])
+    client.close()
+
+    assert all(result.error.startswith("BatchError") for result in results)
+    assert all("returned 1 results for 2 requests" in result.error for result in results)
+
+
+def test_offline_batch_file_round_trip(tmp_path):
+    requests_path = tmp_path / "batch_input.jsonl"
+    cache = LRUCache()
+    messages = [{"role": "user", "content": "q"}]
+
+    def swarm():
+        return Swarm(client=BatchingClient(BatchFileBackend(str(requests_path)), window=0.01),
+                     cache=cache)
+
+    [pending] = swarm().run_parallel_agents([Agent(name="writer")], messages)
+    assert pending.error.startswith("BatchPending")
+
+    [request] = [json.loads(line) for line in requests_path.read_text().splitlines()]
+    assert request["url"] == "/v1/chat/completions" and "stream" not in request["body"]
+
+    # Batch API 출력 파일 흉내
+    output_path = tmp_path / "batch_output.jsonl"
+    output_path.write_text(json.dumps({
+        "custom_id": request["custom_id"],
+        "response": {"status_code": 200, "body": answer(request["body"]).model_dump(mode="json")},
+        "error": None,
+    }) + "\n")
+    assert load_batch_results(str(output_path), cache) == 1
+
+    [done] = swarm().run_parallel_agents([Agent(name="writer")], messages)
+    assert done.error is None
+    assert done.messages[-1]["content"] == "batched q"
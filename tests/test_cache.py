@@ -0,0 +1,45 @@
+import time
+
+from custom_swarm import Agent, LRUCache, SQLiteCache, Swarm
+from custom_swarm.cache import completion_cache_key
+from tests.mock_client import MockOpenAIClient, create_mock_response
+
+
+def test_cache_key_is_stable_and_ignores_unrelated_params():
+    params = {"model": "gpt-4o", "messages": [{"role": "user", "content": "hi"}],
+              "tools": None, "tool_choice": None, "stream": False}
+    reordered = {"stream": True, "tool_choice": None, "tools": None,
+                 "messages": [{"content": "hi", "role": "user"}], "model": "gpt-4o"}
+
+    assert completion_cache_key(params) == completion_cache_key(reordered)
+    assert completion_cache_key(params) != completion_cache_key({**params, "model": "gpt-4o-mini"})
+
+
+def test_lru_cache_eviction_and_ttl():
+    cache = LRUCache(max_entries=2, ttl=0.05)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)  # evicts b, the least recently used
+
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+    time.sleep(0.06)
+    assert cache.get("a") is None
+    assert cache.stats.hits == 2 and cache.stats.misses == 2
+
+
+def test_swarm_reuses_cached_completion(tmp_path):
+    client = MockOpenAIClient()
+    client.set_response(create_mock_response({"role": "assistant", "content": "cached"}))
+    cache = SQLiteCache(str(tmp_path / "completions.db"), max_entries=10)
+    swarm = Swarm(client=client, cache=cache)
+    messages = [{"role": "user", "content": "Hello"}]
+
+    for _ in range(3):
+        results = swarm.run_parallel_agents([Agent()], messages)
+        assert results[0].messages[-1]["content"] == "cached"
+
+    assert client.chat.completions.create.call_count == 1
+    assert cache.stats.hits == 2 and cache.stats.misses == 1
+    assert len(SQLiteCache(str(tmp_path / "completions.db"))) == 1
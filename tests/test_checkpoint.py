@@ -0,0 +1,73 @@
+import pytest
+
+from custom_swarm import (
+    Agent,
+    AutoApprove,
+    CentralOrchestrator,
+    CheckpointError,
+    FileCheckpointStore,
+    Swarm,
+)
+from tests.mock_client import MockOpenAIClient, create_mock_response
+
+
+def lookup(query):
+    return f"found {query}"
+
+
+AGENTS = [Agent(name="a", model="a"), Agent(name="b", model="b", functions=[lookup])]
+WORKFLOW = [
+    {"name": "A", "agents": ["a"], "description": "first"},
+    {"name": "B", "agents": ["b"], "dependent_on": ["A"], "description": "second"},
+]
+
+
+def orchestrator_with(create, store):
+    client = MockOpenAIClient()
+    client.chat.completions.create.side_effect = create
+    return CentralOrchestrator(Swarm(client=client), {}, approval=AutoApprove(), checkpoints=store)
+
+
+def test_resume_skips_finished_steps_and_continues_agent_from_last_turn(tmp_path):
+    store = FileCheckpointStore(str(tmp_path))
+
+    def crashing(**params):
+        if params["model"] == "a":
+            return create_mock_response({"content": "a done"})
+        if params["messages"][-1]["role"] == "tool":
+            raise KeyboardInterrupt  # 프로세스 중단
+        return create_mock_response({"content": ""}, [{"name": "lookup", "args": {"query": "x"}}])
+
+    with pytest.raises(KeyboardInterrupt):
+        orchestrator_with(crashing, store).execute_workflow(
+            WORKFLOW, AGENTS, [{"role": "user", "content": "q"}], workflow_id="wf")
+
+    calls = []
+
+    def healthy(**params):
+        calls.append(params)
+        return create_mock_response({"content": f"{params['model']} done"})
+
+    orchestrator = orchestrator_with(healthy, store)
+    orchestrator.resume_workflow("wf", WORKFLOW, AGENTS)
+
+    assert [params["model"] for params in calls] == ["b"]  # A는 다시 실행하지 않음
+    assert [m["role"] for m in calls[0]["messages"]] == ["system", "user", "assistant", "tool"]
+    assert orchestrator.agent_results["a"].messages[-1]["content"] == "a done"
+    b_messages = orchestrator.agent_results["b"].messages
+    assert [m["role"] for m in b_messages] == ["assistant", "tool", "assistant"]
+    assert b_messages[1]["content"] == "found x"
+    assert store.load("wf")["done"] is True
+    assert store.keys("wf/") == []
+
+
+def test_resume_rejects_changed_workflow(tmp_path):
+    store = FileCheckpointStore(str(tmp_path))
+    orchestrator = orchestrator_with(
+        lambda **params: create_mock_response({"content": "done"}), store)
+    orchestrator.execute_workflow(WORKFLOW, AGENTS, [{"role": "user", "content": "q"}])
+
+    with pytest.raises(CheckpointError, match="changed"):
+        orchestrator.resume_workflow(orchestrator.workflow_id, WORKFLOW[:1], AGENTS)
+    with pytest.raises(CheckpointError, match="No checkpoint"):
+        orchestrator.resume_workflow("missing", WORKFLOW, AGENTS)
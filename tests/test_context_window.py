@@ -0,0 +1,122 @@
+import gc
+import weakref
+
+from custom_swarm import (
+    Agent,
+    ContextWindowManager,
+    DropOldest,
+    Summarize,
+    Swarm,
+    TokenCounter,
+    TruncateToolOutputs,
+)
+from tests.mock_client import MockOpenAIClient, create_mock_response
+
+SYSTEM = {"role": "system", "content": "sys"}
+
+
+def char_counter():
+    # 1 token per character keeps the arithmetic readable
+    return TokenCounter(encode=len)
+
+
+def tool_round(i, size=10):
+    return [
+        {"role": "assistant", "content": "", "tool_calls": [
+            {"id": f"tc_{i}", "type": "function", "function": {"name": "f", "arguments": "{}"}}]},
+        {"role": "tool", "tool_call_id": f"tc_{i}", "content": "x" * size},
+    ]
+
+
+def test_counter_memoizes_per_message():
+    calls = []
+    counter = TokenCounter(encode=lambda text: calls.append(text) or len(text))
+    message = {"role": "user", "content": "hello"}
+
+    assert counter.count(message) == counter.count(message) == 5 + 4
+    assert calls == ["hello"]
+    # 내용이 같은 새 dict는 다시 계산하지 않는다
+    assert counter.count(dict(message)) == 9
+    assert calls == ["hello"]
+
+
+def test_counter_does_not_keep_messages_alive():
+    class Message(dict):
+        pass
+
+    counter = char_counter()
+    history = [Message(role="tool", content=f"{i}" + "x" * 1000) for i in range(100)]
+    refs = [weakref.ref(message) for message in history]
+
+    assert counter.total(history) == sum(len(m["content"]) + 4 for m in history)
+    del history
+    gc.collect()
+    assert all(ref() is None for ref in refs)
+
+
+def test_truncate_then_drop_oldest_keeps_tool_pairs():
+    history = [{"role": "user", "content": "q"}] + tool_round(1, 500) + tool_round(2, 500)
+    manager = ContextWindowManager(
+        policies=[TruncateToolOutputs(max_tokens=100), DropOldest()], counter=char_counter())
+
+    fitted = manager.fit(SYSTEM, history, budget=400)
+    assert [m["role"] for m in fitted] == ["system", "user", "assistant", "tool", "assistant", "tool"]
+    assert fitted[3]["content"].startswith("x" * 100) and "truncated 400 tokens" in fitted[3]["content"]
+    assert history[2]["content"] == "x" * 500
+
+    fitted = manager.fit(SYSTEM, history, budget=200)
+    # the oldest tool round is dropped as a unit, never leaving an orphan tool message
+    assert [m["role"] for m in fitted] == ["system", "assistant", "tool"]
+    assert fitted[1]["tool_calls"][0]["id"] == "tc_2"
+
+
+def test_summarize_hook_replaces_old_messages():
+    summaries = []
+
+    def hook(messages):
+        summaries.append(len(messages))
+        return "short"
+
+    history = [{"role": "user", "content": "y" * 100} for _ in range(5)]
+    manager = ContextWindowManager(policies=[Summarize(hook, keep_last=2)], counter=char_counter())
+
+    fitted = manager.fit(SYSTEM, history, budget=300)
+    manager.fit(SYSTEM, history, budget=300)
+    assert fitted[1]["content"].endswith("short")
+    assert fitted[2:] == history[-2:]
+    assert summaries == [3]
+
+
+def test_summary_is_reused_after_tool_outputs_are_truncated():
+    summaries = []
+
+    def hook(messages):
+        summaries.append(len(messages))
+        return "short"
+
+    history = [{"role": "user", "content": "q"}] + tool_round(1, 500) + tool_round(2, 500)
+    manager = ContextWindowManager(
+        policies=[TruncateToolOutputs(max_tokens=100), Summarize(hook, keep_last=1)],
+        counter=char_counter())
+
+    # TruncateToolOutputs는 매번 새 dict를 만들지만 내용이 같으므로 요약을 재사용
+    first = manager.fit(SYSTEM, history, budget=200)
+    second = manager.fit(SYSTEM, history, budget=200)
+    assert first == second
+    assert summaries == [3]
+
+    history[0] = {"role": "user", "content": "changed"}
+    manager.fit(SYSTEM, history, budget=200)
+    assert summaries == [3, 3]
+
+
+def test_agent_token_budget_applies_to_requests():
+    client = MockOpenAIClient()
+    client.set_response(create_mock_response({"role": "assistant", "content": "ok"}))
+    swarm = Swarm(client=client, context_manager=ContextWindowManager(counter=char_counter()))
+    history = [{"role": "user", "content": "z" * 100} for _ in range(10)]
+
+    swarm.run_parallel_agents([Agent(instructions="sys", token_budget=350)], history)
+
+    sent = client.chat.completions.create.call_args.kwargs["messages"]
+    assert len(sent) == 4 and sent[0]["role"] == "system"
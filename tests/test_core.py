@@ -1,8 +1,13 @@
+import asyncio
+
 import pytest
-from custom_swarm import Swarm, Agent
+from custom_swarm import Swarm, Agent, RunState
+from custom_swarm.types import ChatCompletionMessageToolCall, Function, Result
 from tests.mock_client import MockOpenAIClient, create_mock_response
 from unittest.mock import Mock
 import json
+import threading
+import time
 
 DEFAULT_RESPONSE_CONTENT = "sample response content"
 
@@ -143,3 +148,119 @@ def test_handoff(mock_openai_client: MockOpenAIClient):
     assert response.agent == agent2
     assert response.messages[-1]["role"] == "assistant"
     assert response.messages[-1]["content"] == DEFAULT_RESPONSE_CONTENT
+
+
+def _tool_call(call_id, name, args=None):
+    return ChatCompletionMessageToolCall(
+        id=call_id,
+        type="function",
+        function=Function(name=name, arguments=json.dumps(args or {})),
+    )
+
+
+def test_concurrent_tool_calls_keep_order(mock_openai_client: MockOpenAIClient):
+    def slow_search(query):
+        time.sleep(0.2)
+        return f"slow {query}"
+
+    async def fast_search(query):
+        return Result(value=f"fast {query}", context_variables={"last": query})
+
+    tool_calls = [
+        _tool_call("tc_1", "slow_search", {"query": "a"}),
+        _tool_call("tc_2", "fast_search", {"query": "b"}),
+        _tool_call("tc_3", "slow_search", {"query": "c"}),
+    ]
+    client = Swarm(client=mock_openai_client)
+    start = time.perf_counter()
+    response = client.handle_tool_calls(
+        tool_calls, [slow_search, fast_search], {}, False, concurrent=True
+    )
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 0.35
+    assert [m["tool_call_id"] for m in response.messages] == ["tc_1", "tc_2", "tc_3"]
+    assert [m["content"] for m in response.messages] == ["slow a", "fast b", "slow c"]
+    assert response.context_variables == {"last": "b"}
+
+
+def test_coroutine_tool_runs_when_called_from_event_loop(mock_openai_client: MockOpenAIClient):
+    async def lookup(query):
+        await asyncio.sleep(0)
+        return f"found {query}"
+
+    mock_openai_client.set_sequential_responses([
+        create_mock_response({"role": "assistant", "content": ""},
+                             [{"name": "lookup", "args": {"query": "q"}}]),
+        create_mock_response({"role": "assistant", "content": "done"}),
+    ])
+    swarm = Swarm(client=mock_openai_client)
+
+    async def handler():
+        # 이벤트 루프 안에서 동기 Swarm.run 호출 (Jupyter, async 웹 핸들러)
+        return swarm.run(Agent(functions=[lookup]), [{"role": "user", "content": "hi"}])
+
+    response = asyncio.run(handler())
+
+    assert response.messages[1]["content"] == "found q"
+    assert response.messages[-1]["content"] == "done"
+
+
+def test_tool_concurrency_limit(mock_openai_client: MockOpenAIClient):
+    active = []
+    peak = []
+    lock = threading.Lock()
+
+    def limited():
+        with lock:
+            active.append(1)
+            peak.append(len(active))
+        time.sleep(0.05)
+        with lock:
+            active.pop()
+        return "ok"
+
+    tool_calls = [_tool_call(f"tc_{i}", "limited") for i in range(4)]
+    client = Swarm(client=mock_openai_client)
+    response = client.handle_tool_calls(
+        tool_calls, [limited], {}, False, concurrent=True,
+        tool_concurrency={"limited": 1},
+    )
+
+    assert max(peak) == 1
+    assert len(response.messages) == 4
+
+
+def test_run_parallel_agents_ordered_with_errors_and_timeout(
+    mock_openai_client: MockOpenAIClient,
+):
+    def create(**params):
+        if params["model"] == "slow":
+            time.sleep(0.5)
+        if params["model"] == "broken":
+            raise RuntimeError("provider error")
+        return create_mock_response(
+            {"role": "assistant", "content": params["model"]})
+
+    mock_openai_client.chat.completions.create.side_effect = create
+    agents = [
+        Agent(name="slow", model="slow"),
+        Agent(name="broken", model="broken"),
+        Agent(name="fast", model="fast"),
+    ]
+
+    with Swarm(client=mock_openai_client) as client:
+        start = time.perf_counter()
+        results = client.run_parallel_agents(
+            agents, [{"role": "user", "content": "hi"}], timeout={"slow": 0.1}
+        )
+        elapsed = time.perf_counter() - start
+
+    assert elapsed < 0.4
+    assert [r.agent.name for r in results] == ["slow", "broken", "fast"]
+    assert results[0].error.startswith("TimeoutError") and results[0].messages == []
+    assert results[1].error == "RuntimeError: provider error"
+    assert results[2].error is None
+    assert results[2].messages[-1]["content"] == "fast"
+    # close()는 시간 초과한 에이전트의 스레드가 끝날 때까지 기다린다
+    assert client.agent_states["slow"] in (RunState.COMPLETED, RunState.CANCELLED)
@@ -0,0 +1,106 @@
+import threading
+import time
+
+import httpx
+import openai
+import pytest
+
+from custom_swarm import Agent, Dispatcher, RetryPolicy, Swarm, TokenBucket
+from tests.mock_client import MockOpenAIClient, create_mock_response
+
+
+def rate_limit_error(retry_after="0"):
+    response = httpx.Response(
+        429, request=httpx.Request("POST", "https://api.test/v1/chat/completions"),
+        headers={"retry-after": retry_after})
+    return openai.RateLimitError("rate limited", response=response, body=None)
+
+
+def test_rate_limited_request_is_retried_for_parallel_agents():
+    client = MockOpenAIClient()
+    ok = create_mock_response({"role": "assistant", "content": "ok"})
+    client.set_sequential_responses([rate_limit_error(), ok, ok])
+    dispatcher = Dispatcher(retry=RetryPolicy(initial_delay=0.001))
+    swarm = Swarm(client=client, dispatcher=dispatcher)
+
+    results = swarm.run_parallel_agents(
+        [Agent(name="a"), Agent(name="b")], [{"role": "user", "content": "hi"}])
+
+    assert [result.error for result in results] == [None, None]
+    assert dispatcher.retries == 1
+    assert client.chat.completions.create.call_count == 3
+
+
+def test_non_retryable_error_is_raised_immediately():
+    dispatcher = Dispatcher(retry=RetryPolicy(initial_delay=0.001))
+    calls = []
+
+    def create(**params):
+        calls.append(params)
+        raise ValueError("bad request")
+
+    with pytest.raises(ValueError):
+        dispatcher.call(create, {"messages": []})
+    assert len(calls) == 1
+    assert dispatcher.in_flight == 0
+
+
+def test_backoff_grows_and_respects_retry_after():
+    policy = RetryPolicy(initial_delay=1.0, multiplier=2.0, max_delay=5.0, jitter=False)
+    assert [policy.delay(n) for n in (1, 2, 3, 4)] == [1.0, 2.0, 4.0, 5.0]
+    assert policy.delay(1, retry_after=3.0) == 3.0
+
+
+def test_token_bucket_waits_for_refill():
+    bucket = TokenBucket(per_minute=60)  # 1 per second, burst 60
+    now = bucket.updated
+    assert bucket.wait_time(60, now) == 0
+    bucket.take(60)
+    assert bucket.wait_time(1, now) == pytest.approx(1.0)
+    assert bucket.wait_time(1, now + 1.0) == 0
+
+
+def test_requests_are_admitted_by_priority():
+    dispatcher = Dispatcher(max_in_flight=1)
+    release_first = threading.Event()
+    order = []
+
+    def create(name):
+        order.append(name)
+        if name == "first":
+            release_first.wait(5)
+        return name
+
+    def call(name, priority):
+        dispatcher.call(create, {"name": name}, priority=priority)
+
+    threads = [threading.Thread(target=call, args=("first", 0))]
+    threads[0].start()
+    while dispatcher.in_flight == 0:
+        time.sleep(0.001)
+    for name, priority in [("low", 0), ("high", 10)]:
+        thread = threading.Thread(target=call, args=(name, priority))
+        thread.start()
+        threads.append(thread)
+        while dispatcher.queued < len(threads) - 1:
+            time.sleep(0.001)
+    release_first.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert order == ["first", "high", "low"]
+
+
+def test_stream_holds_in_flight_slot_until_consumed_or_closed():
+    dispatcher = Dispatcher(max_in_flight=1)
+    create = lambda **params: iter(["a", "b"])
+
+    stream = dispatcher.call(create, {"stream": True})
+    assert dispatcher.in_flight == 1
+    assert list(stream) == ["a", "b"]
+    assert dispatcher.in_flight == 0
+
+    stream = dispatcher.call(create, {"stream": True})
+    assert next(stream) == "a"
+    stream.close()
+    assert dispatcher.in_flight == 0
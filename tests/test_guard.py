@@ -0,0 +1,90 @@
+from custom_swarm import Agent, RunLimits, Swarm
+from custom_swarm.guard import RunGuard
+from openai.types.chat import ChatCompletionChunk
+from openai.types.completion_usage import CompletionUsage
+from tests.mock_client import MockOpenAIClient, create_mock_chunk, create_mock_response
+
+
+def test_guard_detects_handoff_cycle():
+    guard = RunGuard(RunLimits(max_cycle_repeats=2), "search")
+    for name in ["validate", "search", "validate"]:
+        guard.record_handoff(name)
+        assert guard.check() is None
+    guard.record_handoff("search")
+
+    assert guard.check() == "handoff_cycle: search -> validate -> search repeated 2 times"
+
+
+def test_ping_pong_run_returns_partial_response():
+    def transfer_to_validate():
+        return validate_agent
+
+    def transfer_to_search():
+        return search_agent
+
+    search_agent = Agent(name="search", functions=[transfer_to_search, transfer_to_validate])
+    validate_agent = Agent(name="validate", functions=[transfer_to_search, transfer_to_validate])
+
+    client = MockOpenAIClient()
+
+    def create(**params):
+        # alternate handoffs forever
+        name = "transfer_to_validate" if create.calls % 2 == 0 else "transfer_to_search"
+        create.calls += 1
+        return create_mock_response(
+            {"role": "assistant", "content": ""}, [{"name": name}])
+
+    create.calls = 0
+    client.chat.completions.create.side_effect = create
+    swarm = Swarm(client=client, limits=RunLimits(max_cycle_repeats=3))
+
+    result = swarm.run_parallel_agents([search_agent], [{"role": "user", "content": "go"}])[0]
+
+    assert result.error is None
+    assert result.stop_reason.startswith("handoff_cycle")
+    assert create.calls == 6
+    assert result.messages[-1]["role"] == "tool"
+
+
+def test_turn_and_identical_tool_call_limits():
+    def lookup(query):
+        return "same"
+
+    client = MockOpenAIClient()
+    client.set_response(create_mock_response(
+        {"role": "assistant", "content": ""}, [{"name": "lookup", "args": {"query": "q"}}]))
+    agent = Agent(functions=[lookup])
+    messages = [{"role": "user", "content": "go"}]
+
+    swarm = Swarm(client=client, limits=RunLimits(max_identical_tool_calls=2))
+    result = swarm.run_parallel_agents([agent], messages)[0]
+    assert result.stop_reason.startswith("identical_tool_calls: lookup")
+    assert client.chat.completions.create.call_count == 3
+
+    swarm = Swarm(client=client, limits=RunLimits(max_turns=2, max_identical_tool_calls=None))
+    result = swarm.run_parallel_agents([agent], messages)[0]
+    assert result.stop_reason == "max_turns: 2 turns (limit 2)"
+    assert len(result.messages) == 4
+
+
+def test_streamed_usage_counts_toward_max_tokens():
+    def lookup(query):
+        return "result"
+
+    usage_chunk = ChatCompletionChunk(
+        id="usage", created=0, model="gpt-4o", object="chat.completion.chunk", choices=[],
+        usage=CompletionUsage(prompt_tokens=40, completion_tokens=20, total_tokens=60))
+    client = MockOpenAIClient()
+    client.chat.completions.create.side_effect = lambda **params: iter([
+        create_mock_chunk(role="assistant", tool_calls=[
+            {"index": 0, "id": "tc_0", "name": "lookup", "arguments": '{"query": "q"}'}]),
+        usage_chunk,
+    ])
+    swarm = Swarm(client=client, limits=RunLimits(max_tokens=100))
+
+    events = list(swarm.run_and_stream(Agent(functions=[lookup]), [{"role": "user", "content": "go"}]))
+
+    assert client.chat.completions.create.call_args.kwargs["stream_options"] == {"include_usage": True}
+    assert events[-1]["response"].stop_reason == "max_tokens: 120 tokens (limit 100)"
+    assert client.chat.completions.create.call_count == 2
+
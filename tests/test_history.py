@@ -0,0 +1,67 @@
+from custom_swarm import Swarm, Agent
+from custom_swarm.history import History, context_overlay
+from tests.mock_client import MockOpenAIClient, create_mock_response
+
+
+def test_history_shares_prefix_and_keeps_tail():
+    prefix = [{"role": "user", "content": str(i)} for i in range(3)]
+    history = History(prefix)
+    history.append({"role": "assistant", "content": "a"})
+    history.extend([{"role": "tool", "content": "t"}])
+    # later appends by the caller do not leak into the snapshot
+    prefix.append({"role": "user", "content": "late"})
+
+    assert len(history) == 5
+    assert history[0] is prefix[0]
+    assert history[-1]["content"] == "t"
+    assert history[history.prefix_len:] == history.tail
+    assert [m["content"] for m in history] == ["0", "1", "2", "a", "t"]
+    assert [m["content"] for m in history[1:4]] == ["1", "2", "a"]
+
+
+def test_context_overlay_is_copy_on_write():
+    base = {"user": "kim"}
+    context = context_overlay(base)
+    context["step"] = 1
+    context.update({"user": "lee"})
+
+    assert base == {"user": "kim"}
+    assert dict(context) == {"user": "lee", "step": 1}
+
+
+def test_tool_can_delete_caller_context_keys():
+    def forget_user(context_variables):
+        context_variables.pop("user")
+        del context_variables["token"]
+        return "forgotten"
+
+    client = MockOpenAIClient()
+    client.set_sequential_responses([
+        create_mock_response({"role": "assistant", "content": ""}, [{"name": "forget_user"}]),
+        create_mock_response({"role": "assistant", "content": "done"}),
+    ])
+    context_variables = {"user": "kim", "token": "t", "lang": "ko"}
+
+    response = Swarm(client=client).run(
+        Agent(functions=[forget_user]), [{"role": "user", "content": "hi"}], context_variables)
+
+    assert response.messages[1]["content"] == "forgotten"
+    assert response.context_variables == {"lang": "ko"}
+    assert context_variables == {"user": "kim", "token": "t", "lang": "ko"}
+
+
+def test_parallel_runs_do_not_mutate_inputs():
+    client = MockOpenAIClient()
+    client.set_response(create_mock_response({"role": "assistant", "content": "done"}))
+    swarm = Swarm(client=client)
+    messages = [{"role": "user", "content": "Hello"}]
+    context_variables = {"user": "kim"}
+
+    results = swarm.run_parallel_agents(
+        [Agent(name="A"), Agent(name="B")], messages, context_variables
+    )
+
+    assert len(results) == 2
+    assert all(r.messages[-1]["content"] == "done" for r in results)
+    assert messages == [{"role": "user", "content": "Hello"}]
+    assert context_variables == {"user": "kim"}
@@ -0,0 +1,60 @@
+import os
+
+import pytest
+
+from custom_swarm import Agent, ProcessToolBackend, Swarm, process_tool
+from tests.mock_client import MockOpenAIClient, create_mock_response
+
+
+@process_tool
+def crunch(n: int, context_variables: dict):
+    """CPU를 쓰는 도구 (워커 프로세스에서 실행)."""
+    return f"{os.getpid()}:{sum(i * i for i in range(n))}:{context_variables['user']}"
+
+
+@process_tool
+def echo_block(block: bytes):
+    return block[::-1]
+
+
+@process_tool
+def explode():
+    raise ValueError("bad page")
+
+
+def shm_blocks():
+    return {name for name in os.listdir("/dev/shm")} if os.path.isdir("/dev/shm") else set()
+
+
+@pytest.fixture(scope="module")
+def backend():
+    with ProcessToolBackend(max_workers=2, shm_threshold=1024) as backend:
+        yield backend
+
+
+def test_marked_tools_run_in_worker_process(backend):
+    client = MockOpenAIClient()
+    client.set_sequential_responses([
+        create_mock_response({"content": ""}, [{"name": "crunch", "args": {"n": 1000}}]),
+        create_mock_response({"content": "done"}),
+    ])
+    swarm = Swarm(client=client, process_backend=backend)
+
+    response = swarm.run(Agent(functions=[crunch]), [{"role": "user", "content": "go"}],
+                         context_variables={"user": "kim"})
+
+    pid, total, user = response.messages[1]["content"].split(":")
+    assert int(pid) != os.getpid()
+    assert int(total) == sum(i * i for i in range(1000)) and user == "kim"
+
+
+def test_large_payloads_use_shared_memory_and_are_released(backend):
+    before = shm_blocks()
+    block = os.urandom(64 * 1024)
+
+    assert backend.call(echo_block, {"block": block}) == block[::-1]
+    assert backend.shared_bytes >= len(block)
+    assert shm_blocks() - before == set()
+
+    with pytest.raises(ValueError, match="bad page"):
+        backend.call(explode, {})
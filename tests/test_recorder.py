@@ -0,0 +1,75 @@
+import gzip
+import json
+
+from custom_swarm import Agent, SessionRecorder, Swarm
+from tests.mock_client import MockOpenAIClient, create_mock_response
+
+
+def read_events(path):
+    opener = gzip.open if path.suffix == ".gz" else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_run_streams_messages_tool_calls_and_states(tmp_path):
+    def lookup(query):
+        return f"found {query}"
+
+    client = MockOpenAIClient()
+    client.set_sequential_responses([
+        create_mock_response({"role": "assistant", "content": ""},
+                             [{"name": "lookup", "args": {"query": "q"}}]),
+        create_mock_response({"role": "assistant", "content": "done"}),
+    ])
+    with SessionRecorder(str(tmp_path)) as recorder:
+        swarm = Swarm(client=client, recorder=recorder)
+        [result] = swarm.run_parallel_agents(
+            [Agent(name="search", functions=[lookup])], [{"role": "user", "content": "go"}])
+        assert recorder.flush(5)
+
+    [path] = tmp_path.glob("session_*.jsonl")
+    events = read_events(path)
+    task_ids = {event["task_id"] for event in events}
+    assert len(task_ids) == 1
+
+    messages = [e for e in events if e["type"] == "message"]
+    assert [m["role"] for m in messages] == ["user", "assistant", "tool", "assistant"]
+    assert messages[-1]["content"] == result.messages[-1]["content"] == "done"
+    [tool_call] = [e for e in events if e["type"] == "tool_call"]
+    assert tool_call["tool"] == "lookup" and tool_call["duration"] >= 0
+    assert [e["state"] for e in events if e["type"] == "state"] == ["Idle", "Running", "Completed"]
+
+
+def test_compressed_log_rotates(tmp_path):
+    recorder = SessionRecorder(str(tmp_path), compress=True, max_bytes=200, fsync_interval=0)
+    for i in range(10):
+        recorder.message("task", "agent", {"role": "user", "content": f"message {i} " + "x" * 50})
+    recorder.close()
+    assert recorder.flush(1)  # close() 후에는 바로 반환
+
+    paths = sorted(tmp_path.glob("session_*.jsonl.gz"))
+    assert len(paths) > 1
+    contents = [e["content"] for path in paths for e in read_events(path)]
+    assert contents == [f"message {i} " + "x" * 50 for i in range(10)]
+    assert recorder.dropped == 0
+
+
+def test_growing_history_is_logged_once(tmp_path):
+    client = MockOpenAIClient()
+    client.set_sequential_responses([
+        create_mock_response({"role": "assistant", "content": "first"}),
+        create_mock_response({"role": "assistant", "content": "second"}),
+    ])
+    with SessionRecorder(str(tmp_path)) as recorder:
+        swarm = Swarm(client=client, recorder=recorder)
+        # REPL처럼 매번 전체 히스토리를 넘긴다
+        history = [{"role": "user", "content": "hi"}]
+        history += swarm.run(Agent(), history).messages
+        history.append({"role": "user", "content": "hi"})  # 같은 내용이라도 다른 위치면 기록
+        swarm.run(Agent(), history)
+
+    [path] = tmp_path.glob("session_*.jsonl")
+    messages = [e for e in read_events(path) if e["type"] == "message"]
+    assert [(m["role"], m["content"]) for m in messages] == [
+        ("user", "hi"), ("assistant", "first"), ("user", "hi"), ("assistant", "second")]
+    assert messages[0]["task_id"] != messages[2]["task_id"]
@@ -0,0 +1,66 @@
+import os
+
+import pytest
+
+from custom_swarm import ResultStore, SpilledMessages
+from custom_swarm.types import Response
+
+
+def conversation(n, size=10):
+    messages = [{"role": "user", "content": "q" * size}]
+    messages += [{"role": "assistant", "content": f"answer {i}" + "a" * size} for i in range(n)]
+    return Response(messages=messages)
+
+
+@pytest.mark.parametrize("retention, expected", [("final", 1), ("last_n", 2), ("full", 4)])
+def test_retention_keeps_final_message(retention, expected):
+    store = ResultStore(retention=retention, keep_last=2, spill_threshold=None, max_bytes=None)
+    store["agent"] = conversation(3)
+    store["feedback"] = "looks good"
+
+    result = store["agent"]
+    assert len(result.messages) == expected
+    assert result.messages[-1]["content"].startswith("answer 2")
+    assert store["feedback"] == "looks good"
+    assert store.get("missing") is None
+    assert store.pop("missing", None) is None
+
+
+def test_large_results_spill_and_reload_lazily(tmp_path):
+    store = ResultStore(spill_threshold=1024, max_bytes=None, spill_dir=str(tmp_path))
+    store["small"] = conversation(1)
+    store["large"] = conversation(3, size=1000)
+
+    large = store["large"]
+    assert isinstance(large.messages, SpilledMessages)
+    assert store.memory_bytes < 1024
+    os.rename(large.messages.path, large.messages.path + ".moved")
+    assert large.messages[-1]["content"].startswith("answer 2")  # 파일을 읽지 않음
+    os.rename(large.messages.path + ".moved", large.messages.path)
+    assert [m["role"] for m in large.messages] == ["user", "assistant", "assistant", "assistant"]
+    assert store.load("large").model_dump()["messages"][0]["content"] == "q" * 1000
+
+    # 덮어쓴 결과도 참조가 남아 있으면 파일을 지우지 않는다 (워크플로우 롤백)
+    store["large"] = conversation(1)
+    assert large.messages[0]["content"] == "q" * 1000
+    store["large"] = large
+    assert store["large"].messages[1]["content"].startswith("answer 0")
+    del large
+    store["large"] = conversation(1)
+    assert os.listdir(tmp_path) == []
+
+
+def test_memory_cap_evicts_least_recently_used(tmp_path):
+    store = ResultStore(spill_threshold=None, max_bytes=2500, spill_dir=str(tmp_path))
+    store["a"] = conversation(1, size=500)
+    store["b"] = conversation(1, size=500)
+    store["a"]  # a를 최근에 사용
+    store["c"] = conversation(1, size=500)
+
+    assert isinstance(store["b"].messages, SpilledMessages)
+    assert not isinstance(store["a"].messages, SpilledMessages)
+    assert store.memory_bytes <= 2500
+    assert store["b"].messages[-1]["content"].startswith("answer 0")
+
+    store.close()
+    assert len(store) == 0 and os.listdir(tmp_path) == []
@@ -0,0 +1,75 @@
+import json
+import shutil
+
+from custom_swarm import SessionLogIndex, SessionRecorder
+from custom_swarm.session_log.__main__ import main
+
+LEGACY_LOG = "logs/session_20240402-113415.json"
+
+
+def write_session(directory):
+    recorder = SessionRecorder(str(directory))
+    recorder.message("t1", "search", {"role": "user", "content": "검색해 줘"})
+    recorder.message("t1", "search", {"role": "assistant", "content": "", "sender": "search"})
+    recorder.record({"type": "tool_call", "task_id": "t1", "agent": "search",
+                     "tool": "search_on_web_1", "duration": 0.25, "ts": 100.0})
+    recorder.record({"type": "tool_call", "task_id": "t2", "agent": "writer",
+                     "tool": "search_on_web_1", "duration": 0.75, "ts": 200.0})
+    recorder.message("t2", "writer", {"role": "assistant", "content": "보고서"})
+    recorder.close()
+    return recorder.path
+
+
+def test_index_reads_legacy_arrays_and_recorder_jsonl(tmp_path):
+    shutil.copy(LEGACY_LOG, tmp_path)
+    write_session(tmp_path)
+
+    index = SessionLogIndex([str(tmp_path)])
+
+    assert len(index) == 3 + 5
+    [legacy_user] = index.query(role="user", until=1735689600.0)  # 2025-01-01 이전
+    assert legacy_user["content"].startswith("Send an email")
+    assert [r["content"] for r in index.query(task_id="t1", type="message")] == ["검색해 줘", ""]
+    assert [r["agent"] for r in index.query(tool="search_on_web_1", since=150.0)] == ["writer"]
+    assert list(index.query(agent="nobody")) == []
+
+    stats = index.stats()
+    assert stats["tasks"] == 1 + 2
+    assert stats["tool_latency"]["search_on_web_1"]["count"] == 2
+    assert stats["tool_latency"]["search_on_web_1"]["max"] == 0.75
+    assert stats["entries_by_agent"] == {"search": 3, "writer": 2}
+
+
+def test_refresh_indexes_only_appended_lines_and_survives_save(tmp_path):
+    path = write_session(tmp_path)
+    index = SessionLogIndex([str(tmp_path)])
+    assert len(index) == 5
+
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"type": "message", "task_id": "t3", "role": "user", "content": "more"}\n')
+        f.write('{"type": "message", "task_id": "t3", "role": "us')  # 아직 쓰는 중인 줄
+    assert index.refresh() == 1
+
+    saved = tmp_path / "index.pkl"
+    index.save(str(saved))
+    reopened = SessionLogIndex.open(str(saved))
+    assert len(reopened) == 6
+    assert [r["content"] for r in reopened.query(task_id="t3")] == ["more"]
+
+
+def test_cli_index_applies_given_paths(tmp_path, capsys):
+    first, second = tmp_path / "first", tmp_path / "second"
+    first.mkdir()
+    second.mkdir()
+    write_session(first)
+    shutil.copy(LEGACY_LOG, second)
+    index = str(tmp_path / "index.pkl")
+
+    assert main([str(first), "--index", index, "--task", "t2"]) == 0
+    assert [json.loads(line)["agent"] for line in capsys.readouterr().out.splitlines()] == ["writer"] * 2
+
+    # 같은 인덱스 파일이라도 다른 경로를 주면 그 경로만 조회
+    assert main([str(second), "--index", index, "--task", "t2"]) == 0
+    assert capsys.readouterr().out == ""
+    assert main(["--index", index, "--stats"]) == 0
+    assert json.loads(capsys.readouterr().out)["files"] == 1
@@ -0,0 +1,61 @@
+import threading
+
+import pytest
+
+from custom_swarm import Agent, InvalidStateTransition, RunState, RunStateRegistry, Swarm
+from tests.mock_client import MockOpenAIClient, create_mock_response
+
+
+def test_transitions_are_validated_and_timestamped():
+    registry = RunStateRegistry()
+    run_id = registry.create("search").run_id
+
+    running = registry.transition(run_id, RunState.RUNNING)
+    done = registry.transition(run_id, "Completed")
+
+    assert done.state == RunState.COMPLETED and done.done
+    assert done.started_at == running.started_at <= done.finished_at
+    assert done.version > running.version
+    with pytest.raises(InvalidStateTransition):
+        registry.transition(run_id, RunState.RUNNING)
+
+
+def test_poll_returns_changes_since_version_and_waits():
+    registry = RunStateRegistry()
+    first = registry.create("a")
+    version, changes = registry.poll(0)
+    assert changes == [first]
+
+    timer = threading.Timer(0.05, registry.transition, (first.run_id, RunState.RUNNING))
+    timer.start()
+    version, changes = registry.poll(version, timeout=5)
+    assert [record.state for record in changes] == [RunState.RUNNING]
+    assert registry.poll(version, timeout=0) == (version, [])
+
+
+def test_finished_runs_are_evicted_beyond_limit():
+    registry = RunStateRegistry(max_finished=2)
+    run_ids = [registry.create("a").run_id for _ in range(3)]
+    for run_id in run_ids:
+        registry.transition(run_id, RunState.CANCELLED)
+    assert [record.run_id for record in registry.runs()] == run_ids[1:]
+
+
+def test_concurrent_runs_of_same_agent_are_tracked_separately():
+    client = MockOpenAIClient()
+    client.set_response(create_mock_response({"role": "assistant", "content": "ok"}))
+    swarm = Swarm(client=client)
+    seen = []
+    unsubscribe = swarm.states.subscribe(seen.append)
+
+    agent = Agent(name="search")
+    results = swarm.run_parallel_agents([agent, agent, agent], [{"role": "user", "content": "hi"}])
+    unsubscribe()
+
+    assert all(result.error is None for result in results)
+    records = swarm.states.runs(agent_name="search")
+    assert len({record.run_id for record in records}) == 3
+    assert all(record.state == RunState.COMPLETED for record in records)
+    assert swarm.states.counts()[RunState.COMPLETED] == 3
+    assert swarm.agent_states == {"search": "Completed"}
+    assert len(seen) == 9  # Idle, Running, Completed x 3
@@ -0,0 +1,170 @@
+import json
+import threading
+import time
+
+from custom_swarm import Swarm, Agent, RunState
+from custom_swarm.streaming import StreamAssembler
+from tests.mock_client import MockOpenAIClient, create_mock_chunk
+
+
+def test_assembler_merges_interleaved_tool_calls():
+    chunks = [
+        create_mock_chunk(role="assistant"),
+        create_mock_chunk(tool_calls=[
+            {"index": 0, "id": "tc_0", "name": "search", "arguments": '{"q": '},
+            {"index": 1, "id": "tc_1", "name": "lookup", "arguments": '{"id"'},
+        ]),
+        create_mock_chunk(tool_calls=[{"index": 1, "arguments": ': 7}'}]),
+        create_mock_chunk(tool_calls=[{"index": 0, "arguments": '"swarm"}'}]),
+    ]
+    assembler = StreamAssembler(sender="Agent")
+    events = [assembler.add(chunk.choices[0].delta) for chunk in chunks]
+    message = assembler.message()
+
+    assert events[0]["sender"] == "Agent"
+    assert events[1]["tool_calls"][1]["function"]["name"] == "lookup"
+    assert message["content"] == ""
+    assert [tc["id"] for tc in message["tool_calls"]] == ["tc_0", "tc_1"]
+    assert json.loads(message["tool_calls"][0]["function"]["arguments"]) == {"q": "swarm"}
+    assert json.loads(message["tool_calls"][1]["function"]["arguments"]) == {"id": 7}
+
+
+def test_run_and_stream_assembles_content_and_tool_calls():
+    def lookup(id):
+        return f"item {id}"
+
+    client = MockOpenAIClient()
+    client.chat.completions.create.side_effect = [
+        iter([
+            create_mock_chunk(role="assistant"),
+            create_mock_chunk(tool_calls=[
+                {"index": 0, "id": "tc_0", "name": "lookup", "arguments": '{"id": '},
+            ]),
+            create_mock_chunk(tool_calls=[{"index": 0, "arguments": '"a"}'}]),
+        ]),
+        iter([
+            create_mock_chunk(role="assistant", content="Hel"),
+            create_mock_chunk(content="lo"),
+        ]),
+    ]
+    swarm = Swarm(client=client)
+    events = list(swarm.run_and_stream(
+        Agent(functions=[lookup]), [{"role": "user", "content": "hi"}]
+    ))
+    response = events[-1]["response"]
+
+    assert [m["role"] for m in response.messages] == ["assistant", "tool", "assistant"]
+    assert response.messages[1]["content"] == "item a"
+    assert response.messages[-1]["content"] == "Hello"
+    assert response.messages[-1]["tool_calls"] is None
+
+
+def test_stream_parallel_agents_yields_fast_agent_before_slow_one_finishes():
+    release = threading.Event()
+
+    def create(**params):
+        if params["model"] == "slow":
+            release.wait(5)
+
+        def chunks():
+            yield create_mock_chunk(role="assistant", content=params["model"])
+            yield create_mock_chunk(content="!")
+        return chunks()
+
+    client = MockOpenAIClient()
+    client.chat.completions.create.side_effect = create
+    swarm = Swarm(client=client)
+    agents = [Agent(name="slow", model="slow"), Agent(name="fast", model="fast")]
+
+    events = swarm.stream_parallel_agents(agents, [{"role": "user", "content": "hi"}])
+    first = next(events)
+    assert first == {"agent": "fast", "delim": "start"}
+    release.set()
+    rest = [first, *events]
+
+    for name in ("slow", "fast"):
+        own = [e for e in rest if e["agent"] == name]
+        assert own[0] == {"agent": name, "delim": "start"}
+        assert [e.get("content") for e in own[1:3]] == [name, "!"]
+        assert own[-1]["response"].messages[-1]["content"] == name + "!"
+    assert set(swarm.agent_states.values()) == {RunState.COMPLETED}
+
+
+def test_stream_parallel_agents_applies_back_pressure_and_cancels_on_close():
+    produced = []
+
+    def create(**params):
+        def chunks():
+            for i in range(100):
+                produced.append(i)
+                yield create_mock_chunk(content=str(i))
+        return chunks()
+
+    client = MockOpenAIClient()
+    client.chat.completions.create.side_effect = create
+    swarm = Swarm(client=client)
+
+    events = swarm.stream_parallel_agents(
+        [Agent(name="a")], [{"role": "user", "content": "hi"}], max_buffer=4)
+    next(events)
+    time.sleep(0.1)
+    assert len(produced) <= 8  # 소비자가 멈추면 스트림 읽기도 멈춤
+    events.close()
+
+    deadline = time.monotonic() + 5
+    while swarm.agent_states["a"] != RunState.CANCELLED and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert swarm.agent_states["a"] == RunState.CANCELLED
+    assert len(produced) < 100
+
+
+def test_run_first_returns_first_valid_answer_and_cancels_the_rest():
+    release = threading.Event()
+    ran = []
+
+    def wait_tool():
+        ran.append("wait_tool")
+        release.wait(5)
+        return "waited"
+
+    def never():
+        ran.append("never")
+        return "should not run"
+
+    def create(**params):
+        if params["model"] == "slow":
+            return iter([create_mock_chunk(role="assistant", tool_calls=[
+                {"index": 0, "id": "tc_0", "name": "wait_tool", "arguments": "{}"},
+                {"index": 1, "id": "tc_1", "name": "never", "arguments": "{}"},
+            ])])
+        if params["model"] == "good":
+            time.sleep(0.1)
+        answer = "evidence" if params["model"] == "good" else "no idea"
+        return iter([create_mock_chunk(role="assistant", content=answer)])
+
+    client = MockOpenAIClient()
+    client.chat.completions.create.side_effect = create
+    swarm = Swarm(client=client)
+    agents = [
+        Agent(name="slow", model="slow", functions=[wait_tool, never]),
+        Agent(name="bad", model="bad"),
+        Agent(name="good", model="good"),
+    ]
+
+    response = swarm.run_first(
+        agents, [{"role": "user", "content": "hi"}],
+        validator=lambda r: "evidence" in r.messages[-1]["content"],
+    )
+    release.set()
+
+    assert response.agent.name == "good"
+    assert response.messages[-1]["content"] == "evidence"
+    deadline = time.monotonic() + 5
+    while swarm.agent_states["slow"] != RunState.CANCELLED and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert swarm.agent_states["slow"] == RunState.CANCELLED
+    assert ran == ["wait_tool"]  # 취소 이후의 tool call은 실행되지 않음
+
+    rejected = swarm.run_first(agents[1:2], [{"role": "user", "content": "hi"}],
+                               validator=lambda r: False)
+    assert rejected.error.startswith("NoAcceptableResult") and not rejected.messages
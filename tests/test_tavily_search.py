@@ -0,0 +1,49 @@
+import pytest
+
+from example_folder import tavily_search
+from example_folder.tavily_search import (
+    FakeTavilyClient,
+    SearchCache,
+    TavilySearch,
+    get_client,
+    set_client_factory,
+)
+
+
+@pytest.fixture
+def fake_backend():
+    set_client_factory(FakeTavilyClient)
+    yield
+    set_client_factory(None)
+
+
+def test_client_is_shared_per_api_key(fake_backend):
+    assert get_client("key") is get_client("key")
+    assert get_client("key") is not get_client("other")
+
+
+def test_repeated_queries_hit_cache(fake_backend, tmp_path):
+    cache = SearchCache(ttl=60, path=str(tmp_path / "search.db"))
+    search = TavilySearch(API_KEY="key", domains=["naver.com"], k=2, cache=cache)
+
+    first = search.search("Swarm  Agents")
+    second = search.search("swarm agents ")
+
+    assert first == second
+    assert len(first) == 2 and first[0]["url"] == "https://naver.com/0"
+    assert get_client("key").calls == ["Swarm  Agents"]
+
+    # a new process-level cache still finds the result on disk
+    reloaded = SearchCache(ttl=60, path=str(tmp_path / "search.db"))
+    assert reloaded.get(SearchCache.key("swarm agents", ["naver.com"], 2)) == first
+    # different k is a different entry
+    TavilySearch(API_KEY="key", domains=["naver.com"], k=3, cache=cache).search("swarm agents")
+    assert len(get_client("key").calls) == 2
+
+
+def test_search_on_web_uses_module_cache(fake_backend, monkeypatch):
+    monkeypatch.setattr(tavily_search, "search_cache", SearchCache())
+    tavily_search.search_on_web_2("query")
+    tavily_search.search_on_web_2("query")
+
+    assert get_client(tavily_search.TAVILY_API_KEY).calls == ["query"]
@@ -0,0 +1,82 @@
+import json
+
+from custom_swarm import Agent, InMemoryExporter, JSONLExporter, Swarm, Tracer
+from tests.mock_client import MockOpenAIClient, create_mock_chunk, create_mock_response
+
+
+def test_run_spans_are_nested_and_record_handoff():
+    def lookup(query):
+        return "result"
+
+    def transfer_to_writer():
+        return writer
+
+    writer = Agent(name="writer")
+    search = Agent(name="search", functions=[lookup, transfer_to_writer])
+
+    client = MockOpenAIClient()
+    client.set_sequential_responses([
+        create_mock_response({"role": "assistant", "content": ""},
+                             [{"name": "lookup", "args": {"query": "q"}}]),
+        create_mock_response({"role": "assistant", "content": ""},
+                             [{"name": "transfer_to_writer"}]),
+        create_mock_response({"role": "assistant", "content": "done"}),
+    ])
+    exporter = InMemoryExporter()
+    swarm = Swarm(client=client, tracer=Tracer([exporter]))
+
+    result = swarm.run_parallel_agents([search], [{"role": "user", "content": "go"}])[0]
+    assert result.messages[-1]["content"] == "done"
+
+    [run] = exporter.find("swarm.run")
+    assert run.attributes["agent"] == "search"
+    assert run.attributes["final_agent"] == "writer"
+    llm_calls = exporter.find("llm.call")
+    assert [span.attributes["agent"] for span in llm_calls] == ["search", "search", "writer"]
+    tools = exporter.find("tool.call")
+    [handoff] = exporter.find("swarm.handoff")
+    assert [span.attributes["tool"] for span in tools] == ["lookup", "transfer_to_writer"]
+    assert (handoff.attributes["from_agent"], handoff.attributes["to_agent"]) == ("search", "writer")
+    for span in llm_calls + tools + [handoff]:
+        assert span.parent_id == run.span_id
+        assert span.trace_id == run.trace_id
+    assert run.duration >= max(span.duration for span in llm_calls)
+
+
+def test_stream_records_time_to_first_token_and_writes_jsonl(tmp_path):
+    client = MockOpenAIClient()
+    client.set_response(iter([
+        create_mock_chunk(role="assistant", content="he"),
+        create_mock_chunk(content="llo"),
+    ]))
+    path = tmp_path / "spans.jsonl"
+    tracer = Tracer([InMemoryExporter(), JSONLExporter(str(path))])
+    swarm = Swarm(client=client, tracer=tracer)
+
+    events = list(swarm.run_and_stream(Agent(), [{"role": "user", "content": "hi"}]))
+    tracer.shutdown()
+
+    assert events[-1]["response"].messages[-1]["content"] == "hello"
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [line["name"] for line in lines] == ["llm.call", "swarm.run"]
+    llm_call, run = lines
+    assert llm_call["attributes"]["chunks"] == 2
+    assert 0 <= llm_call["attributes"]["time_to_first_token"] <= llm_call["duration"]
+    assert llm_call["parent_id"] == run["span_id"]
+
+
+def test_stream_closed_early_still_ends_run_span():
+    client = MockOpenAIClient()
+    client.set_response(iter([
+        create_mock_chunk(role="assistant", content="he"),
+        create_mock_chunk(content="llo"),
+    ]))
+    exporter = InMemoryExporter()
+    swarm = Swarm(client=client, tracer=Tracer([exporter]))
+
+    stream = swarm.run_and_stream(Agent(), [{"role": "user", "content": "hi"}])
+    assert next(stream) == {"delim": "start"}
+    stream.close()
+
+    [run] = exporter.find("swarm.run")
+    assert run.error.startswith("GeneratorExit")
@@ -1,4 +1,7 @@
-from custom_swarm.util import function_to_json
+import json
+
+from custom_swarm.types import ChatCompletionMessage, ChatCompletionMessageToolCall, Function
+from custom_swarm.util import compile_tools, function_to_json, message_to_dict
 
 
 def test_basic_function():
@@ -48,3 +51,42 @@ def test_complex_function():
             },
         },
     }
+
+
+def test_compile_tools_hides_context_variables_and_caches():
+    def lookup(query: str, context_variables):
+        return query
+
+    def other():
+        pass
+
+    compiled = compile_tools([lookup, other])
+    params = compiled.schemas[0]["function"]["parameters"]
+    assert params["properties"] == {"query": {"type": "string"}}
+    assert params["required"] == ["query"]
+    assert compiled.context_injected == frozenset({"lookup"})
+    assert compiled.function_map == {"lookup": lookup, "other": other}
+
+    # same function objects reuse the compiled schemas
+    assert compile_tools([lookup, other]) is compiled
+    # a changed function list is compiled again
+    assert compile_tools([lookup]) is not compiled
+
+
+def test_message_to_dict_matches_json_roundtrip():
+    message = ChatCompletionMessage(
+        role="assistant",
+        content=None,
+        tool_calls=[
+            ChatCompletionMessageToolCall(
+                id=f"tc_{i}",
+                type="function",
+                function=Function(name="search", arguments=json.dumps({"q": i})),
+            )
+            for i in range(3)
+        ],
+    )
+    expected = json.loads(message.model_dump_json())
+    expected["sender"] = "Agent"
+
+    assert message_to_dict(message, "Agent") == expected
@@ -0,0 +1,255 @@
+import queue
+import threading
+import time
+
+import pytest
+
+from custom_swarm import (
+    Agent,
+    AutoApprove,
+    CentralOrchestrator,
+    QueueApproval,
+    RunState,
+    Swarm,
+    WorkflowGraph,
+    WorkflowValidationError,
+)
+from tests.mock_client import MockOpenAIClient, create_mock_chunk, create_mock_response
+
+
+def transfer_to_objective():
+    return objective_agent
+
+
+def transfer_to_validate_agent_1():
+    return validate_agent_1
+
+
+topic_agent = Agent(name="topic_agent", functions=[transfer_to_objective])
+objective_agent = Agent(name="objective_agent")
+search_agent1 = Agent(name="search_agent1", functions=[transfer_to_validate_agent_1])
+validate_agent_1 = Agent(name="validate_agent_1")
+search_agent2 = Agent(name="search_agent2")
+writing_agent = Agent(name="writing_agent")
+
+AGENTS = [topic_agent, search_agent1, search_agent2, writing_agent]
+
+
+def make_workflow(writing_deps):
+    return [
+        {"name": "Layer_1", "agents": ["topic_agent"], "description": "topic"},
+        {"name": "Search_1", "agents": ["search_agent1"],
+         "dependent_on": ["objective_agent"], "description": "search 1"},
+        {"name": "Search_2", "agents": ["search_agent2"],
+         "dependent_on": ["objective_agent"], "description": "search 2"},
+        {"name": "Writing", "agents": ["writing_agent"],
+         "dependent_on": writing_deps, "description": "write"},
+    ]
+
+
+def test_graph_resolves_handoff_agents_and_layers():
+    graph = WorkflowGraph(
+        make_workflow(["objective_agent", "validate_agent_1", "search_agent2"]), AGENTS
+    )
+
+    assert graph.dependencies["Search_1"] == {"Layer_1"}
+    assert graph.dependencies["Writing"] == {"Layer_1", "Search_1", "Search_2"}
+    assert graph.layers() == [["Layer_1"], ["Search_1", "Search_2"], ["Writing"]]
+    path, length = graph.critical_path({"Layer_1": 1, "Search_1": 5, "Search_2": 2, "Writing": 1})
+    assert path == ["Layer_1", "Search_1", "Writing"] and length == 7
+
+
+def test_graph_reports_typos_missing_agents_and_cycles():
+    with pytest.raises(WorkflowValidationError, match="did you mean 'validate_agent1' -> 'validate_agent_1'"):
+        WorkflowGraph(make_workflow(["validate_agent1"]), AGENTS)
+
+    with pytest.raises(WorkflowValidationError, match="unknown agents"):
+        WorkflowGraph(make_workflow([]), [topic_agent, search_agent1, search_agent2])
+
+    cyclic = [
+        {"name": "A", "agents": ["search_agent1"], "dependent_on": ["B"], "description": ""},
+        {"name": "B", "agents": ["search_agent2"], "dependent_on": ["A"], "description": ""},
+    ]
+    with pytest.raises(WorkflowValidationError, match="cycle"):
+        WorkflowGraph(cyclic, AGENTS)
+
+
+def test_independent_steps_run_concurrently(monkeypatch):
+    client = MockOpenAIClient()
+    active = []
+    peak = []
+    lock = threading.Lock()
+
+    def create(**params):
+        with lock:
+            active.append(1)
+            peak.append(len(active))
+        time.sleep(0.1)
+        with lock:
+            active.pop()
+        return create_mock_response({"role": "assistant", "content": "done"})
+
+    client.chat.completions.create.side_effect = create
+    orchestrator = CentralOrchestrator(Swarm(client=client), {})
+    monkeypatch.setattr(orchestrator, "get_user_feedback", lambda step_name: "next")
+
+    workflow = [
+        {"name": "Search_1", "agents": ["search_agent1"], "description": "a"},
+        {"name": "Search_2", "agents": ["search_agent2"], "description": "b"},
+        {"name": "Writing", "agents": ["writing_agent"],
+         "dependent_on": ["Search_1", "Search_2"], "description": "c"},
+    ]
+    orchestrator.execute_workflow(workflow, AGENTS, [{"role": "user", "content": "q"}])
+
+    assert max(peak) == 2
+    assert set(orchestrator.agent_results) == {"search_agent1", "search_agent2", "writing_agent"}
+    assert all(type(state) is RunState for state in orchestrator.agent_states.values())
+    assert orchestrator.agent_states["writing_agent"] == RunState.COMPLETED
+    assert orchestrator.critical_path[0][-1] == "Writing"
+    assert orchestrator.approval._executor is None  # 기본 콘솔 게이트는 워크플로우가 끝나면 닫힌다
+
+
+def test_speculative_dependents_are_rolled_back_on_retry():
+    client = MockOpenAIClient()
+    calls = []
+
+    def create(**params):
+        user_messages = [m["content"] for m in params["messages"] if m["role"] == "user"]
+        calls.append((params["model"], len(user_messages)))
+        return create_mock_response(
+            {"role": "assistant", "content": f"{params['model']} v{len(user_messages)}"})
+
+    client.chat.completions.create.side_effect = create
+    approval = QueueApproval()
+    orchestrator = CentralOrchestrator(
+        Swarm(client=client), {}, approval=approval, speculative=True)
+    agents = [Agent(name="a", model="a"), Agent(name="b", model="b")]
+    workflow = [
+        {"name": "A", "agents": ["a"], "description": "first"},
+        {"name": "B", "agents": ["b"], "dependent_on": ["A"], "description": "second"},
+    ]
+    b_requests_after_retry = []
+
+    def reviewer():
+        a_requests = 0
+        while True:
+            request_id, step_name, results = approval.get(timeout=5)
+            if step_name == "A":
+                a_requests += 1
+                if a_requests == 1:
+                    # B was started speculatively while A awaited approval
+                    deadline = time.monotonic() + 5
+                    while ("b", 1) not in calls and time.monotonic() < deadline:
+                        time.sleep(0.01)
+                    approval.respond(request_id, "retry", feedback="more detail")
+                else:
+                    approval.respond(request_id, "next")
+            else:
+                # A의 두 번째 요청 이후에는 롤백된 B의 요청이 모두 철회되어 있다
+                if a_requests == 2:
+                    b_requests_after_retry.append(request_id)
+                approval.respond(request_id, "next")
+                if a_requests == 2:
+                    return
+
+    thread = threading.Thread(target=reviewer)
+    thread.start()
+    orchestrator.execute_workflow(workflow, agents, [{"role": "user", "content": "q"}])
+    thread.join(timeout=5)
+
+    assert not thread.is_alive()
+    assert len(b_requests_after_retry) == 1
+    with pytest.raises(queue.Empty):
+        approval.get(timeout=0)
+    assert ("b", 1) in calls
+    assert orchestrator.agent_results["a"].messages[-1]["content"] == "a v2"
+    assert orchestrator.agent_results["feedback"] == "more detail"
+    assert orchestrator.agent_results["b"].messages[-1]["content"] == "b v1"
+    assert calls.count(("a", 1)) == 1 and calls.count(("a", 2)) == 1
+
+
+def test_stream_workflow_tags_events_with_step_and_agent():
+    client = MockOpenAIClient()
+    client.chat.completions.create.side_effect = lambda **params: iter([
+        create_mock_chunk(role="assistant", content=params["model"]),
+        create_mock_chunk(content=" done"),
+    ])
+    agent_results = {}
+    orchestrator = CentralOrchestrator(
+        Swarm(client=client), agent_results, approval=AutoApprove())
+    agents = [Agent(name="a", model="a"), Agent(name="b", model="b"), Agent(name="c", model="c")]
+    workflow = [
+        {"name": "Search", "agents": ["a", "b"], "description": "first"},
+        {"name": "Write", "agents": ["c"], "dependent_on": ["a", "b"], "description": "second"},
+    ]
+
+    events = list(orchestrator.stream_workflow(workflow, agents, [{"role": "user", "content": "q"}]))
+
+    content = {}
+    for event in events:
+        if "content" in event and event["content"]:
+            content.setdefault((event["step"], event["agent"]), []).append(event["content"])
+    assert content == {("Search", "a"): ["a", " done"], ("Search", "b"): ["b", " done"],
+                       ("Write", "c"): ["c", " done"]}
+    steps = [(e["step"], "results" if "results" in e else e["decision"])
+             for e in events if "results" in e or "decision" in e]
+    assert steps == [("Search", "results"), ("Search", "next"), ("Write", "results"), ("Write", "next")]
+    # Write의 이벤트는 Search가 끝난 뒤에만 나온다
+    first_write = next(i for i, e in enumerate(events) if e["step"] == "Write")
+    assert first_write > events.index(next(e for e in events if "results" in e))
+    assert agent_results["c"].messages[-1]["content"] == "c done"
+
+
+def test_hedged_step_keeps_only_first_valid_result():
+    def create(**params):
+        if params["model"] == "slow":
+            time.sleep(0.3)
+        return iter([create_mock_chunk(role="assistant", content=f"{params['model']} answer")])
+
+    client = MockOpenAIClient()
+    client.chat.completions.create.side_effect = create
+    seen = []
+    writer = Agent(name="writer", model="writer",
+                   instructions=lambda cv: seen.append(sorted(cv["dependent_results"])) or "write")
+    agents = [Agent(name="slow", model="slow"), Agent(name="fast", model="fast"), writer]
+    workflow = [
+        {"name": "Search", "agents": ["slow", "fast"], "hedged": True, "description": "find"},
+        {"name": "Write", "agents": ["writer"], "dependent_on": ["Search"], "description": "write"},
+    ]
+    with Swarm(client=client) as swarm:
+        orchestrator = CentralOrchestrator(
+            swarm, {}, approval=AutoApprove(),
+            validators={"Search": lambda r: "answer" in r.messages[-1]["content"]})
+
+        start = time.monotonic()
+        orchestrator.execute_workflow(workflow, agents, [{"role": "user", "content": "q"}])
+        elapsed = time.monotonic() - start
+
+    assert elapsed < 0.3
+    assert set(orchestrator.agent_results) == {"fast", "writer"}
+    assert seen == [["fast"]]  # 스텝 이름 의존성은 hedged 스텝의 승자 결과로 전달된다
+
+
+def test_step_name_dependency_passes_upstream_results():
+    def upstream(context_variables):
+        return "\n".join(
+            f"{name}: {result.messages[-1]['content']}"
+            for name, result in context_variables["dependent_results"].items())
+
+    client = MockOpenAIClient()
+    client.chat.completions.create.side_effect = lambda **params: create_mock_response(
+        {"role": "assistant", "content": f"{params['model']} result"})
+    agents = [Agent(name="a", model="a"), Agent(name="a2", model="a2"),
+              Agent(name="b", model="b", instructions=upstream)]
+    workflow = [
+        {"name": "A", "agents": ["a", "a2"], "description": "first"},
+        {"name": "B", "agents": ["b"], "dependent_on": ["A"], "description": "second"},
+    ]
+    orchestrator = CentralOrchestrator(Swarm(client=client), {}, approval=AutoApprove())
+
+    orchestrator.execute_workflow(workflow, agents, [{"role": "user", "content": "q"}])
+
+    [b_call] = [call.kwargs for call in client.chat.completions.create.call_args_list
+                if call.kwargs["model"] == "b"]
+    assert b_call["messages"][0]["content"] == "a: a result\na2: a2 result"
+    assert orchestrator.step_outputs == {"A": ["a", "a2"], "B": ["b"]}